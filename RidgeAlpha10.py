@@ -1,25 +1,19 @@
-import pandas as pd
-from sklearn.discriminant_analysis import StandardScaler
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from sklearn.linear_model import LinearRegression, Ridge, Lasso, ElasticNet
 import mlflow
 import mlflow.sklearn
+import sys
+from pathlib import Path
 
-dataframe = pd.read_csv("Importaciones2024limpia_modelos.csv")
-
+# Utilidades compartidas en la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from entrenamiento import ajustar_en_cache, cargar_matrices
 
 mlflow.set_tracking_uri("http://localhost:8050")
 experiment = mlflow.set_experiment("proyecto_soluciones_analiticas")
 
-X = dataframe.drop(columns=['vacid'])
-y = dataframe['vacid']
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-#Estandarización
-scaler = StandardScaler()
-X_train = scaler.fit_transform(X_train)
-X_test = scaler.transform(X_test)
+# Matrices divididas y estandarizadas una sola vez (python exportar_matrices.py)
+X_train, X_test, y_train, y_test = cargar_matrices()
 
 with mlflow.start_run(experiment_id=experiment.experiment_id):
     alpha = 10
@@ -28,7 +22,7 @@ with mlflow.start_run(experiment_id=experiment.experiment_id):
     
     # Modelo Ridge
     modelo_ridge = Ridge(alpha=alpha, solver=solver, max_iter=max_iter)  # Ajusta alpha para más regularización
-    modelo_ridge.fit(X_train, y_train)
+    modelo_ridge = ajustar_en_cache(modelo_ridge, X_train, y_train)
 
     # Predicción
     y_pred_ridge = modelo_ridge.predict(X_test)
@@ -0,0 +1,268 @@
+"""
+Mide tiempo de ajuste, tiempo de predicción y RSS pico de cada modelo sobre
+submuestras geométricas de los datos (10k, 20k, 40k, ... hasta el total).
+
+Configuraciones:
+- Los experimentos de modelos/ (entrenamiento/experimentos.py, ZOO) sobre
+  las matrices exportadas (python exportar_matrices.py).
+- El modelo servido de train_model.py (ColumnTransformer + LinearRegression)
+  sobre el dataset limpio, fila a fila y agrupado (IMPORTACIONES_AGRUPADO).
+
+Cada corrida se ejecuta en un proceso nuevo, así que el RSS pico es el de
+ese ajuste; rss_delta descuenta lo que el proceso ya tenía al empezar. Las
+submuestras son prefijos de una misma permutación (semilla 42), anidadas
+entre sí. Si un ajuste supera --limite-segundos no se prueban tamaños
+mayores de esa configuración.
+
+Cada tamaño se ajusta --repeticiones veces y se reporta el menor tiempo,
+que es el menos afectado por el ruido del sistema. Para cada configuración
+se estima el exponente de escalamiento (pendiente de log(tiempo) contra
+log(filas)) solo si hay al menos MINIMO_TAMANOS tamaños que cubran un rango
+de RANGO_MINIMO veces en filas; si no, queda en NaN y no se marca. Por
+encima de --umbral-exponente se marca como superlineal. El reporte queda en
+JSON y CSV junto a un gráfico log-log.
+
+Uso:
+    python benchmarks/entrenamiento.py [--solo RandomForest Sequential ModeloServido]
+        [--minimo 10000] [--factor 2] [--limite-segundos 600] [--repeticiones 3]
+"""
+import argparse
+import json
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from entrenamiento import cargar_matrices
+from entrenamiento.experimentos import ZOO, construir
+from preprocesamiento.instrumentacion import _rss_actual
+
+SALIDA_DIR = Path(__file__).resolve().parent.parent / "data" / "benchmarks"
+SEMILLA = 42
+FILAS_PREDICCION = 100_000
+SERVIDO = ("ModeloServido", "ModeloServidoAgrupado")
+# Condiciones para estimar el exponente de escalamiento
+MINIMO_TAMANOS = 3
+RANGO_MINIMO = 4.0
+
+# Datos cargados en el proceso principal; los procesos hijos los heredan (fork)
+_DATOS = {}
+
+
+def tamanos_geometricos(total: int, minimo: int, factor: float) -> list:
+    """minimo, minimo*factor, ... y siempre el total al final."""
+    tamanos, n = [], minimo
+    while n < total:
+        tamanos.append(int(n))
+        n *= factor
+    return tamanos + [total]
+
+
+def _ajustar(nombre: str, filas: int, repeticiones: int = 1) -> dict:
+    """
+    Trabajo de cada proceso hijo: ajusta una configuración sobre las primeras
+    filas repeticiones veces y retorna los menores tiempos.
+    """
+    rss_inicial = _rss_actual()
+    if nombre in SERVIDO:
+        import train_model
+        from entrenamiento.agrupado import ajustar_por_grupos
+        from sklearn.linear_model import LinearRegression
+        from sklearn.pipeline import Pipeline
+
+        X_train, y_train, X_test = _DATOS['servido']
+        indices = _DATOS['permutacion_servido'][:filas]
+        X, y = X_train.iloc[indices], y_train.iloc[indices]
+
+        def nuevo():
+            return Pipeline(steps=[('prep', train_model.crear_preprocesamiento()),
+                                   ('reg', LinearRegression())])
+
+        def ajustar(modelo):
+            if nombre == "ModeloServidoAgrupado":
+                ajustar_por_grupos(modelo, X, y)
+            else:
+                modelo.fit(X, y)
+    else:
+        X_train, X_test, y_train, _ = _DATOS['matrices']
+        indices = np.sort(_DATOS['permutacion_matrices'][:filas])
+        X, y = X_train[indices], y_train[indices]
+
+        def nuevo():
+            return construir(next(e for e in ZOO if e.nombre == nombre), hilos=1)
+
+        def ajustar(modelo):
+            modelo.fit(X, y)
+
+    prueba = X_test[:FILAS_PREDICCION]
+    segundos_ajuste, segundos_prediccion = np.inf, np.inf
+    for _ in range(max(repeticiones, 1)):
+        modelo = nuevo()
+        inicio = time.perf_counter()
+        ajustar(modelo)
+        segundos_ajuste = min(segundos_ajuste, time.perf_counter() - inicio)
+        inicio = time.perf_counter()
+        modelo.predict(prueba)
+        segundos_prediccion = min(segundos_prediccion, time.perf_counter() - inicio)
+
+    # ru_maxrss está en KB en Linux
+    rss_pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return {
+        'segundos_ajuste': segundos_ajuste, 'segundos_prediccion': segundos_prediccion,
+        'filas_prediccion': len(prueba), 'rss_pico': rss_pico,
+        'rss_delta': rss_pico - rss_inicial if rss_inicial is not None else None,
+    }
+
+
+def medir(nombre: str, filas: int, repeticiones: int = 1) -> dict:
+    """Ejecuta una corrida (con sus repeticiones) en un proceso nuevo."""
+    registro = {'configuracion': nombre, 'filas': filas, 'repeticiones': repeticiones}
+    try:
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("fork")) as ejecutor:
+            registro.update(ejecutor.submit(_ajustar, nombre, filas, repeticiones).result(),
+                            estado='ok')
+    except Exception as error:
+        registro.update(estado='error', error=f"{type(error).__name__}: {error}")
+    return registro
+
+
+def exponentes(tabla: pd.DataFrame, minimo_tamanos: int = MINIMO_TAMANOS,
+               rango_minimo: float = RANGO_MINIMO) -> pd.DataFrame:
+    """
+    Pendiente de log(segundos_ajuste) contra log(filas) por configuración.
+
+    Con menos de minimo_tamanos tamaños, o si el mayor no llega a
+    rango_minimo veces el menor, el exponente es NaN: la pendiente entre
+    tamaños cercanos es sobre todo ruido del temporizador.
+    """
+    filas = []
+    for nombre, grupo in tabla[tabla['estado'] == 'ok'].groupby('configuracion', sort=False):
+        grupo = grupo[grupo['segundos_ajuste'] > 0]
+        suficiente = (grupo['filas'].nunique() >= minimo_tamanos
+                      and grupo['filas'].max() >= rango_minimo * grupo['filas'].min())
+        exponente = (np.polyfit(np.log(grupo['filas']), np.log(grupo['segundos_ajuste']), 1)[0]
+                     if suficiente else np.nan)
+        filas.append({'configuracion': nombre, 'exponente': exponente,
+                      'tamanos': int(grupo['filas'].nunique()),
+                      'filas_max': int(grupo['filas'].max()),
+                      'segundos_max': float(grupo['segundos_ajuste'].max()),
+                      'rss_pico_max_mb': float(grupo['rss_pico'].max()) / 1e6})
+    return pd.DataFrame(filas)
+
+
+def graficar(tabla: pd.DataFrame, ruta: Path) -> bool:
+    """Gráfico log-log de tiempo de ajuste y RSS pico contra filas."""
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib no está instalado; se omite el gráfico")
+        return False
+    ok = tabla[tabla['estado'] == 'ok']
+    fig, (ax_tiempo, ax_rss) = plt.subplots(1, 2, figsize=(14, 6))
+    for nombre, grupo in ok.groupby('configuracion', sort=False):
+        ax_tiempo.plot(grupo['filas'], grupo['segundos_ajuste'], marker="o", label=nombre)
+        ax_rss.plot(grupo['filas'], grupo['rss_pico'] / 1e6, marker="o", label=nombre)
+    filas = np.array(sorted(ok['filas'].unique()), dtype=float)
+    if len(filas):
+        # Referencia lineal desde el menor tiempo medido
+        base = ok.loc[ok['filas'] == filas[0], 'segundos_ajuste'].min()
+        ax_tiempo.plot(filas, base * filas / filas[0], "k--", linewidth=1, label="lineal")
+    ax_tiempo.set(xscale="log", yscale="log", xlabel="Filas", ylabel="Segundos de ajuste")
+    ax_rss.set(xscale="log", yscale="log", xlabel="Filas", ylabel="RSS pico (MB)")
+    ax_tiempo.legend(fontsize=7)
+    fig.tight_layout()
+    fig.savefig(ruta, dpi=120)
+    plt.close(fig)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--solo", nargs="+", default=None,
+                        help="Configuraciones cuyo nombre contiene alguno de estos textos")
+    parser.add_argument("--minimo", type=int, default=10_000, help="Filas de la menor submuestra")
+    parser.add_argument("--factor", type=float, default=2.0, help="Razón entre tamaños")
+    parser.add_argument("--limite-segundos", type=float, default=600.0,
+                        help="No probar tamaños mayores después de un ajuste más lento que esto")
+    parser.add_argument("--repeticiones", type=int, default=3,
+                        help="Ajustes por tamaño; se reporta el menor tiempo")
+    parser.add_argument("--umbral-exponente", type=float, default=1.3,
+                        help="Exponente de escalamiento a partir del cual se marca superlineal")
+    parser.add_argument("--csv", default=None,
+                        help="CSV crudo para el modelo servido (por defecto el de train_model.py)")
+    parser.add_argument("--salida", default=str(SALIDA_DIR), help="Directorio del reporte")
+    args = parser.parse_args()
+
+    nombres = [e.nombre for e in ZOO] + list(SERVIDO)
+    if args.solo:
+        nombres = [n for n in nombres if any(t in n for t in args.solo)]
+
+    rng = np.random.default_rng(SEMILLA)
+    totales = {}
+    if any(n not in SERVIDO for n in nombres):
+        _DATOS['matrices'] = cargar_matrices()
+        totales['matrices'] = len(_DATOS['matrices'][0])
+        _DATOS['permutacion_matrices'] = rng.permutation(totales['matrices'])
+    if any(n in SERVIDO for n in nombres):
+        import train_model
+        from sklearn.model_selection import train_test_split
+
+        if args.csv:
+            from preprocesamiento import cargar_importaciones_limpias
+            df = cargar_importaciones_limpias(args.csv)
+        else:
+            df = train_model.load_and_preprocess_data()
+        X_train, X_test, y_train, _ = train_test_split(
+            df[train_model.FEATURES], df[train_model.TARGET], test_size=0.2, random_state=42)
+        _DATOS['servido'] = (X_train, y_train, X_test)
+        totales['servido'] = len(X_train)
+        _DATOS['permutacion_servido'] = rng.permutation(totales['servido'])
+
+    registros = []
+    for nombre in nombres:
+        total = totales['servido' if nombre in SERVIDO else 'matrices']
+        omitir = False
+        for filas in tamanos_geometricos(total, args.minimo, args.factor):
+            if omitir:
+                registros.append({'configuracion': nombre, 'filas': filas, 'estado': 'omitido'})
+                continue
+            registro = medir(nombre, filas, args.repeticiones)
+            registros.append(registro)
+            if registro['estado'] != 'ok':
+                print(f"{nombre:<42}{filas:>10,}  {registro['error']}")
+                omitir = True
+                continue
+            print(f"{nombre:<42}{filas:>10,}{registro['segundos_ajuste']:>10.2f} s"
+                  f"{registro['rss_pico'] / 1e6:>10.0f} MB")
+            omitir = registro['segundos_ajuste'] > args.limite_segundos
+
+    salida = Path(args.salida)
+    salida.mkdir(parents=True, exist_ok=True)
+    tabla = pd.DataFrame(registros)
+    resumen = exponentes(tabla)
+    if len(resumen):
+        # Un exponente NaN (pocos tamaños o rango corto) no se marca
+        resumen['superlineal'] = resumen['exponente'] > args.umbral_exponente
+    tabla.to_csv(salida / "entrenamiento.csv", index=False)
+    reporte = {'tamanos_minimo': args.minimo, 'factor': args.factor,
+               'repeticiones': args.repeticiones, 'totales': totales, 'corridas': registros, 'escalamiento': resumen.to_dict("records")}
+    (salida / "entrenamiento.json").write_text(
+        json.dumps(reporte, indent=2, ensure_ascii=False, default=float), encoding="utf-8")
+    graficar(tabla, salida / "entrenamiento.png")
+
+    print()
+    print(resumen.to_string(index=False) if len(resumen) else "Sin corridas exitosas")
+    print(f"\nReporte en {salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Compara la memoria asignada por la limpieza encadenada (limpieza.py) y por el
+plan con un solo filtro combinado (plan.py) sobre el mismo CSV crudo.
+
+Uso:
+    python benchmarks/limpieza_plan.py data/Importaciones2024.csv
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from preprocesamiento import PlanLimpieza, leer_csv_crudo, limpiar_importaciones
+
+
+def medir(funcion, df: pd.DataFrame) -> tuple:
+    """Ejecuta la limpieza sobre una copia y retorna (resultado, segundos, pico en bytes)."""
+    df = df.copy()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcion(df)
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, segundos, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("ruta_csv", help="CSV crudo del DANE")
+    args = parser.parse_args()
+
+    crudo = leer_csv_crudo(args.ruta_csv)
+    print(f"Filas crudas: {len(crudo):,}")
+
+    encadenada, t_cadena, pico_cadena = medir(limpiar_importaciones, crudo)
+    plan, t_plan, pico_plan = medir(PlanLimpieza().ejecutar, crudo)
+    pd.testing.assert_frame_equal(encadenada, plan)
+
+    print(f"{'Método':<12}{'Segundos':>10}{'Pico MB':>10}")
+    print(f"{'Encadenada':<12}{t_cadena:>10.3f}{pico_cadena / 1e6:>10.1f}")
+    print(f"{'Plan':<12}{t_plan:>10.3f}{pico_plan / 1e6:>10.1f}")
+    print(f"Filas limpias: {len(plan):,} (resultados idénticos)")
+
+
+if __name__ == "__main__":
+    main()
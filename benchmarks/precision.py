@@ -0,0 +1,111 @@
+"""
+Compara los experimentos de modelos/ ajustados en float64 y en float32.
+
+Con IMPORTACIONES_PRECISION=float32 las matrices, el escalado, el ajuste y
+el modelo servido usan la mitad de memoria y de ancho de banda. Este reporte
+valida que el cambio no altere las métricas: ejecuta el ZOO de
+entrenamiento/experimentos.py sobre las matrices exportadas en ambas
+precisiones y, por modelo, calcula la diferencia relativa del RMSE y del
+MAE, la diferencia del R2 y la aceleración del ajuste. Los modelos cuya
+diferencia relativa supera --tolerancia se marcan y el script termina con
+código 1.
+
+Requiere las matrices en ambas precisiones:
+    python exportar_matrices.py --dtype float64
+    python exportar_matrices.py --dtype float32
+
+Uso:
+    python benchmarks/precision.py [--solo Ridge Lasso] [--tolerancia 1e-3]
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from entrenamiento.experimentos import ZOO, ejecutar_experimentos
+from entrenamiento.matrices import _directorio
+
+SALIDA_DIR = Path(__file__).resolve().parent.parent / "data" / "benchmarks"
+PRECISIONES = ("float64", "float32")
+METRICAS = ('rmse', 'mae', 'r2', 'segundos_ajuste')
+
+
+def bytes_matrices(dir_matrices, dtype) -> int:
+    """Tamaño en disco de las matrices exportadas en esa precisión."""
+    return sum(p.stat().st_size for p in _directorio(dir_matrices, dtype).glob("*.npy"))
+
+
+def comparar(resultados: dict, tolerancia: float) -> pd.DataFrame:
+    """
+    Tabla por experimento con las métricas en cada precisión y sus diferencias.
+
+    Args:
+        resultados: {precisión: lista de resultados de ejecutar_experimentos}
+        tolerancia: Diferencia relativa máxima aceptada en RMSE y MAE
+    """
+    tablas = [pd.DataFrame([r for r in resultados[p] if 'error' not in r])[['nombre', *METRICAS]]
+              .add_suffix(f"_{p}").rename(columns={f"nombre_{p}": 'nombre'})
+              for p in PRECISIONES]
+    tabla = tablas[0].merge(tablas[1], on='nombre')
+    tabla['dif_rmse_relativa'] = tabla['rmse_float32'] / tabla['rmse_float64'] - 1
+    tabla['dif_mae_relativa'] = tabla['mae_float32'] / tabla['mae_float64'] - 1
+    tabla['dif_r2'] = tabla['r2_float32'] - tabla['r2_float64']
+    tabla['aceleracion'] = tabla['segundos_ajuste_float64'] / tabla['segundos_ajuste_float32']
+    tabla['dentro_tolerancia'] = (tabla[['dif_rmse_relativa', 'dif_mae_relativa']].abs()
+                                  .max(axis=1) <= tolerancia)
+    return tabla.sort_values('rmse_float64').reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--solo", nargs="+", default=None,
+                        help="Experimentos cuyo nombre contiene alguno de estos textos")
+    parser.add_argument("--tolerancia", type=float, default=1e-3,
+                        help="Diferencia relativa máxima de RMSE y MAE entre precisiones")
+    parser.add_argument("--cpus", type=int, default=None, help="Presupuesto de CPUs")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos del pool")
+    parser.add_argument("--dir-matrices", default=None, help="Directorio de las matrices")
+    parser.add_argument("--salida", default=str(SALIDA_DIR), help="Directorio del reporte")
+    args = parser.parse_args()
+
+    especificaciones = ZOO
+    if args.solo:
+        especificaciones = [e for e in ZOO if any(t in e.nombre for t in args.solo)]
+
+    resultados = {}
+    for precision in PRECISIONES:
+        print(f"\n== {precision} ==")
+        resultados[precision] = ejecutar_experimentos(especificaciones, args.cpus, args.procesos,
+                                                      args.dir_matrices, precision, mlflow=False)
+
+    tabla = comparar(resultados, args.tolerancia)
+    memoria = {p: bytes_matrices(args.dir_matrices, p) for p in PRECISIONES}
+    fallidos = {p: [r['nombre'] for r in resultados[p] if 'error' in r] for p in PRECISIONES}
+
+    salida = Path(args.salida)
+    salida.mkdir(parents=True, exist_ok=True)
+    tabla.to_csv(salida / "precision.csv", index=False)
+    reporte = {'tolerancia': args.tolerancia, 'bytes_matrices': memoria, 'fallidos': fallidos,
+               'fuera_tolerancia': tabla.loc[~tabla['dentro_tolerancia'], 'nombre'].tolist(),
+               'experimentos': tabla.to_dict("records")}
+    (salida / "precision.json").write_text(
+        json.dumps(reporte, indent=2, ensure_ascii=False, default=float), encoding="utf-8")
+
+    columnas = ['nombre', 'rmse_float64', 'rmse_float32', 'dif_rmse_relativa', 'dif_r2',
+                'aceleracion', 'dentro_tolerancia']
+    print()
+    print(tabla[columnas].to_string(index=False))
+    print(f"\nMatrices: {memoria['float64'] / 1e6:.1f} MB en float64, "
+          f"{memoria['float32'] / 1e6:.1f} MB en float32")
+    print(f"Reporte en {salida}")
+    if reporte['fuera_tolerancia']:
+        print(f"Fuera de tolerancia: {', '.join(reporte['fuera_tolerancia'])}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Script para ajustar en paralelo todos los experimentos de modelos/ sobre las
+matrices exportadas (python exportar_matrices.py) e imprimir la tabla de
+resultados.
+
+Uso:
+    python ejecutar_experimentos.py [--cpus 16] [--procesos 8] [--solo Ridge Lasso] [--sin-mlflow]
+    python ejecutar_experimentos.py --submuestra 0.1 [--comparar]
+"""
+import argparse
+
+from entrenamiento.experimentos import (RESULTADOS_DIR, ZOO, ejecutar_experimentos,
+                                        guardar_resultados, tabla_resultados)
+from entrenamiento.submuestra import divergencia, tamano_desde_texto
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ajusta los experimentos de modelos/ en paralelo")
+    parser.add_argument("--cpus", type=int, default=None, help="Presupuesto de CPUs (por defecto todas)")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos del pool")
+    parser.add_argument("--solo", nargs="+", default=None,
+                        help="Ejecutar solo los experimentos cuyo nombre contiene alguno de estos textos")
+    parser.add_argument("--dtype", default=None, choices=["float64", "float32"],
+                        help="Precisión (por defecto IMPORTACIONES_PRECISION o float64)")
+    parser.add_argument("--sin-mlflow", action="store_true", help="No registrar en MLflow")
+    parser.add_argument("--listar", action="store_true", help="Listar los experimentos y salir")
+    parser.add_argument("--submuestra", type=tamano_desde_texto, default=None,
+                        help="Entrenar sobre una submuestra estratificada: fracción (0.1) o filas (50000)")
+    parser.add_argument("--comparar", action="store_true",
+                        help="Con --submuestra, ajustar también con todos los datos y reportar la divergencia")
+    args = parser.parse_args()
+
+    especificaciones = [e for e in ZOO if not args.solo or any(t in e.nombre for t in args.solo)]
+    if args.listar:
+        for e in especificaciones:
+            print(f"{e.nombre:<42}{e.clase}")
+        return
+
+    resultados = ejecutar_experimentos(especificaciones, cpus=args.cpus, procesos=args.procesos,
+                                       dtype=args.dtype, mlflow=not args.sin_mlflow,
+                                       submuestra=args.submuestra)
+    print()
+    print(tabla_resultados(resultados))
+    print(f"\nResultados guardados en {guardar_resultados(resultados)}")
+
+    if args.submuestra is not None and args.comparar:
+        completos = ejecutar_experimentos(especificaciones, cpus=args.cpus, procesos=args.procesos,
+                                          dtype=args.dtype, mlflow=not args.sin_mlflow)
+        guardar_resultados(completos, RESULTADOS_DIR / "resultados_completo.json")
+        tabla = divergencia(resultados, completos)
+        print()
+        print(tabla[['nombre', 'rmse_submuestra', 'rmse_completo', 'dif_rmse_relativa',
+                     'puesto_submuestra', 'puesto_completo', 'aceleracion']].to_string(index=False))
+        print(f"\nCorrelación de Spearman entre los órdenes: {tabla.attrs['spearman']:.3f}; "
+              f"mismo mejor experimento: {'sí' if tabla.attrs['mismo_mejor'] else 'no'}")
+        ruta = RESULTADOS_DIR / "divergencia_submuestra.csv"
+        tabla.to_csv(ruta, index=False)
+        print(f"Divergencia guardada en {ruta}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Utilidades compartidas por los experimentos de modelos/ y el entrenamiento del modelo servido.
+"""
+from .matrices import PRECISION, cargar_matrices, exportar_matrices, leer_manifiesto
+from .cache_modelos import ajustar_en_cache
+
+__all__ = ["PRECISION", "cargar_matrices", "exportar_matrices", "leer_manifiesto", "ajustar_en_cache"]
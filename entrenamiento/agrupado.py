@@ -0,0 +1,112 @@
+"""
+Entrenamiento del modelo servido sobre estadísticos suficientes por grupo.
+
+El modelo de train_model.py solo usa el mes (fech, sin_fech y cos_fech son
+funciones del mes) y tres categóricas de baja cardinalidad (adua, paispro,
+tipoim). Los millones de filas se reducen a unos cientos de combinaciones
+distintas, y para cada una basta guardar el conteo, la suma y la suma de
+cuadrados de vacid:
+
+- Mínimos cuadrados ordinarios sobre las filas equivale a mínimos cuadrados
+  ponderados sobre la media de cada grupo, con el conteo como peso.
+- El StandardScaler ajustado con esos pesos obtiene la misma media y
+  varianza que sobre las filas.
+- El RMSE y el R2 de prueba salen del conteo, la suma y la suma de cuadrados
+  de cada grupo de prueba; el MAE necesita las desviaciones por fila y se
+  calcula asignando a cada fila la predicción de su grupo.
+
+La regresión final se resuelve sobre la matriz densa de los grupos, así que
+los coeficientes son los de mínimos cuadrados exactos sobre todas las filas
+(np.linalg.lstsq) salvo por el redondeo. El ajuste fila a fila de
+train_model.py no es una referencia exacta: la salida del ColumnTransformer
+es CSR y LinearRegression la resuelve con lsqr (iterativo), cuyos
+coeficientes pueden alejarse bastante más; sus métricas difieren de las del
+ajuste agrupado en el orden de 1e-5 relativo o menos.
+"""
+import inspect
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn import config_context
+
+
+def estadisticos_por_grupo(X: pd.DataFrame, y: pd.Series) -> pd.DataFrame:
+    """
+    Agrupa las filas por la combinación de variables y resume el target.
+
+    Returns:
+        DataFrame con las columnas de X más n, suma y suma_cuadrados
+    """
+    columnas = list(X.columns)
+    datos = X.assign(_y=np.asarray(y, dtype="float64"))
+    datos['_y2'] = datos['_y'] ** 2
+    grupos = datos.groupby(columnas, observed=True, sort=True, dropna=False)
+    resumen = grupos.agg(n=('_y', 'size'), suma=('_y', 'sum'), suma_cuadrados=('_y2', 'sum'))
+    resumen = resumen.reset_index()
+    for c in columnas:
+        # groupby puede cambiar el tipo de las llaves (p. ej. categóricas)
+        resumen[c] = resumen[c].astype(X[c].dtype)
+    return resumen
+
+
+def _pedir_pesos(estimador) -> None:
+    """Pide sample_weight en fit a cada subestimador que lo acepte."""
+    estimadores = [estimador] + [v for v in estimador.get_params(deep=True).values()
+                                 if hasattr(v, "set_fit_request")]
+    for e in estimadores:
+        if hasattr(e, "set_fit_request") and "sample_weight" in inspect.signature(e.fit).parameters:
+            e.set_fit_request(sample_weight=True)
+
+
+def ajustar_por_grupos(pipe, X: pd.DataFrame, y: pd.Series):
+    """
+    Ajusta el pipeline sobre las medias por grupo ponderadas por el conteo.
+
+    Args:
+        pipe: Pipeline sin ajustar (ColumnTransformer -> LinearRegression)
+        X: Variables de entrenamiento
+        y: Target de entrenamiento
+
+    Returns:
+        Tupla (pipeline ajustado, DataFrame de grupos)
+    """
+    grupos = estadisticos_por_grupo(X, y)
+    media = grupos['suma'] / grupos['n']
+    pesos = grupos['n'].to_numpy(dtype="float64")
+    # El enrutamiento de metadatos de sklearn lleva los pesos al escalador y a la regresión
+    with config_context(enable_metadata_routing=True):
+        _pedir_pesos(pipe)
+        Z = pipe[:-1].fit_transform(grupos[X.columns], media, sample_weight=pesos)
+        # Con unos cientos de grupos la matriz densa es pequeña; sobre CSR
+        # LinearRegression usaría lsqr, que es iterativo e inexacto
+        Z = Z.toarray() if sparse.issparse(Z) else Z
+        pipe.steps[-1][1].fit(Z, media, sample_weight=pesos)
+    return pipe, grupos
+
+
+def metricas_por_grupos(pipe, X: pd.DataFrame, y: pd.Series) -> dict:
+    """
+    MAE, RMSE y R2 de prueba prediciendo una vez por grupo.
+
+    Returns:
+        Diccionario con MAE, RMSE y R2
+    """
+    grupos = estadisticos_por_grupo(X, y)
+    pred = pipe.predict(grupos[X.columns])
+    n, suma, suma_cuadrados = (grupos[c].to_numpy(dtype="float64")
+                               for c in ('n', 'suma', 'suma_cuadrados'))
+
+    sse = np.sum(suma_cuadrados - 2 * pred * suma + n * pred ** 2)
+    total = n.sum()
+    sst = suma_cuadrados.sum() - suma.sum() ** 2 / total
+
+    # MAE: cada fila toma la predicción de su grupo
+    llaves = pd.MultiIndex.from_frame(grupos[X.columns])
+    posicion = llaves.get_indexer(pd.MultiIndex.from_frame(X))
+    mae = np.mean(np.abs(np.asarray(y, dtype="float64") - pred[posicion]))
+    return {
+        'MAE': float(mae),
+        'RMSE': float(np.sqrt(max(sse, 0.0) / total)),
+        'R2': float(1 - sse / sst),
+    }
@@ -0,0 +1,230 @@
+"""
+Caché en disco de estimadores y pipelines ya ajustados.
+
+Volver a ejecutar train_model.py o un script de modelos/ sin cambiar los
+datos ni los parámetros repetía el ajuste completo (por ejemplo, al cambiar
+solo el registro en MLflow). ajustar_en_cache() guarda el estimador ajustado
+con joblib bajo una llave que combina:
+
+- La huella del contenido de X, y y los parámetros de ajuste (sample_weight, ...).
+- get_params() del estimador, recorriendo los estimadores anidados.
+- Las versiones de Python y de las bibliotecas, y el código fuente del
+  repositorio cuando el estimador (o la función de ajuste) está definido aquí.
+
+Si la llave existe se carga el archivo en lugar de ajustar. El directorio
+(data/cache/modelos) tiene un tamaño máximo; al superarlo se eliminan los
+archivos usados hace más tiempo (LRU por fecha de modificación, que se
+actualiza en cada acierto).
+
+Variables de entorno:
+    IMPORTACIONES_CACHE_MODELOS=0        desactiva el caché
+    IMPORTACIONES_CACHE_MODELOS_DIR      directorio del caché
+    IMPORTACIONES_CACHE_MODELOS_MB=2048  tamaño máximo del directorio
+"""
+import hashlib
+import inspect
+import json
+import os
+import platform
+from importlib import metadata
+from pathlib import Path
+
+import numpy as np
+
+from .matrices import BASE_DIR
+
+CACHE_MODELOS_DIR = Path(os.getenv("IMPORTACIONES_CACHE_MODELOS_DIR",
+                                   BASE_DIR / "data" / "cache" / "modelos"))
+USAR_CACHE = os.getenv("IMPORTACIONES_CACHE_MODELOS", "1") not in ("", "0")
+LIMITE_MB = float(os.getenv("IMPORTACIONES_CACHE_MODELOS_MB", "2048"))
+
+# Se incrementa si cambia el formato de la llave o de los archivos
+VERSION_CACHE = 1
+BIBLIOTECAS = ("numpy", "scipy", "scikit-learn", "pandas", "joblib", "xgboost")
+# Paquetes del repositorio cuyo código fuente entra en la llave
+PAQUETES_LOCALES = ("entrenamiento", "preprocesamiento", "__main__")
+
+
+def huella_datos(valor) -> str:
+    """Hash del contenido de un arreglo, matriz dispersa, DataFrame o Serie."""
+    import pandas as pd
+    from scipy import sparse
+
+    h = hashlib.blake2b(digest_size=16)
+    if valor is None:
+        h.update(b"None")
+    elif isinstance(valor, (pd.DataFrame, pd.Series)):
+        marco = valor.to_frame() if isinstance(valor, pd.Series) else valor
+        h.update(repr((type(valor).__name__, valor.shape, [str(c) for c in marco.columns],
+                       [str(t) for t in marco.dtypes])).encode())
+        h.update(pd.util.hash_pandas_object(valor, index=False).to_numpy().tobytes())
+    elif sparse.issparse(valor):
+        valor = valor.tocsr()
+        h.update(repr(("csr", valor.shape, str(valor.dtype))).encode())
+        for parte in (valor.data, valor.indices, valor.indptr):
+            h.update(np.ascontiguousarray(parte).data)
+    else:
+        arreglo = np.ascontiguousarray(valor)
+        h.update(repr((arreglo.shape, str(arreglo.dtype))).encode())
+        if arreglo.dtype == object:
+            h.update(repr(arreglo.tolist()).encode())
+        else:
+            h.update(arreglo.data)
+    return h.hexdigest()
+
+
+def _describir(valor):
+    """Representación estable (serializable en JSON) de un parámetro."""
+    if hasattr(valor, "get_params") and not isinstance(valor, type):
+        return {'clase': f"{type(valor).__module__}.{type(valor).__qualname__}",
+                'parametros': {k: _describir(v) for k, v in sorted(valor.get_params(deep=False).items())}}
+    if isinstance(valor, dict):
+        return {str(k): _describir(v) for k, v in sorted(valor.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(valor, (list, tuple)):
+        return [_describir(v) for v in valor]
+    if isinstance(valor, np.ndarray):
+        return {'arreglo': huella_datos(valor)}
+    if callable(valor):
+        return f"{getattr(valor, '__module__', '')}.{getattr(valor, '__qualname__', repr(valor))}"
+    if isinstance(valor, (np.generic,)):
+        return valor.item()
+    if valor is None or isinstance(valor, (bool, int, float, str)):
+        return valor
+    return repr(valor)
+
+
+def versiones() -> dict:
+    """Versiones de Python y de las bibliotecas instaladas que afectan el ajuste."""
+    resultado = {'python': platform.python_version()}
+    for nombre in BIBLIOTECAS:
+        try:
+            resultado[nombre] = metadata.version(nombre)
+        except metadata.PackageNotFoundError:
+            pass
+    return resultado
+
+
+def _codigo_local(*objetos) -> str:
+    """
+    Hash del código del repositorio del que depende el ajuste.
+
+    Para las clases se usa el archivo completo de su módulo; para las
+    funciones de ajuste, su propio código y los módulos del repositorio que
+    usa (no el script que las define, para que cambios de registro o de
+    impresión no invaliden el caché).
+    """
+    import sys
+
+    def _local(objeto) -> bool:
+        modulo = getattr(objeto, "__module__", None) or ""
+        return modulo.split(".")[0] in PAQUETES_LOCALES and modulo in sys.modules
+
+    modulos, fuentes, vistos = set(), [], set()
+    pendientes = list(objetos)
+    while pendientes:
+        objeto = pendientes.pop()
+        if id(objeto) in vistos:
+            continue
+        vistos.add(id(objeto))
+        if hasattr(objeto, "get_params") and not isinstance(objeto, type):
+            pendientes.extend(objeto.get_params(deep=True).values())
+            objeto = type(objeto)
+        if inspect.isfunction(objeto):
+            fuentes.append(inspect.getsource(objeto))
+            globales = objeto.__globals__
+            pendientes.extend(globales[n] for n in objeto.__code__.co_names
+                              if n in globales and _local(globales[n]))
+        elif _local(objeto):
+            modulos.add(objeto.__module__)
+    h = hashlib.sha256("".join(fuentes).encode())
+    for nombre in sorted(modulos):
+        try:
+            h.update(Path(inspect.getfile(sys.modules[nombre])).read_bytes())
+        except (TypeError, OSError):
+            h.update(nombre.encode())
+    return h.hexdigest()
+
+
+def llave_ajuste(estimador, X, y=None, ajustar=None, **fit_params) -> str:
+    """Llave del caché para ajustar estimador sobre (X, y) con fit_params."""
+    descripcion = {
+        'version_cache': VERSION_CACHE,
+        'estimador': _describir(estimador),
+        'ajustar': _describir(ajustar),
+        'X': huella_datos(X),
+        'y': huella_datos(y),
+        'fit_params': {k: huella_datos(v) if hasattr(v, "shape") else _describir(v)
+                       for k, v in sorted(fit_params.items())},
+        'versiones': versiones(),
+        'codigo': _codigo_local(estimador, ajustar),
+    }
+    return hashlib.sha256(json.dumps(descripcion, sort_keys=True, default=repr).encode()).hexdigest()
+
+
+def _desalojar(directorio: Path, limite_bytes: float, conservar: Path = None) -> list:
+    """Elimina los archivos menos usados hasta que el directorio quepa en el límite."""
+    archivos = sorted(directorio.glob("*.joblib"), key=lambda p: p.stat().st_mtime)
+    total = sum(p.stat().st_size for p in archivos)
+    eliminados = []
+    for archivo in archivos:
+        if total <= limite_bytes:
+            break
+        if archivo == conservar:
+            continue
+        total -= archivo.stat().st_size
+        archivo.unlink(missing_ok=True)
+        eliminados.append(archivo)
+    return eliminados
+
+
+def ajustar_en_cache(estimador, X, y=None, ajustar=None, dir_cache=None, limite_mb: float = None,
+                     usar_cache: bool = None, **fit_params):
+    """
+    Ajusta el estimador o lo carga del caché si ya se ajustó con los mismos datos y parámetros.
+
+    Args:
+        estimador: Estimador o Pipeline sin ajustar
+        X, y: Datos de entrenamiento
+        ajustar: Función ajustar(estimador, X, y, **fit_params) que retorna el
+            estimador ajustado (por defecto estimador.fit)
+        dir_cache: Directorio del caché (por defecto data/cache/modelos)
+        limite_mb: Tamaño máximo del directorio en MB
+        usar_cache: Si es False siempre se ajusta (por defecto según
+            IMPORTACIONES_CACHE_MODELOS)
+        **fit_params: Parámetros adicionales de fit (p. ej. sample_weight)
+
+    Returns:
+        Estimador ajustado
+    """
+    import joblib
+
+    def _ajustar():
+        if ajustar is not None:
+            return ajustar(estimador, X, y, **fit_params)
+        return estimador.fit(X, y, **fit_params)
+
+    if not (USAR_CACHE if usar_cache is None else usar_cache):
+        return _ajustar()
+
+    directorio = Path(dir_cache or CACHE_MODELOS_DIR)
+    ruta = directorio / f"{llave_ajuste(estimador, X, y, ajustar, **fit_params)[:32]}.joblib"
+    if ruta.exists():
+        try:
+            modelo = joblib.load(ruta)
+            os.utime(ruta)
+            print(f"Modelo cargado desde caché {ruta.name}")
+            return modelo
+        except Exception as e:
+            print(f"No es posible leer el caché ({e}); se ajusta el modelo.")
+
+    modelo = _ajustar()
+    try:
+        directorio.mkdir(parents=True, exist_ok=True)
+        tmp = ruta.with_suffix(".tmp")
+        joblib.dump(modelo, tmp)
+        os.replace(tmp, ruta)
+        _desalojar(directorio, (LIMITE_MB if limite_mb is None else limite_mb) * 1e6, conservar=ruta)
+    except (OSError, TypeError, AttributeError) as e:
+        # Estimadores que no se pueden serializar o disco sin espacio: se sigue sin caché
+        print(f"No fue posible guardar el modelo en caché ({e}).")
+    return modelo
@@ -0,0 +1,126 @@
+"""
+Modelos lineales sobre matrices de diseño dispersas (CSR).
+
+Con paispro como código de país (en lugar de continente) y más variables
+categóricas, la matriz one-hot densa ocupa filas × categorías. Aquí la
+matriz se mantiene dispersa de principio a fin:
+
+1. Codificación: el ColumnTransformer usa sparse_threshold=1.0, así que su
+   salida es CSR aunque tenga pocas categorías; solo el bloque numérico se
+   estandariza (las dummies no se centran, lo que las volvería densas).
+2. Ajuste: resolver_disperso() calcula OLS o Ridge sin densificar X ni
+   centrarla explícitamente:
+   - "normales": X^T X sobre los no ceros (ecuaciones normales de
+     por_bloques.py) y el centrado como corrección de rango uno; memoria
+     p × p, independiente de las filas.
+   - "lsmr": scipy.sparse.linalg.lsmr sobre un operador que centra X al
+     vuelo (damp = sqrt(alpha)); memoria proporcional a los no ceros, para
+     cuando p es demasiado grande para la matriz p × p.
+3. El resultado es un LinearRegression o Ridge de sklearn con coef_ e
+   intercept_, de modo que el pipeline se serializa y se sirve igual que
+   el modelo denso (predict acepta CSR).
+
+Con "normales" la solución es la de mínimos cuadrados exactos
+(np.linalg.lstsq sobre la matriz densa) salvo por el redondeo. No coincide
+con el ajuste por defecto de train_model.py, que pasa la misma CSR a
+LinearRegression y este la resuelve con lsqr (iterativo): los coeficientes
+pueden diferir más y las métricas en el orden de 1e-5 relativo o menos.
+"""
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import LinearOperator, lsmr
+
+from .por_bloques import EcuacionesNormales, estimador_lineal
+
+# Hasta cuántas columnas se usan las ecuaciones normales (p × p en memoria)
+P_MAX_NORMALES = 4000
+
+
+def resolver_disperso(X, y, alpha: float = 0.0, solver: str = "auto", tol: float = 1e-10,
+                      max_iter: int = None):
+    """
+    Coeficientes e intercepto de OLS/Ridge sobre X dispersa; el intercepto no se penaliza.
+
+    Args:
+        X: Matriz CSR (o densa) de n × p
+        y: Objetivo
+        alpha: Penalización Ridge (0 = mínimos cuadrados)
+        solver: "normales", "lsmr" o "auto" (normales si p <= P_MAX_NORMALES)
+        tol: Tolerancia de lsmr (atol y btol)
+        max_iter: Iteraciones máximas de lsmr
+
+    Returns:
+        Tupla (coef, intercepto)
+    """
+    X = sparse.csr_matrix(X, dtype="float64")
+    y = np.asarray(y, dtype="float64").ravel()
+    n, p = X.shape
+    if solver == "auto":
+        solver = "normales" if p <= P_MAX_NORMALES else "lsmr"
+    if solver == "normales":
+        return EcuacionesNormales().actualizar(X, y).resolver(alpha)
+    if solver != "lsmr":
+        raise ValueError(f"Solver desconocido: {solver}")
+
+    # (X - 1 media^T) b sin formar la matriz centrada
+    media_x = np.asarray(X.mean(axis=0)).ravel()
+    media_y = y.mean()
+    centrada = LinearOperator(
+        (n, p), dtype="float64",
+        matvec=lambda b: X @ b - media_x @ b,
+        rmatvec=lambda r: X.T @ r - media_x * r.sum(),
+    )
+    coef = lsmr(centrada, y - media_y, damp=np.sqrt(alpha), atol=tol, btol=tol,
+                maxiter=max_iter)[0]
+    return coef, media_y - media_x @ coef
+
+
+def ajustar_pipeline_disperso(pipe, X, y, alpha: float = None, solver: str = "auto"):
+    """
+    Ajusta un Pipeline (transformaciones + LinearRegression/Ridge) sin densificar.
+
+    Las transformaciones se ajustan con fit_transform y el último paso se
+    reemplaza por el estimador resuelto con resolver_disperso(). Tiene la
+    firma de ajustar en ajustar_en_cache().
+
+    Args:
+        pipe: Pipeline sin ajustar cuyo último paso es LinearRegression o Ridge
+        alpha: Penalización (por defecto la del último paso)
+        solver: Ver resolver_disperso()
+
+    Returns:
+        El mismo pipeline, ajustado
+    """
+    nombre, final = pipe.steps[-1]
+    if alpha is None:
+        alpha = final.get_params().get('alpha', 0.0)
+    Xt = pipe[:-1].fit_transform(X, y)
+    pipe.steps[-1] = (nombre, estimador_lineal(*resolver_disperso(Xt, y, alpha, solver), alpha=alpha))
+    return pipe
+
+
+def matriz_dispersa(df, columnas_numericas, escalador=None, escalar: bool = True):
+    """
+    CSR con las columnas numéricas (estandarizadas) y las dummies booleanas de df.
+
+    Args:
+        df: DataFrame del dataset de modelos (numéricas y dummies booleanas)
+        columnas_numericas: Columnas que se estandarizan
+        escalador: StandardScaler ya ajustado (None = ajustarlo con df)
+        escalar: Si es False las numéricas se dejan sin estandarizar
+
+    Returns:
+        Tupla (matriz CSR con las numéricas primero, columnas, escalador)
+    """
+    from sklearn.preprocessing import StandardScaler
+
+    dummies = [c for c in df.columns if c not in columnas_numericas]
+    numericas = df[columnas_numericas].to_numpy(dtype="float64")
+    if escalar:
+        escalador = escalador or StandardScaler().fit(numericas)
+        numericas = escalador.transform(numericas)
+    X = sparse.hstack([
+        sparse.csr_matrix(numericas),
+        sparse.csr_matrix(df[dummies].to_numpy(dtype=bool), dtype="float64"),
+    ], format="csr")
+    return X, list(columnas_numericas) + dummies, escalador
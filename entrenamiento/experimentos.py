@@ -0,0 +1,254 @@
+"""
+Ejecución en paralelo de los experimentos de modelos/.
+
+Cada script de modelos/ carga las matrices, ajusta un estimador y registra
+sus métricas en MLflow, uno después de otro. Aquí los mismos experimentos se
+declaran como una lista de Especificacion (ZOO) y se ajustan en un
+ProcessPoolExecutor:
+
+- Las matrices se abren una vez por proceso con np.load(mmap_mode="r"), de
+  modo que todos los procesos comparten las mismas páginas en memoria.
+- El presupuesto de CPUs se reparte entre procesos; cada proceso limita los
+  hilos de BLAS/OpenMP y el n_jobs de los estimadores a su parte.
+- Los experimentos más costosos se envían primero para que no queden al
+  final ocupando un solo proceso.
+- Cada resultado se imprime y se registra en MLflow (desde el proceso
+  principal) apenas termina; al final se imprime la tabla ordenada por RMSE.
+- Con submuestra se entrena sobre una submuestra estratificada de X_train
+  (submuestra.py) y la evaluación sigue siendo sobre todo X_test.
+
+Los scripts registraban como "rmse" el error cuadrático medio sin raíz. En
+los resultados y la tabla de este módulo "mse" es ese valor y "rmse" su
+raíz; en MLflow se conserva la convención de los scripts: "rmse" es el MSE
+y la raíz va en "rmse_real" (ver metricas_mlflow).
+
+Uso:
+    python ejecutar_experimentos.py --cpus 16 [--solo RandomForest Ridge] [--sin-mlflow]
+"""
+import importlib
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from .matrices import BASE_DIR, cargar_matrices, leer_manifiesto
+
+TRACKING_URI = "http://localhost:8050"
+EXPERIMENTO = "proyecto_soluciones_analiticas"
+RESULTADOS_DIR = BASE_DIR / "data" / "experimentos"
+
+
+class Paso(NamedTuple):
+    """Estimador por ruta de importación y parámetros."""
+    clase: str
+    parametros: dict = {}
+
+
+class Especificacion(NamedTuple):
+    """
+    Un experimento: estimador final, pasos previos opcionales y costo relativo.
+
+    Los parámetros que son un Paso se construyen como estimadores anidados
+    (p. ej. el estimador de SequentialFeatureSelector).
+    """
+    nombre: str
+    clase: str
+    parametros: dict = {}
+    previos: tuple = ()
+    costo: float = 1.0
+
+
+_LINEAL = "sklearn.linear_model.LinearRegression"
+
+# Los mismos experimentos que los scripts de modelos/
+ZOO = [
+    Especificacion("LinearRegression", _LINEAL),
+    *(Especificacion(f"Ridge_alpha{a}", "sklearn.linear_model.Ridge",
+                     {'alpha': a, 'solver': 'auto', 'max_iter': 5000})
+      for a in (0.001, 0.01, 1, 10, 100)),
+    *(Especificacion(f"Lasso_alpha{a}", "sklearn.linear_model.Lasso", {'alpha': a}, costo=2)
+      for a in (0.001, 0.1, 1)),
+    Especificacion("PLS_10", "sklearn.cross_decomposition.PLSRegression", {'n_components': 10}),
+    # Las matrices ya vienen estandarizadas: PCA por bloques + ecuaciones normales, como modelos/PCA.py
+    Especificacion("PCA_95_LinearRegression", "entrenamiento.pca_regresion.RegresionPCA",
+                   {'varianza': 0.95, 'modo': 'incremental'}),
+    Especificacion("SequentialLinearRegression", _LINEAL, previos=(
+        Paso("entrenamiento.seleccion.SeleccionAdelante", {'n_variables': 'auto', 'pliegues': 5}),)),
+    *(Especificacion(f"DecisionTreeRegressor_maxDepth{d}", "sklearn.tree.DecisionTreeRegressor",
+                     {'max_depth': d, 'random_state': 42}, costo=d / 5)
+      for d in (5, 10, 20)),
+    *(Especificacion(f"RandomForest_maxdepth{d}_estimators{n}", "sklearn.ensemble.RandomForestRegressor",
+                     {'n_estimators': n, 'max_depth': d, 'random_state': 42}, costo=n * d / 10)
+      for d, n in ((5, 100), (10, 50), (10, 100), (15, 100))),
+    Especificacion("XGboost", "xgboost.XGBRegressor",
+                   {'n_estimators': 100, 'learning_rate': 0.1, 'max_depth': 6, 'random_state': 42},
+                   costo=20),
+]
+
+
+def construir(paso, hilos: int = 1):
+    """Instancia un Paso o una Especificacion (con sus pasos previos) como estimador."""
+    modulo, nombre = paso.clase.rsplit(".", 1)
+    clase = getattr(importlib.import_module(modulo), nombre)
+    parametros = {k: construir(v, hilos) if isinstance(v, Paso) else v
+                  for k, v in paso.parametros.items()}
+    estimador = clase(**parametros)
+    if isinstance(paso, Especificacion) and paso.previos:
+        from sklearn.pipeline import make_pipeline
+        estimador = make_pipeline(*(construir(p, hilos) for p in paso.previos), estimador)
+    # Paralelismo interno acotado a los hilos de este proceso
+    estimador.set_params(**{k: hilos for k, v in estimador.get_params(deep=True).items()
+                            if k.split("__")[-1] == "n_jobs" and v is None})
+    return estimador
+
+
+_MATRICES = None
+
+
+def _iniciar(dir_matrices, dtype, hilos, indices=None):
+    """Inicializador de cada proceso: abre las matrices y limita los hilos."""
+    global _MATRICES
+    from threadpoolctl import threadpool_limits
+
+    threadpool_limits(limits=hilos)
+    _MATRICES = cargar_matrices(dir_matrices, dtype)
+    if indices is not None:
+        X_train, X_test, y_train, y_test = _MATRICES
+        _MATRICES = (np.asarray(X_train[indices]), X_test, np.asarray(y_train[indices]), y_test)
+
+
+def _ajustar(espec: Especificacion, hilos: int, devolver_modelo: bool) -> dict:
+    """Trabajo de cada proceso: ajusta un experimento y calcula sus métricas."""
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+    X_train, X_test, y_train, y_test = _MATRICES
+    resultado = {'nombre': espec.nombre, 'clase': espec.clase, 'parametros': espec.parametros,
+                 'filas_train': len(X_train)}
+    try:
+        modelo = construir(espec, hilos)
+        inicio = time.perf_counter()
+        modelo.fit(X_train, y_train)
+        resultado['segundos_ajuste'] = time.perf_counter() - inicio
+        y_pred = np.ravel(modelo.predict(X_test))
+        mse = mean_squared_error(y_test, y_pred)
+        resultado.update(mae=mean_absolute_error(y_test, y_pred), mse=mse,
+                         rmse=float(np.sqrt(mse)), r2=r2_score(y_test, y_pred))
+        if devolver_modelo:
+            resultado['modelo'] = modelo
+    except Exception:
+        resultado['error'] = traceback.format_exc(limit=3)
+    return resultado
+
+
+def metricas_mlflow(metricas: dict) -> dict:
+    """
+    Métricas con la convención del experimento de MLflow.
+
+    Los scripts de modelos/ registran el MSE bajo "rmse"; para que esa
+    columna sea comparable entre todos los runs, la raíz del MSE se registra
+    como "rmse_real".
+    """
+    resultado = {k: float(v) for k, v in metricas.items() if k != 'rmse'}
+    if 'mse' in metricas:
+        resultado['rmse'] = float(metricas['mse'])
+    if 'rmse' in metricas:
+        resultado['rmse_real'] = float(metricas['rmse'])
+    return resultado
+
+
+def _registrar_mlflow(experimento_id, resultado: dict) -> None:
+    import mlflow
+    import mlflow.sklearn
+
+    with mlflow.start_run(experiment_id=experimento_id, run_name=resultado['nombre']):
+        mlflow.log_params({k: v for k, v in resultado['parametros'].items()
+                           if not isinstance(v, Paso)})
+        mlflow.log_param("filas_train", resultado['filas_train'])
+        mlflow.log_metrics(metricas_mlflow({k: resultado[k] for k in
+                                            ('mae', 'mse', 'rmse', 'r2', 'segundos_ajuste')}))
+        mlflow.sklearn.log_model(resultado['modelo'], "modelo")
+
+
+def ejecutar_experimentos(especificaciones=None, cpus: int = None, procesos: int = None,
+                          dir_matrices=None, dtype=None, mlflow: bool = True,
+                          submuestra=None) -> list:
+    """
+    Ajusta los experimentos en paralelo y retorna la tabla de resultados.
+
+    Args:
+        especificaciones: Lista de Especificacion (por defecto ZOO)
+        cpus: Presupuesto total de CPUs (por defecto os.cpu_count())
+        procesos: Procesos del pool (por defecto min(cpus, experimentos))
+        dir_matrices: Directorio de las matrices exportadas
+        dtype: float64 o float32 (por defecto IMPORTACIONES_PRECISION)
+        mlflow: Registrar cada resultado en MLflow
+        submuestra: Fracción o número de filas de entrenamiento de una
+            submuestra estratificada (None = todas)
+
+    Returns:
+        Lista de resultados ordenada por RMSE (los fallidos al final)
+    """
+    especificaciones = sorted(especificaciones or ZOO, key=lambda e: -e.costo)
+    cpus = cpus or os.cpu_count() or 1
+    procesos = max(1, min(procesos or cpus, cpus, len(especificaciones)))
+    hilos = max(1, cpus // procesos)
+    # Falla temprano si las matrices no están exportadas
+    X_train = cargar_matrices(dir_matrices, dtype)[0]
+    indices = None
+    if submuestra is not None:
+        from .submuestra import estratos_matriz, submuestra_estratificada
+        columnas = leer_manifiesto(dir_matrices, dtype)['columnas']
+        indices = submuestra_estratificada(estratos_matriz(X_train, columnas), submuestra)
+        print(f"Submuestra estratificada de {len(indices)} de {len(X_train)} filas de entrenamiento")
+
+    experimento_id = None
+    if mlflow:
+        import mlflow as _mlflow
+        _mlflow.set_tracking_uri(TRACKING_URI)
+        experimento_id = _mlflow.set_experiment(EXPERIMENTO).experiment_id
+
+    print(f"{len(especificaciones)} experimentos en {procesos} procesos x {hilos} hilos")
+    resultados = []
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar,
+                             initargs=(dir_matrices, dtype, hilos, indices)) as ejecutor:
+        futuros = [ejecutor.submit(_ajustar, e, hilos, mlflow) for e in especificaciones]
+        for futuro in as_completed(futuros):
+            resultado = futuro.result()
+            if 'error' in resultado:
+                print(f"[error] {resultado['nombre']}: {resultado['error'].strip().splitlines()[-1]}")
+            else:
+                print(f"[{resultado['segundos_ajuste']:8.1f} s] {resultado['nombre']}: "
+                      f"MAE={resultado['mae']:.2f} RMSE={resultado['rmse']:.2f} R2={resultado['r2']:.4f}")
+                if mlflow:
+                    _registrar_mlflow(experimento_id, resultado)
+            resultado.pop('modelo', None)
+            resultados.append(resultado)
+    return sorted(resultados, key=lambda r: (('error' in r), r.get('rmse', np.inf)))
+
+
+def tabla_resultados(resultados: list) -> str:
+    """Tabla de texto con los resultados ordenados."""
+    lineas = [f"{'#':>3}  {'Experimento':<42}{'MAE':>12}{'RMSE':>12}{'R2':>9}{'Seg':>9}"]
+    for i, r in enumerate(resultados, 1):
+        if 'error' in r:
+            lineas.append(f"{i:>3}  {r['nombre'][:41]:<42}  error: {r['error'].strip().splitlines()[-1][:60]}")
+        else:
+            lineas.append(f"{i:>3}  {r['nombre'][:41]:<42}{r['mae']:>12.2f}{r['rmse']:>12.2f}"
+                          f"{r['r2']:>9.4f}{r['segundos_ajuste']:>9.1f}")
+    return "\n".join(lineas)
+
+
+def guardar_resultados(resultados: list, ruta=None) -> Path:
+    """Escribe los resultados en JSON (por defecto data/experimentos/resultados.json)."""
+    ruta = Path(ruta or RESULTADOS_DIR / "resultados.json")
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    filas = [{**r, 'parametros': {k: (v._asdict() if isinstance(v, Paso) else v)
+                                  for k, v in r['parametros'].items()}}
+             for r in resultados]
+    ruta.write_text(json.dumps(filas, indent=2, ensure_ascii=False, default=float), encoding="utf-8")
+    return ruta
@@ -0,0 +1,165 @@
+"""
+Matrices de entrenamiento y prueba ya divididas, en archivos .npy mapeados en memoria.
+
+Los scripts de modelos/ leían el CSV limpio de 250 MB, hacían el mismo
+train_test_split y volvían a ajustar el StandardScaler en cada ejecución.
+exportar_matrices() hace ese trabajo una sola vez y guarda:
+
+    data/matrices/float64/X_train.npy, X_test.npy, y_train.npy, y_test.npy
+    data/matrices/float64/manifiesto.json   (columnas, semilla, escalador, ...)
+
+(float32/ para la versión en precisión simple, *_sin_escalar/ sin estandarizar
+y *_disperso/ con X en formato CSR: X_train.npz, X_test.npz).
+
+cargar_matrices() abre los archivos con np.load(mmap_mode="r"): no hay costo
+de parseo y varios experimentos en paralelo comparten las mismas páginas del
+caché del sistema operativo en lugar de duplicar la RAM.
+
+Uso:
+    python exportar_matrices.py [--dtype float32]
+"""
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_MODELOS_PATH = BASE_DIR / "data" / "Importaciones2024limpia_modelos.csv"
+MATRICES_DIR = Path(os.getenv("MATRICES_DIR", BASE_DIR / "data" / "matrices"))
+
+# Precisión de las matrices, el ajuste y los modelos guardados (float64 o float32);
+# es el dtype por defecto de exportar_matrices, cargar_matrices y train_model.py
+PRECISION = os.getenv("IMPORTACIONES_PRECISION", "float64")
+if PRECISION not in ("float64", "float32"):
+    raise ValueError(f"IMPORTACIONES_PRECISION debe ser float64 o float32, no {PRECISION!r}")
+
+TARGET = 'vacid'
+TEST_SIZE = 0.2
+SEMILLA = 42
+NOMBRES = ("X_train", "X_test", "y_train", "y_test")
+
+
+def _directorio(dir_matrices=None, dtype=None, escalado: bool = True,
+                disperso: bool = False) -> Path:
+    nombre = np.dtype(dtype or PRECISION).name + ("" if escalado else "_sin_escalar") + ("_disperso" if disperso else "")
+    return Path(dir_matrices or MATRICES_DIR) / nombre
+
+
+def exportar_matrices(ruta_csv=DATA_MODELOS_PATH, dir_matrices=None, dtype=None,
+                      test_size: float = TEST_SIZE, semilla: int = SEMILLA,
+                      escalar: bool = True, disperso: bool = False) -> Path:
+    """
+    Divide el dataset de modelos y guarda las matrices como .npy.
+
+    Reproduce los pasos de los scripts de modelos/: X son todas las columnas
+    menos vacid, train_test_split con la semilla indicada y StandardScaler
+    ajustado solo con X_train.
+
+    Args:
+        ruta_csv: CSV limpio con variables dummies (Importaciones2024limpia_modelos.csv)
+        dir_matrices: Directorio base (por defecto data/matrices)
+        dtype: float64 o float32 (por defecto PRECISION)
+        test_size: Proporción de prueba
+        semilla: random_state del train_test_split
+        escalar: Si es True las X se guardan estandarizadas
+        disperso: Si es True las X se guardan como CSR (.npz) y solo se
+            estandarizan las columnas numéricas; las dummies quedan en 0/1
+            y las numéricas pasan a ser las primeras columnas
+
+    Returns:
+        Directorio con las matrices y el manifiesto
+    """
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
+    dtype = np.dtype(dtype or PRECISION).name
+    dataframe = pd.read_csv(ruta_csv)
+    X = dataframe.drop(columns=[TARGET])
+    y = dataframe[TARGET]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=semilla)
+
+    manifiesto = {
+        'origen': str(ruta_csv),
+        'columnas': list(X.columns),
+        'target': TARGET,
+        'test_size': test_size,
+        'semilla': semilla,
+        'dtype': np.dtype(dtype).name,
+        'escalado': escalar,
+        'filas_train': len(X_train),
+        'filas_test': len(X_test),
+        'disperso': disperso,
+    }
+    if disperso:
+        from scipy import sparse
+        from .disperso import matriz_dispersa
+
+        numericas = [c for c in X.columns if X[c].dtype != bool]
+        X_train, columnas, escalador = matriz_dispersa(X_train, numericas, escalar=escalar)
+        X_test = matriz_dispersa(X_test, numericas, escalador, escalar=escalar)[0]
+        manifiesto['columnas'] = columnas
+        manifiesto['columnas_escaladas'] = numericas if escalar else []
+        if escalar:
+            manifiesto['media'] = escalador.mean_.tolist()
+            manifiesto['escala'] = escalador.scale_.tolist()
+    elif escalar:
+        scaler = StandardScaler()
+        X_train = scaler.fit_transform(X_train)
+        X_test = scaler.transform(X_test)
+        manifiesto['media'] = scaler.mean_.tolist()
+        manifiesto['escala'] = scaler.scale_.tolist()
+
+    destino = _directorio(dir_matrices, dtype, escalar, disperso)
+    destino.mkdir(parents=True, exist_ok=True)
+    matrices = dict(zip(NOMBRES, (X_train, X_test, y_train, y_test)))
+    for nombre, valores in matrices.items():
+        if disperso and nombre.startswith("X"):
+            tmp = destino / f"{nombre}.tmp.npz"
+            sparse.save_npz(tmp, valores.astype(dtype), compressed=False)
+            os.replace(tmp, destino / f"{nombre}.npz")
+            continue
+        valores = np.asarray(valores, dtype=dtype)
+        tmp = destino / f"{nombre}.tmp.npy"
+        salida = np.lib.format.open_memmap(tmp, mode="w+", dtype=valores.dtype, shape=valores.shape)
+        salida[...] = valores
+        salida.flush()
+        del salida
+        os.replace(tmp, destino / f"{nombre}.npy")
+    (destino / "manifiesto.json").write_text(json.dumps(manifiesto, indent=2), encoding="utf-8")
+    return destino
+
+
+def leer_manifiesto(dir_matrices=None, dtype=None, escalado: bool = True,
+                    disperso: bool = False) -> dict:
+    """Lee el manifiesto (columnas, semilla, escalador) de las matrices exportadas."""
+    ruta = _directorio(dir_matrices, dtype, escalado, disperso) / "manifiesto.json"
+    if not ruta.exists():
+        raise FileNotFoundError(
+            f"No existen matrices en {ruta.parent}; ejecute: python exportar_matrices.py"
+            + (" --disperso" if disperso else ""))
+    return json.loads(ruta.read_text(encoding="utf-8"))
+
+
+def cargar_matrices(dir_matrices=None, dtype=None, escalado: bool = True,
+                    mmap_mode="r", disperso: bool = False) -> tuple:
+    """
+    Abre X_train, X_test, y_train, y_test mapeados en memoria (solo lectura).
+
+    dtype es float64 o float32 (por defecto PRECISION). Con disperso=True
+    las X se cargan como CSR (memoria proporcional a los no ceros) y las y
+    siguen mapeadas en memoria.
+
+    Returns:
+        Tupla (X_train, X_test, y_train, y_test) de np.memmap
+    """
+    leer_manifiesto(dir_matrices, dtype, escalado, disperso)
+    directorio = _directorio(dir_matrices, dtype, escalado, disperso)
+    if disperso:
+        from scipy import sparse
+        return tuple(sparse.load_npz(directorio / f"{nombre}.npz") if nombre.startswith("X")
+                     else np.load(directorio / f"{nombre}.npy", mmap_mode=mmap_mode)
+                     for nombre in NOMBRES)
+    return tuple(np.load(directorio / f"{nombre}.npy", mmap_mode=mmap_mode) for nombre in NOMBRES)
+
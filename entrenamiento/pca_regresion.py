@@ -0,0 +1,132 @@
+"""
+Regresión sobre componentes principales con memoria acotada.
+
+modelos/PCA.py vuelve a estandarizar X_train (que ya viene estandarizada) y
+calcula PCA(n_components=0.95) con una SVD completa de la matriz en memoria.
+Aquí:
+
+- Modo "incremental": IncrementalPCA.partial_fit recorre las matrices .npy
+  mapeadas en memoria por bloques de filas; la memoria depende del bloque y
+  del número de componentes, no de las filas.
+- Modo "aleatorio": PCA con svd_solver="randomized", que solo estima las
+  primeras k componentes (requiere la matriz completa en memoria).
+
+En ambos modos el número de componentes se elige por la varianza explicada
+sin calcular todo el espectro: se empieza con k componentes y se duplica k
+hasta que la varianza acumulada alcanza el objetivo; luego se conservan las
+primeras que lo cumplen. La varianza total se conoce sin el espectro (suma
+de las varianzas por columna), así que la proporción es exacta.
+
+La regresión se ajusta sobre las proyecciones de cada bloque con las
+ecuaciones normales acumuladas de por_bloques.py. RegresionPCA expone
+regresion_pca() como estimador de sklearn para el ZOO de experimentos.py.
+"""
+import numpy as np
+from sklearn.base import BaseEstimator, RegressorMixin
+from sklearn.decomposition import PCA, IncrementalPCA
+from sklearn.pipeline import Pipeline
+
+from .por_bloques import TAM_BLOQUE, EcuacionesNormales, MetricasAcumuladas, bloques_matrices
+
+VARIANZA_OBJETIVO = 0.95
+K_INICIAL = 8
+
+
+def _ajustar_k(X, k: int, modo: str, tam_bloque: int):
+    if modo == "incremental":
+        pca = IncrementalPCA(n_components=k)
+        tam_bloque = max(tam_bloque, k)
+        inicio = 0
+        while inicio < len(X):
+            fin = inicio + tam_bloque
+            if len(X) - fin < k:
+                # partial_fit exige al menos k filas: un resto menor se une a este bloque
+                fin = len(X)
+            pca.partial_fit(np.asarray(X[inicio:fin], dtype="float64"))
+            inicio = fin
+        return pca
+    if modo == "aleatorio":
+        return PCA(n_components=k, svd_solver="randomized", random_state=42).fit(X)
+    raise ValueError(f"Modo de PCA desconocido: {modo}")
+
+
+def _truncar(pca, m: int):
+    """Conserva solo las primeras m componentes de un PCA ajustado."""
+    for atributo in ('components_', 'explained_variance_', 'explained_variance_ratio_',
+                     'singular_values_'):
+        setattr(pca, atributo, getattr(pca, atributo)[:m])
+    pca.n_components = pca.n_components_ = m
+    return pca
+
+
+def ajustar_pca(X, varianza: float = VARIANZA_OBJETIVO, modo: str = "incremental",
+                tam_bloque: int = TAM_BLOQUE, k_inicial: int = K_INICIAL):
+    """
+    Ajusta un PCA con las componentes justas para explicar la varianza pedida.
+
+    Args:
+        X: Matriz de entrenamiento (puede ser np.memmap)
+        varianza: Proporción de varianza a explicar
+        modo: "incremental" (por bloques) o "aleatorio" (SVD aleatorizada)
+        tam_bloque: Filas por bloque en el modo incremental
+        k_inicial: Componentes del primer intento
+
+    Returns:
+        IncrementalPCA o PCA ajustado y truncado
+    """
+    p = X.shape[1]
+    k = min(k_inicial, p)
+    while True:
+        pca = _ajustar_k(X, k, modo, tam_bloque)
+        acumulada = np.cumsum(pca.explained_variance_ratio_)
+        if acumulada[-1] >= varianza or k == p:
+            m = int(np.searchsorted(acumulada, varianza) + 1)
+            return _truncar(pca, min(m, k))
+        k = min(2 * k, p)
+
+
+def regresion_pca(X_train, y_train, X_test=None, y_test=None, varianza: float = VARIANZA_OBJETIVO,
+                  modo: str = "incremental", tam_bloque: int = TAM_BLOQUE):
+    """
+    PCA + regresión lineal ajustados por bloques.
+
+    Returns:
+        Tupla (Pipeline(pca, reg) ajustado, métricas de prueba o None)
+    """
+    pca = ajustar_pca(X_train, varianza, modo, tam_bloque)
+
+    ecuaciones = EcuacionesNormales()
+    for X, y in bloques_matrices(X_train, y_train, tam_bloque):
+        ecuaciones.actualizar(pca.transform(X), y)
+    modelo = Pipeline(steps=[('pca', pca), ('reg', ecuaciones.estimador())])
+
+    metricas = None
+    if X_test is not None:
+        acumuladas = MetricasAcumuladas()
+        for X, y in bloques_matrices(X_test, y_test, tam_bloque):
+            acumuladas.actualizar(y, modelo.predict(X))
+        metricas = acumuladas.resultado()
+    return modelo, metricas
+
+
+class RegresionPCA(RegressorMixin, BaseEstimator):
+    """
+    Estimador de sklearn que ajusta con regresion_pca().
+
+    Espera X ya estandarizada (las matrices exportadas), como modelos/PCA.py.
+    """
+
+    def __init__(self, varianza: float = VARIANZA_OBJETIVO, modo: str = "incremental",
+                 tam_bloque: int = TAM_BLOQUE):
+        self.varianza = varianza
+        self.modo = modo
+        self.tam_bloque = tam_bloque
+
+    def fit(self, X, y):
+        self.modelo_, _ = regresion_pca(X, y, varianza=self.varianza, modo=self.modo,
+                                        tam_bloque=self.tam_bloque)
+        self.n_components_ = self.modelo_.named_steps['pca'].n_components_
+        return self
+
+    def predict(self, X):
+        return self.modelo_.predict(X)
@@ -0,0 +1,272 @@
+"""
+Entrenamiento por bloques con memoria acotada.
+
+Con varios años de datos la matriz de diseño completa ya no cabe en RAM. Este
+módulo recorre el dataset limpio bloque a bloque (una partición del almacén,
+un bloque del CSV o un rango de filas de las matrices .npy) y solo mantiene
+acumuladores de tamaño fijo, así que la memoria no crece con el número de
+años:
+
+1. ajustar_transformador(): una pasada que ajusta el ColumnTransformer con
+   partial_fit de los escaladores y la unión de categorías vistas en cada
+   bloque. Todos los bloques se codifican después con ese mismo transformador.
+2. EcuacionesNormales: acumula X^T X, X^T y y las sumas de cada bloque
+   (combinables entre procesos) y resuelve OLS o Ridge exactos al final.
+   Un estimador con partial_fit (p. ej. SGDRegressor) puede usarse en su lugar.
+3. MetricasAcumuladas: MAE, RMSE y R2 de prueba sumando errores por bloque.
+
+La división entrenamiento/prueba se decide fila a fila con un generador
+aleatorio sembrado por (semilla, número de bloque), de modo que cada pasada
+ve exactamente las mismas filas de entrenamiento. No es la misma división
+que train_test_split sobre el dataset completo.
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.base import clone
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+TEST_SIZE = 0.2
+SEMILLA = 42
+TAM_BLOQUE = 200_000
+
+
+def bloques_almacen(raiz=None, anios=None, meses=None, columnas=None):
+    """Itera el almacén particionado una partición (un mes) a la vez."""
+    from preprocesamiento.almacen import particiones
+
+    for ruta in particiones(raiz, anios, meses):
+        yield pd.read_parquet(ruta, columns=columnas)
+
+
+def bloques_csv(ruta_csv, tam_bloque: int = TAM_BLOQUE, salida=None):
+    """
+    Itera el CSV crudo limpiando por bloques (ver preprocesamiento.ingesta).
+
+    Returns:
+        Función sin argumentos que crea un iterador nuevo en cada pasada; los
+        agregados globales de la limpieza se calculan una sola vez.
+    """
+    from preprocesamiento.ingesta import calcular_agregados, iterar_bloques_limpios
+
+    agregados = calcular_agregados(ruta_csv, tam_bloque, salida)
+    return lambda: iterar_bloques_limpios(ruta_csv, tam_bloque, agregados, salida)
+
+
+def bloques_matrices(X, y, tam_bloque: int = TAM_BLOQUE):
+    """Itera rangos de filas de matrices (p. ej. las .npy mapeadas en memoria)."""
+    for inicio in range(0, len(X), tam_bloque):
+        yield np.asarray(X[inicio:inicio + tam_bloque]), np.asarray(y[inicio:inicio + tam_bloque])
+
+
+def mascara_prueba(n: int, numero_bloque: int, test_size: float = TEST_SIZE,
+                   semilla: int = SEMILLA) -> np.ndarray:
+    """Filas de prueba de un bloque; depende solo de la semilla y del número de bloque."""
+    return np.random.default_rng([semilla, numero_bloque]).random(n) < test_size
+
+
+def _dividir(fuente, test_size, semilla):
+    """Itera (número de bloque, filas de entrenamiento, filas de prueba)."""
+    for i, bloque in enumerate(fuente()):
+        prueba = mascara_prueba(len(bloque), i, test_size, semilla)
+        yield i, bloque[~prueba], bloque[prueba]
+
+
+def ajustar_transformador(preprocess, fuente, test_size: float = TEST_SIZE,
+                          semilla: int = SEMILLA):
+    """
+    Ajusta un ColumnTransformer recorriendo los bloques una vez.
+
+    Los transformadores con partial_fit (StandardScaler, MinMaxScaler, ...)
+    acumulan sus estadísticos en todos los bloques; los OneHotEncoder con
+    categories='auto' reciben la unión ordenada de los valores vistos. El
+    resultado es el mismo que ajustar sobre todas las filas de entrenamiento.
+
+    Args:
+        preprocess: ColumnTransformer sin ajustar
+        fuente: Función sin argumentos que retorna un iterador de DataFrames
+        test_size: Proporción de filas de prueba por bloque
+        semilla: Semilla de la división
+
+    Returns:
+        ColumnTransformer ajustado
+    """
+    acumulados, categorias, primero = {}, {}, None
+    for _, entrenamiento, _ in _dividir(fuente, test_size, semilla):
+        if not len(entrenamiento):
+            continue
+        if primero is None:
+            primero = entrenamiento
+        for nombre, transformador, cols in preprocess.transformers:
+            if hasattr(transformador, "partial_fit"):
+                acumulados.setdefault(nombre, clone(transformador)).partial_fit(entrenamiento[cols])
+            elif isinstance(transformador, OneHotEncoder) and transformador.categories == 'auto':
+                vistos = categorias.setdefault(nombre, {c: set() for c in cols})
+                for c in cols:
+                    vistos[c].update(entrenamiento[c].dropna().unique().tolist())
+    if primero is None:
+        raise ValueError("No hay filas de entrenamiento en los bloques")
+
+    preprocess = clone(preprocess)
+    for nombre, vistos in categorias.items():
+        preprocess.set_params(**{f"{nombre}__categories": [sorted(v) for v in vistos.values()]})
+    # El primer bloque fija la estructura; los escaladores se reemplazan por los acumulados
+    preprocess.fit(primero)
+    preprocess.transformers_ = [
+        (nombre, acumulados.get(nombre, ajustado), cols)
+        for nombre, ajustado, cols in preprocess.transformers_
+    ]
+    return preprocess
+
+
+def _densa(X) -> np.ndarray:
+    return X.toarray() if sparse.issparse(X) else np.asarray(X, dtype="float64")
+
+
+class EcuacionesNormales:
+    """Acumuladores X^T X y X^T y para OLS/Ridge exactos por bloques."""
+
+    def __init__(self):
+        self.n = 0
+        self.xtx = None
+        self.xty = None
+        self.suma_x = None
+        self.suma_y = 0.0
+
+    def actualizar(self, X, y) -> "EcuacionesNormales":
+        # Las matrices dispersas no se densifican: X^T X se calcula sobre los no ceros
+        X = X.tocsr().astype("float64") if sparse.issparse(X) else _densa(X)
+        y = np.asarray(y, dtype="float64")
+        if self.xtx is None:
+            p = X.shape[1]
+            self.xtx, self.xty, self.suma_x = np.zeros((p, p)), np.zeros(p), np.zeros(p)
+        self.n += len(y)
+        xtx = X.T @ X
+        self.xtx += xtx.toarray() if sparse.issparse(xtx) else xtx
+        self.xty += X.T @ y
+        self.suma_x += np.asarray(X.sum(axis=0)).ravel()
+        self.suma_y += float(y.sum())
+        return self
+
+    def combinar(self, otro: "EcuacionesNormales") -> "EcuacionesNormales":
+        """Suma los acumuladores de otro proceso o bloque."""
+        if otro.xtx is None:
+            return self
+        if self.xtx is None:
+            self.xtx, self.xty, self.suma_x = otro.xtx.copy(), otro.xty.copy(), otro.suma_x.copy()
+        else:
+            self.xtx += otro.xtx
+            self.xty += otro.xty
+            self.suma_x += otro.suma_x
+        self.n += otro.n
+        self.suma_y += otro.suma_y
+        return self
+
+    def resolver(self, alpha: float = 0.0):
+        """
+        Coeficientes e intercepto; el intercepto no se penaliza.
+
+        Con alpha=0 se usa la solución de norma mínima, igual que LinearRegression.
+        """
+        if not self.n:
+            raise ValueError("No se acumularon filas")
+        media_x = self.suma_x / self.n
+        media_y = self.suma_y / self.n
+        # Sistema centrado: (X - media)^T (X - media) b = (X - media)^T (y - media)
+        sxx = self.xtx - self.n * np.outer(media_x, media_x)
+        sxy = self.xty - self.n * media_x * media_y
+        if alpha:
+            coef = np.linalg.solve(sxx + alpha * np.eye(len(sxy)), sxy)
+        else:
+            coef = np.linalg.lstsq(sxx, sxy, rcond=None)[0]
+        return coef, media_y - media_x @ coef
+
+    def estimador(self, alpha: float = 0.0):
+        """LinearRegression (alpha=0) o Ridge ya ajustado con la solución acumulada."""
+        return estimador_lineal(*self.resolver(alpha), alpha=alpha)
+
+
+def estimador_lineal(coef, intercepto, alpha: float = 0.0):
+    """LinearRegression (alpha=0) o Ridge de sklearn con coeficientes ya calculados."""
+    modelo = Ridge(alpha=alpha) if alpha else LinearRegression()
+    modelo.coef_, modelo.intercept_ = np.asarray(coef, dtype="float64"), float(intercepto)
+    modelo.n_features_in_ = len(modelo.coef_)
+    return modelo
+
+
+class MetricasAcumuladas:
+    """MAE, RMSE y R2 sumando errores bloque a bloque."""
+
+    def __init__(self):
+        self.n = 0
+        self.suma_abs = 0.0
+        self.suma_cuadrados_error = 0.0
+        self.suma_y = 0.0
+        self.suma_y2 = 0.0
+
+    def actualizar(self, y, pred) -> None:
+        y = np.asarray(y, dtype="float64")
+        error = y - np.asarray(pred, dtype="float64")
+        self.n += len(y)
+        self.suma_abs += float(np.abs(error).sum())
+        self.suma_cuadrados_error += float(error @ error)
+        self.suma_y += float(y.sum())
+        self.suma_y2 += float(y @ y)
+
+    def resultado(self) -> dict:
+        sst = self.suma_y2 - self.suma_y ** 2 / self.n
+        return {
+            'MAE': self.suma_abs / self.n,
+            'RMSE': float(np.sqrt(self.suma_cuadrados_error / self.n)),
+            'R2': 1 - self.suma_cuadrados_error / sst,
+        }
+
+
+def entrenar_por_bloques(preprocess, fuente, features, target, alpha: float = 0.0,
+                         estimador=None, epocas: int = 1, test_size: float = TEST_SIZE,
+                         semilla: int = SEMILLA):
+    """
+    Entrena un Pipeline(ColumnTransformer -> regresión) sin cargar todo el dataset.
+
+    Args:
+        preprocess: ColumnTransformer sin ajustar
+        fuente: Función sin argumentos que retorna un iterador de DataFrames limpios
+        features: Columnas de entrada
+        target: Columna objetivo
+        alpha: Penalización Ridge de la solución exacta (0 = OLS)
+        estimador: Regresor con partial_fit (p. ej. SGDRegressor); si es None
+            se resuelven las ecuaciones normales
+        epocas: Pasadas de partial_fit (solo con estimador)
+        test_size: Proporción de filas de prueba por bloque
+        semilla: Semilla de la división
+
+    Returns:
+        Tupla (pipeline ajustado, métricas de prueba)
+    """
+    def columnas():
+        for bloque in fuente():
+            yield bloque[[*features, target]]
+
+    prep = ajustar_transformador(preprocess, columnas, test_size, semilla)
+
+    if estimador is None:
+        ecuaciones = EcuacionesNormales()
+        for _, entrenamiento, _ in _dividir(columnas, test_size, semilla):
+            if len(entrenamiento):
+                ecuaciones.actualizar(prep.transform(entrenamiento[features]), entrenamiento[target])
+        modelo = ecuaciones.estimador(alpha)
+    else:
+        modelo = clone(estimador)
+        for _ in range(epocas):
+            for _, entrenamiento, _ in _dividir(columnas, test_size, semilla):
+                if len(entrenamiento):
+                    modelo.partial_fit(prep.transform(entrenamiento[features]),
+                                       entrenamiento[target].to_numpy(dtype="float64"))
+
+    metricas = MetricasAcumuladas()
+    for _, _, prueba in _dividir(columnas, test_size, semilla):
+        if len(prueba):
+            metricas.actualizar(prueba[target], modelo.predict(prep.transform(prueba[features])))
+    return Pipeline(steps=[('prep', prep), ('reg', modelo)]), metricas.resultado()
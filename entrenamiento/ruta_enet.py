@@ -0,0 +1,119 @@
+"""
+Rutas de Lasso y ElasticNet con arranque en caliente y matriz de Gram.
+
+Lasso.py y LassoAlpha*.py resuelven un problema de descenso por coordenadas
+desde cero sobre la matriz completa. Aquí, para cada l1_ratio de la grilla,
+se recorre una ruta de alphas de mayor a menor con
+sklearn.linear_model.enet_path:
+
+- La matriz de Gram X^T X y X^T y se calculan una sola vez (sobre los datos
+  centrados) y se comparten entre todos los l1_ratio; el descenso por
+  coordenadas ya no toca las n filas.
+- Cada alpha arranca desde la solución del anterior.
+- El solver descarta variables con reglas de cribado "gap safe", que a
+  diferencia de la regla fuerte nunca eliminan una variable activa y no
+  necesitan volver a revisar las condiciones KKT.
+
+El intercepto no se penaliza (los datos se centran), igual que en Lasso y
+ElasticNet de sklearn.
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import enet_path
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+from .matrices import BASE_DIR
+
+L1_RATIOS = (1.0, 0.9, 0.7, 0.5, 0.3, 0.1)
+N_ALPHAS = 50
+EPS = 1e-3
+RUTA_DIR = BASE_DIR / "data" / "experimentos" / "ruta_enet"
+
+
+def ruta_enet(X_train, y_train, X_test=None, y_test=None, l1_ratios=L1_RATIOS,
+              n_alphas: int = N_ALPHAS, eps: float = EPS, alphas=None, columnas=None,
+              max_iter: int = 1000, tol: float = 1e-4) -> pd.DataFrame:
+    """
+    Ajusta la ruta de alphas para cada l1_ratio con una sola matriz de Gram.
+
+    Args:
+        X_train, y_train: Datos de entrenamiento (estandarizados)
+        X_test, y_test: Datos de prueba para MAE, MSE, RMSE y R2 (opcionales)
+        l1_ratios: Grilla de l1_ratio (1.0 = Lasso)
+        n_alphas: Puntos de la ruta por l1_ratio
+        eps: alpha_min / alpha_max de la ruta
+        alphas: Grilla de alphas fija (en lugar de n_alphas y eps)
+        columnas: Nombres de las variables (por defecto x0, x1, ...)
+
+    Returns:
+        DataFrame con una fila por (l1_ratio, alpha): número de variables
+        seleccionadas, dual gap, métricas de prueba, intercepto y la lista de
+        variables seleccionadas; tabla.attrs['coeficientes'] tiene la matriz
+        filas x p en el mismo orden
+    """
+    X = np.asarray(X_train, dtype="float64")
+    y = np.asarray(y_train, dtype="float64").ravel()
+    columnas = list(columnas) if columnas is not None else [f"x{j}" for j in range(X.shape[1])]
+    media_x, media_y = X.mean(axis=0), float(y.mean())
+    X = X - media_x
+    y = y - media_y
+    gram = X.T @ X
+    xy = X.T @ y
+    if X_test is not None:
+        X_test = np.asarray(X_test, dtype="float64")
+        y_test = np.asarray(y_test, dtype="float64").ravel()
+
+    filas, coeficientes = [], []
+    for l1_ratio in l1_ratios:
+        if alphas is None:
+            # Desde el menor alpha que anula todos los coeficientes, como en enet_path
+            alpha_max = np.abs(xy).max() / (len(y) * l1_ratio)
+            grilla = np.geomspace(alpha_max, alpha_max * eps, n_alphas)
+        else:
+            grilla = np.sort(np.asarray(alphas, dtype="float64"))[::-1]
+        ruta_alphas, coefs, gaps = enet_path(
+            X, y, l1_ratio=l1_ratio, alphas=grilla, precompute=gram, Xy=xy,
+            max_iter=max_iter, tol=tol, check_input=False)
+        interceptos = media_y - media_x @ coefs
+        predicciones = X_test @ coefs + interceptos if X_test is not None else None
+        for k, alpha in enumerate(ruta_alphas):
+            coef = coefs[:, k]
+            seleccion = np.flatnonzero(coef)
+            fila = {'l1_ratio': float(l1_ratio), 'alpha': float(alpha),
+                    'n_variables': len(seleccion), 'dual_gap': float(gaps[k])}
+            if predicciones is not None:
+                mse = mean_squared_error(y_test, predicciones[:, k])
+                fila.update(mae=mean_absolute_error(y_test, predicciones[:, k]), mse=mse,
+                            rmse=float(np.sqrt(mse)), r2=r2_score(y_test, predicciones[:, k]))
+            fila.update(intercepto=float(interceptos[k]),
+                        variables=[columnas[j] for j in seleccion])
+            filas.append(fila)
+            coeficientes.append(coef)
+
+    tabla = pd.DataFrame(filas)
+    tabla.attrs['coeficientes'] = np.vstack(coeficientes)
+    tabla.attrs['columnas'] = columnas
+    return tabla
+
+
+def guardar_ruta(tabla: pd.DataFrame, directorio=None) -> Path:
+    """
+    Guarda la ruta para compararla con otras ejecuciones.
+
+    Escribe ruta.csv (métricas por l1_ratio y alpha), coeficientes.csv y
+    variables.json (variables seleccionadas en cada punto de la ruta).
+    """
+    directorio = Path(directorio or RUTA_DIR)
+    directorio.mkdir(parents=True, exist_ok=True)
+    tabla.drop(columns=['variables']).to_csv(directorio / "ruta.csv", index=False)
+    indice = pd.MultiIndex.from_frame(tabla[['l1_ratio', 'alpha']])
+    pd.DataFrame(tabla.attrs['coeficientes'], index=indice,
+                 columns=tabla.attrs['columnas']).to_csv(directorio / "coeficientes.csv")
+    variables = [{'l1_ratio': f['l1_ratio'], 'alpha': f['alpha'], 'variables': f['variables']}
+                 for f in tabla[['l1_ratio', 'alpha', 'variables']].to_dict("records")]
+    (directorio / "variables.json").write_text(json.dumps(variables, indent=2, ensure_ascii=False),
+                                               encoding="utf-8")
+    return directorio
@@ -0,0 +1,142 @@
+"""
+Ruta de regularización de Ridge a partir de una sola descomposición.
+
+Los scripts Ridge*.py ajustan Ridge desde cero para un solo alpha. Con la
+SVD de la matriz de entrenamiento centrada, X = U S V^T, la solución para
+cualquier alpha es
+
+    coef(alpha) = V diag(s / (s^2 + alpha)) U^T y
+
+así que después de factorizar una vez cada alpha adicional solo cuesta
+operaciones sobre vectores de tamaño p. Con la misma descomposición salen:
+
+- GCV: n * RSS / (n - df)^2, con df = sum(s^2 / (s^2 + alpha)).
+- LOO exacto: e_i / (1 - h_ii), con la diagonal de la matriz sombrero
+  h_ii = 1/n + sum_k U_ik^2 s_k^2 / (s_k^2 + alpha). Requiere un paso O(n p)
+  por alpha (sin volver a factorizar).
+
+El intercepto no se penaliza, igual que en sklearn.linear_model.Ridge.
+"""
+import numpy as np
+import pandas as pd
+
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+ALPHAS = (0.001, 0.01, 0.1, 1, 10, 100, 1000)
+
+
+class RutaRidge:
+    """Factorización de X_train para evaluar Ridge en cualquier alpha."""
+
+    def __init__(self, X, y):
+        X = np.asarray(X, dtype="float64")
+        y = np.asarray(y, dtype="float64").ravel()
+        self.n = len(y)
+        self.media_x = X.mean(axis=0)
+        self.media_y = float(y.mean())
+        U, s, Vt = np.linalg.svd(X - self.media_x, full_matrices=False)
+        # Igual que lstsq: los valores singulares despreciables se descartan
+        rango = s > s.max() * max(X.shape) * np.finfo("float64").eps
+        self.U, self.s, self.Vt = U[:, rango], s[rango], Vt[rango]
+        self.y_centrada = y - self.media_y
+        self.z = self.U.T @ self.y_centrada
+        self.suma_cuadrados_y = float(self.y_centrada @ self.y_centrada)
+
+    def _factores(self, alpha: float) -> np.ndarray:
+        """Factores de contracción s^2 / (s^2 + alpha)."""
+        s2 = self.s ** 2
+        return s2 / (s2 + alpha)
+
+    def coeficientes(self, alpha: float):
+        """Coeficientes e intercepto para un alpha."""
+        coef = self.Vt.T @ (self.s / (self.s ** 2 + alpha) * self.z)
+        return coef, self.media_y - self.media_x @ coef
+
+    def grados_libertad(self, alpha: float) -> float:
+        return float(self._factores(alpha).sum())
+
+    def rss(self, alpha: float) -> float:
+        """Suma de cuadrados de los residuos de entrenamiento."""
+        return self.suma_cuadrados_y - float(np.sum(self.z ** 2 * (1 - (1 - self._factores(alpha)) ** 2)))
+
+    def gcv(self, alpha: float) -> float:
+        """Validación cruzada generalizada (en unidades de MSE)."""
+        df = self.grados_libertad(alpha) + 1  # el intercepto también es un parámetro
+        return self.n * self.rss(alpha) / (self.n - df) ** 2
+
+    def loo(self, alpha: float) -> float:
+        """MSE de leave-one-out exacto."""
+        f = self._factores(alpha)
+        residuos = self.y_centrada - self.U @ (f * self.z)
+        palanca = 1 / self.n + (self.U ** 2) @ f
+        return float(np.mean((residuos / (1 - palanca)) ** 2))
+
+
+def ruta_ridge(X_train, y_train, X_test=None, y_test=None, alphas=ALPHAS,
+               loo: bool = True) -> pd.DataFrame:
+    """
+    Evalúa Ridge en una grilla de alphas con una sola factorización.
+
+    Args:
+        X_train, y_train: Datos de entrenamiento (estandarizados)
+        X_test, y_test: Datos de prueba para MAE, MSE, RMSE y R2 (opcionales)
+        alphas: Grilla de alphas
+        loo: Calcular también el LOO exacto (un paso O(n p) por alpha)
+
+    Returns:
+        DataFrame con una fila por alpha: alpha, df, gcv, loo, métricas de
+        prueba, norma de los coeficientes e intercepto; el atributo
+        tabla.attrs['coeficientes'] tiene la matriz alphas x p
+    """
+    ruta = RutaRidge(X_train, y_train)
+    if X_test is not None:
+        X_test = np.asarray(X_test, dtype="float64")
+        y_test = np.asarray(y_test, dtype="float64").ravel()
+
+    filas, coeficientes = [], []
+    for alpha in alphas:
+        coef, intercepto = ruta.coeficientes(alpha)
+        fila = {'alpha': float(alpha), 'df': ruta.grados_libertad(alpha), 'gcv': ruta.gcv(alpha)}
+        if loo:
+            fila['loo'] = ruta.loo(alpha)
+        if X_test is not None:
+            y_pred = X_test @ coef + intercepto
+            mse = mean_squared_error(y_test, y_pred)
+            fila.update(mae=mean_absolute_error(y_test, y_pred), mse=mse, rmse=float(np.sqrt(mse)),
+                        r2=r2_score(y_test, y_pred))
+        fila.update(norma_coef=float(np.linalg.norm(coef)), intercepto=float(intercepto))
+        filas.append(fila)
+        coeficientes.append(coef)
+
+    tabla = pd.DataFrame(filas)
+    tabla.attrs['coeficientes'] = np.vstack(coeficientes)
+    return tabla
+
+
+def registrar_ruta_mlflow(tabla: pd.DataFrame, experimento_id=None, nombre: str = "RidgePath",
+                          columnas=None) -> None:
+    """
+    Registra la ruta completa como un solo run de MLflow.
+
+    Cada métrica se registra con step = posición del alpha en la grilla (el
+    alpha también se registra como métrica para graficar contra él); la
+    tabla y los coeficientes quedan como artefactos.
+    """
+    import tempfile
+    from pathlib import Path
+
+    import mlflow
+
+    from .experimentos import metricas_mlflow
+
+    with mlflow.start_run(experiment_id=experimento_id, run_name=nombre):
+        mlflow.log_param("alphas", ",".join(f"{a:g}" for a in tabla['alpha']))
+        for paso, fila in enumerate(tabla.to_dict("records")):
+            mlflow.log_metrics(metricas_mlflow(fila), step=paso)
+        mejor = tabla.loc[tabla['gcv'].idxmin()]
+        mlflow.log_metric("alpha_gcv", float(mejor['alpha']))
+        with tempfile.TemporaryDirectory() as tmp:
+            tabla.to_csv(Path(tmp) / "ruta_ridge.csv", index=False)
+            coef = pd.DataFrame(tabla.attrs['coeficientes'], index=tabla['alpha'], columns=columnas)
+            coef.to_csv(Path(tmp) / "coeficientes.csv")
+            mlflow.log_artifacts(tmp)
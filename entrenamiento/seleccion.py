@@ -0,0 +1,155 @@
+"""
+Selección de variables hacia adelante para mínimos cuadrados.
+
+SequentialFeatureSelector(LinearRegression(), cv=5) vuelve a ajustar un
+modelo con validación cruzada por cada candidata en cada paso. Para
+regresión lineal todo lo necesario está en las matrices de Gram de cada
+pliegue, que se calculan en una sola pasada sobre los datos:
+
+- Entrenamiento del pliegue f: G_f = G_total - H_f, con H_f la Gram de las
+  filas de prueba del pliegue (con columna de unos para el intercepto).
+- El factor de Cholesky de G_f sobre las variables ya elegidas se extiende
+  una fila por paso.
+- En cada paso todas las candidatas se evalúan a la vez: una resolución
+  triangular da los coeficientes de cada modelo ampliado y el error de
+  prueba sale de H_f, sin recorrer las filas.
+
+El puntaje es el mismo que usa el selector de sklearn (R2 medio sobre
+KFold sin barajar), así que las variables elegidas coinciden salvo empates
+numéricos exactos.
+"""
+import numpy as np
+from scipy.linalg import solve_triangular
+from sklearn.base import BaseEstimator
+from sklearn.feature_selection import SelectorMixin
+from sklearn.model_selection import KFold
+
+
+def _grams_por_pliegue(X, y, pliegues: int):
+    """Gram de prueba (H, h, y^T y, SST) de cada pliegue, con la columna de unos primero."""
+    grams = []
+    for _, prueba in KFold(n_splits=pliegues).split(X):
+        Xf = np.asarray(X[prueba], dtype="float64")
+        yf = np.asarray(y[prueba], dtype="float64").ravel()
+        Z = np.hstack([np.ones((len(yf), 1)), Xf])
+        grams.append((Z.T @ Z, Z.T @ yf, float(yf @ yf), float(((yf - yf.mean()) ** 2).sum())))
+    return grams
+
+
+class _Pliegue:
+    """Estado incremental de un pliegue: Cholesky y coeficientes del modelo actual."""
+
+    def __init__(self, G, g, H, h, yy, sst):
+        self.G, self.g, self.H, self.h, self.yy, self.sst = G, g, H, h, yy, sst
+        self.S = [0]
+        self.L = np.array([[np.sqrt(G[0, 0])]])
+        self.b = np.array([g[0] / G[0, 0]])
+
+    def sse_candidatas(self, C):
+        """Error de prueba del modelo S + {c} para cada candidata c de C."""
+        S, G, H, h = self.S, self.G, self.H, self.h
+        Lc = solve_triangular(self.L, G[np.ix_(S, C)], lower=True)
+        d2 = G[C, C] - np.sum(Lc ** 2, axis=0)
+        valida = d2 > 1e-10 * G[C, C]
+        d = np.sqrt(np.where(valida, d2, 1.0))
+        z = solve_triangular(self.L, self.g[S], lower=True)
+        beta = np.where(valida, (self.g[C] - Lc.T @ z) / d / d, 0.0)
+        W = solve_triangular(self.L.T, Lc, lower=False)  # G_SS^-1 G_SC
+
+        # Coeficientes ampliados: b_S = b - beta W_c, b_c = beta
+        Hb = H[np.ix_(S, S)] @ self.b
+        HW = H[np.ix_(S, S)] @ W
+        HSc = H[np.ix_(S, C)]
+        bHb = self.b @ Hb - 2 * beta * (W.T @ Hb) + beta ** 2 * np.sum(W * HW, axis=0)
+        bHc = self.b @ HSc - beta * np.sum(W * HSc, axis=0)
+        bh = self.b @ h[S] - beta * (W.T @ h[S]) + beta * h[C]
+        sse = self.yy - 2 * bh + bHb + 2 * beta * bHc + beta ** 2 * H[C, C]
+        return sse, (Lc, d, valida)
+
+    def agregar(self, c: int, factores, k: int) -> None:
+        """Extiende el Cholesky con la candidata c (columna k de los factores)."""
+        Lc, d, valida = factores
+        if not valida[k]:
+            # Columna colineal con las elegidas: no cambia el ajuste
+            self.S.append(c)
+            self.L = np.block([[self.L, np.zeros((len(self.L), 1))],
+                               [np.zeros((1, len(self.L))), np.ones((1, 1))]])
+            self.b = np.append(self.b, 0.0)
+            self.G = self.G.copy()
+            self.G[c, :] = self.G[:, c] = 0.0
+            self.G[c, c] = 1.0
+            self.g = self.g.copy()
+            self.g[c] = 0.0
+            return
+        n = len(self.L)
+        L = np.zeros((n + 1, n + 1))
+        L[:n, :n] = self.L
+        L[n, :n] = Lc[:, k]
+        L[n, n] = d[k]
+        self.L = L
+        self.S.append(c)
+        z = solve_triangular(L, self.g[self.S], lower=True)
+        self.b = solve_triangular(L.T, z, lower=False)
+
+
+class SeleccionAdelante(SelectorMixin, BaseEstimator):
+    """
+    Selección hacia adelante con validación cruzada para LinearRegression.
+
+    Reemplaza a SequentialFeatureSelector(LinearRegression(), direction="forward",
+    cv=pliegues) con el mismo criterio; como selector de sklearn ofrece
+    get_support y transform y puede usarse dentro de un Pipeline.
+
+    Args:
+        n_variables: Número de variables a elegir, fracción, o "auto" (la
+            mitad si tol es None; si no, hasta que la mejora sea menor que tol)
+        pliegues: Pliegues de KFold (sin barajar, como en sklearn)
+        tol: Mejora mínima del R2 medio para seguir agregando variables
+    """
+
+    def __init__(self, n_variables="auto", pliegues: int = 5, tol=None):
+        self.n_variables = n_variables
+        self.pliegues = pliegues
+        self.tol = tol
+
+    def _objetivo(self, p: int):
+        if self.n_variables == "auto":
+            return p - 1 if self.tol is not None else p // 2
+        if isinstance(self.n_variables, float):
+            return max(1, int(self.n_variables * p))
+        return int(self.n_variables)
+
+    def fit(self, X, y):
+        p = X.shape[1]
+        grams = _grams_por_pliegue(X, y, self.pliegues)
+        A = sum(H for H, _, _, _ in grams)
+        a = sum(h for _, h, _, _ in grams)
+        pliegues = [_Pliegue(A - H, a - h, H, h, yy, sst) for H, h, yy, sst in grams]
+
+        # Índices en la Gram ampliada: la variable j es la columna j + 1
+        elegidas, historial = [], []
+        restantes = list(range(1, p + 1))
+        puntaje_actual = -np.inf
+        for _ in range(self._objetivo(p)):
+            C = np.array(restantes)
+            resultados = [f.sse_candidatas(C) for f in pliegues]
+            puntajes = np.mean([1 - sse / f.sst for (sse, _), f in zip(resultados, pliegues)], axis=0)
+            k = int(np.argmax(puntajes))
+            if self.tol is not None and puntajes[k] - puntaje_actual < self.tol:
+                break
+            for f, (_, factores) in zip(pliegues, resultados):
+                f.agregar(int(C[k]), factores, k)
+            puntaje_actual = float(puntajes[k])
+            elegidas.append(int(C[k]) - 1)
+            historial.append({'variable': int(C[k]) - 1, 'r2_cv': puntaje_actual})
+            restantes.remove(int(C[k]))
+
+        self.soporte_ = np.zeros(p, dtype=bool)
+        self.soporte_[elegidas] = True
+        self.orden_ = elegidas
+        self.historial_ = historial
+        self.n_features_in_ = p
+        return self
+
+    def _get_support_mask(self):
+        return self.soporte_
@@ -0,0 +1,165 @@
+"""
+Submuestras estratificadas para comparar configuraciones rápidamente.
+
+Ajustar RandomForest, árboles profundos o XGBoost sobre todo el dataset solo
+para ordenar configuraciones toma horas. Aquí se toma una submuestra (una
+fracción o un número de filas) estratificada por mes × adua × paispro ×
+tipoim: cada celda recibe filas en proporción a su tamaño y al menos
+`minimo`, de modo que las combinaciones raras no desaparecen.
+
+Los estratos se reconstruyen desde las matrices exportadas: las columnas
+fech y las dummies adua_*, paispro_* y tipoim_* (escaladas o no) identifican
+la celda de cada fila.
+
+divergencia() compara los resultados sobre la submuestra con los del
+dataset completo (métricas por modelo y correlación de Spearman entre los
+dos órdenes) para saber si el orden rápido es confiable.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+SEMILLA = 42
+ESTRATOS = ('fech', 'adua', 'paispro', 'tipoim')
+MINIMO_POR_ESTRATO = 1
+
+
+def tamano_desde_texto(texto):
+    """"0.1" -> fracción 0.1; "50000" -> 50000 filas; "" o None -> None."""
+    if not texto:
+        return None
+    return float(texto) if "." in str(texto) else int(texto)
+
+
+# Submuestra de los scripts de modelos/ (vacío = dataset completo)
+TAMANO_SUBMUESTRA = tamano_desde_texto(os.getenv("IMPORTACIONES_SUBMUESTRA", ""))
+
+
+def estratos_matriz(X, columnas, variables=ESTRATOS) -> np.ndarray:
+    """
+    Código de estrato de cada fila a partir de las columnas de las variables.
+
+    Args:
+        X: Matriz con las columnas del manifiesto (puede ser np.memmap)
+        columnas: Nombres de las columnas de X
+        variables: Variables que definen el estrato (la columna con ese
+            nombre o sus dummies "<variable>_*")
+
+    Returns:
+        Arreglo de enteros 0..k-1 con el estrato de cada fila
+    """
+    indices = [i for i, c in enumerate(columnas)
+               if any(c == v or c.startswith(f"{v}_") for v in variables)]
+    if not indices:
+        raise ValueError(f"Ninguna columna corresponde a las variables {variables}")
+    _, codigos = np.unique(np.asarray(X[:, indices]), axis=0, return_inverse=True)
+    return codigos.ravel()
+
+
+def asignar_filas(conteos: np.ndarray, filas: int, minimo: int = MINIMO_POR_ESTRATO) -> np.ndarray:
+    """
+    Filas por estrato: proporcional al tamaño, con al menos minimo por estrato
+    (o el estrato completo si es más pequeño) y restos por mayor fracción.
+    Si los mínimos suman más que filas, se conservan los mínimos.
+    """
+    cuota = filas * conteos / conteos.sum()
+    asignadas = np.maximum(np.floor(cuota).astype(np.int64), np.minimum(minimo, conteos))
+    faltan = filas - int(asignadas.sum())
+    while faltan < 0:
+        # Los mínimos superan el total: se quita a los estratos con más holgura
+        holgura = asignadas - np.minimum(minimo, conteos)
+        k = min(-faltan, int((holgura > 0).sum()))
+        if k == 0:
+            break
+        asignadas[np.argsort(-holgura, kind="stable")[:k]] -= 1
+        faltan += k
+    while faltan > 0:
+        candidatos = np.flatnonzero(asignadas < conteos)
+        if not len(candidatos):
+            break
+        orden = candidatos[np.argsort(-(cuota - asignadas)[candidatos], kind="stable")][:faltan]
+        asignadas[orden] += 1
+        faltan -= len(orden)
+    return asignadas
+
+
+def submuestra_estratificada(estratos: np.ndarray, tamano, semilla: int = SEMILLA,
+                             minimo: int = MINIMO_POR_ESTRATO) -> np.ndarray:
+    """
+    Índices (ordenados) de una submuestra estratificada.
+
+    Args:
+        estratos: Código de estrato de cada fila
+        tamano: Fracción (float entre 0 y 1) o número de filas (int)
+        semilla: Semilla del muestreo
+        minimo: Filas mínimas por estrato
+
+    Returns:
+        Arreglo ordenado de índices de filas
+    """
+    n = len(estratos)
+    filas = int(round(tamano * n)) if isinstance(tamano, float) else int(tamano)
+    filas = min(max(filas, 1), n)
+    conteos = np.bincount(estratos)
+    asignadas = asignar_filas(conteos, filas, minimo)
+
+    # Orden aleatorio dentro de cada estrato y las primeras filas asignadas de cada uno
+    aleatorio = np.random.default_rng(semilla).random(n)
+    orden = np.lexsort((aleatorio, estratos))
+    inicio = np.concatenate([[0], np.cumsum(conteos)[:-1]])
+    estrato_ordenado = estratos[orden]
+    posicion = np.arange(n) - inicio[estrato_ordenado]
+    return np.sort(orden[posicion < asignadas[estrato_ordenado]])
+
+
+def submuestra_matrices(X_train, y_train, tamano=TAMANO_SUBMUESTRA, columnas=None,
+                        semilla: int = SEMILLA, minimo: int = MINIMO_POR_ESTRATO):
+    """
+    Submuestra estratificada de las matrices de entrenamiento.
+
+    Con tamano None retorna las matrices sin cambios.
+
+    Args:
+        columnas: Nombres de las columnas (por defecto los del manifiesto)
+
+    Returns:
+        Tupla (X, y, índices o None)
+    """
+    if tamano is None:
+        return X_train, y_train, None
+    if columnas is None:
+        from .matrices import leer_manifiesto
+        columnas = leer_manifiesto()['columnas']
+    indices = submuestra_estratificada(estratos_matriz(X_train, columnas), tamano, semilla, minimo)
+    return np.asarray(X_train[indices]), np.asarray(y_train[indices]), indices
+
+
+def divergencia(submuestra: list, completo: list) -> pd.DataFrame:
+    """
+    Compara resultados de ejecutar_experimentos sobre la submuestra y el dataset completo.
+
+    Returns:
+        DataFrame por experimento con las métricas de ambos, la diferencia
+        relativa del RMSE y el puesto en cada orden; attrs['spearman'] es la
+        correlación entre los dos órdenes y attrs['mismo_mejor'] indica si
+        ambos eligen el mismo experimento
+    """
+    columnas = ['nombre', 'rmse', 'mae', 'r2', 'segundos_ajuste']
+    sub = pd.DataFrame([r for r in submuestra if 'error' not in r])[columnas]
+    com = pd.DataFrame([r for r in completo if 'error' not in r])[columnas]
+    tabla = sub.merge(com, on='nombre', suffixes=('_submuestra', '_completo'))
+    tabla['dif_rmse_relativa'] = tabla['rmse_submuestra'] / tabla['rmse_completo'] - 1
+    tabla['dif_r2'] = tabla['r2_submuestra'] - tabla['r2_completo']
+    tabla['aceleracion'] = tabla['segundos_ajuste_completo'] / tabla['segundos_ajuste_submuestra']
+    tabla['puesto_submuestra'] = tabla['rmse_submuestra'].rank(method="min").astype(int)
+    tabla['puesto_completo'] = tabla['rmse_completo'].rank(method="min").astype(int)
+    tabla = tabla.sort_values('puesto_completo').reset_index(drop=True)
+    if len(tabla) >= 2:
+        from scipy.stats import spearmanr
+        tabla.attrs['spearman'] = float(spearmanr(tabla['rmse_submuestra'], tabla['rmse_completo'])[0])
+    else:
+        tabla.attrs['spearman'] = np.nan
+    tabla.attrs['mismo_mejor'] = bool(len(tabla)) and bool(
+        tabla.loc[tabla['puesto_submuestra'].idxmin(), 'puesto_completo'] == 1)
+    return tabla
@@ -0,0 +1,176 @@
+"""
+XGBoost con histogramas sobre una matriz cuantizada que se construye una vez.
+
+XGBRegressor sobre un arreglo denso recalcula el sketch de cuantiles en cada
+ajuste y necesita X completa en memoria (más la copia cuantizada). Aquí:
+
+1. Un xgboost.DataIter recorre las matrices mapeadas en memoria
+   (cargar_matrices) por bloques de filas, así que solo un bloque denso está
+   en RAM a la vez.
+2. Con ese iterador se construye un QuantileDMatrix: XGBoost guarda solo
+   los índices de bin (1 byte por valor con max_bin <= 256) en lugar de los
+   float64. Con externo=True se usa ExtMemQuantileDMatrix (o DMatrix con
+   cache_prefix en versiones anteriores a 3.0) y las páginas cuantizadas se
+   escriben en un directorio temporal bajo data/cache/xgb/, para datos de
+   varios años que no caben en memoria. XGBoost no puede volver a abrir esas
+   páginas en otro proceso, así que el directorio se borra junto con la
+   matriz (liberar_matrices o al terminar el proceso).
+3. La matriz queda en memoria del proceso con una llave que combina la
+   huella de los datos y max_bin: barrido_xgb() ajusta una grilla de
+   hiperparámetros sobre la misma matriz sin repetir el sketch. El conjunto
+   de prueba se predice por bloques con inplace_predict, sin cuantizarlo.
+
+Los ajustes usan tree_method='hist' y nthread = IMPORTACIONES_HILOS_XGB
+(por defecto todas las CPUs), también al construir las matrices.
+"""
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .cache_modelos import huella_datos
+from .matrices import BASE_DIR
+
+XGB_CACHE_DIR = Path(os.getenv("IMPORTACIONES_XGB_CACHE_DIR", BASE_DIR / "data" / "cache" / "xgb"))
+HILOS_XGB = int(os.getenv("IMPORTACIONES_HILOS_XGB", "0")) or os.cpu_count() or 1
+FILAS_BLOQUE = 500_000
+MAX_BIN = 256
+
+# Matrices cuantizadas del proceso, por llave: (matriz, directorio temporal de páginas o None)
+_MATRICES = {}
+
+
+def _iterador(X, y=None, filas_bloque: int = FILAS_BLOQUE, cache_prefix=None):
+    """xgboost.DataIter que entrega X[i:i+filas_bloque] (densa o CSR) y su y."""
+    import xgboost as xgb
+
+    class IteradorBloques(xgb.DataIter):
+        def __init__(self):
+            self._inicio = 0
+            super().__init__(cache_prefix=cache_prefix)
+
+        def next(self, input_data) -> bool:
+            if self._inicio >= X.shape[0]:
+                return False
+            fin = min(self._inicio + filas_bloque, X.shape[0])
+            bloque = X[self._inicio:fin]
+            datos = {'data': bloque if hasattr(bloque, "tocsr") else np.asarray(bloque)}
+            if y is not None:
+                datos['label'] = np.asarray(y[self._inicio:fin]).ravel()
+            input_data(**datos)
+            self._inicio = fin
+            return True
+
+        def reset(self):
+            self._inicio = 0
+
+    return IteradorBloques()
+
+
+def matriz_cuantizada(X, y=None, max_bin: int = MAX_BIN, externo: bool = False,
+                      filas_bloque: int = FILAS_BLOQUE, hilos: int = None, dir_cache=None):
+    """
+    QuantileDMatrix construida por bloques, reutilizada si ya existe en el proceso.
+
+    Args:
+        X, y: Matrices (np.memmap, arreglo o CSR)
+        max_bin: Bins por variable del histograma
+        externo: Guardar las páginas cuantizadas en disco en lugar de RAM
+        filas_bloque: Filas por bloque del iterador
+        hilos: Hilos para el sketch (por defecto HILOS_XGB)
+        dir_cache: Directorio donde se crea el temporal de las páginas externas
+            (por defecto data/cache/xgb)
+
+    Returns:
+        QuantileDMatrix (o su equivalente en memoria externa)
+    """
+    import xgboost as xgb
+
+    llave = f"{huella_datos(X)[:16]}-{huella_datos(y)[:16]}-{max_bin}"
+    if llave in _MATRICES:
+        return _MATRICES[llave][0]
+
+    hilos = hilos or HILOS_XGB
+    inicio = time.perf_counter()
+    temporal = None
+    if externo:
+        raiz = Path(dir_cache or XGB_CACHE_DIR)
+        raiz.mkdir(parents=True, exist_ok=True)
+        temporal = tempfile.TemporaryDirectory(prefix=f"{llave}-", dir=raiz)
+        iterador = _iterador(X, y, filas_bloque, cache_prefix=str(Path(temporal.name) / "paginas"))
+        if hasattr(xgb, "ExtMemQuantileDMatrix"):
+            matriz = xgb.ExtMemQuantileDMatrix(iterador, max_bin=max_bin, nthread=hilos)
+        else:
+            matriz = xgb.DMatrix(iterador, nthread=hilos)
+    else:
+        matriz = xgb.QuantileDMatrix(_iterador(X, y, filas_bloque), max_bin=max_bin, nthread=hilos)
+    print(f"Matriz cuantizada de {X.shape[0]:,} filas en {time.perf_counter() - inicio:.1f} s")
+    _MATRICES[llave] = (matriz, temporal)
+    return matriz
+
+
+def liberar_matrices() -> None:
+    """Descarta las matrices cuantizadas del proceso y borra sus páginas externas."""
+    temporales = [temporal for _, temporal in _MATRICES.values() if temporal is not None]
+    _MATRICES.clear()
+    for temporal in temporales:
+        temporal.cleanup()
+
+
+def predecir_por_bloques(booster, X, filas_bloque: int = FILAS_BLOQUE) -> np.ndarray:
+    """Predicciones del booster recorriendo X por bloques (inplace_predict)."""
+    return np.concatenate([
+        np.ravel(booster.inplace_predict(
+            X[i:i + filas_bloque] if hasattr(X, "tocsr") else np.asarray(X[i:i + filas_bloque])))
+        for i in range(0, X.shape[0], filas_bloque)
+    ])
+
+
+def barrido_xgb(grilla: list, X_train, y_train, X_test, y_test, num_boost_round: int = 100,
+                max_bin: int = MAX_BIN, externo: bool = False, hilos: int = None,
+                devolver_modelo: bool = True) -> list:
+    """
+    Ajusta cada combinación de hiperparámetros sobre la misma matriz cuantizada.
+
+    Args:
+        grilla: Lista de diccionarios de parámetros de xgboost.train
+            (p. ej. {'max_depth': 6, 'eta': 0.1}); tree_method, max_bin y
+            nthread los fija esta función
+        X_train, y_train, X_test, y_test: Matrices de cargar_matrices()
+        num_boost_round: Árboles por ajuste (o 'n_estimators' en cada parámetro)
+        max_bin: Bins por variable
+        externo: Páginas cuantizadas en disco (ver matriz_cuantizada)
+        hilos: Presupuesto de hilos (por defecto HILOS_XGB)
+        devolver_modelo: Incluir el Booster en cada resultado
+
+    Returns:
+        Lista de resultados (parámetros, métricas y segundos) ordenada por RMSE
+    """
+    import xgboost as xgb
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+    hilos = hilos or HILOS_XGB
+    dtrain = matriz_cuantizada(X_train, y_train, max_bin, externo=externo, hilos=hilos)
+    y_test = np.asarray(y_test).ravel()
+
+    resultados = []
+    for parametros in grilla:
+        parametros = dict(parametros)
+        rondas = parametros.pop('n_estimators', num_boost_round)
+        completos = {'objective': 'reg:squarederror', **parametros,
+                     'tree_method': 'hist', 'max_bin': max_bin, 'nthread': hilos}
+        inicio = time.perf_counter()
+        booster = xgb.train(completos, dtrain, num_boost_round=rondas)
+        segundos = time.perf_counter() - inicio
+        y_pred = predecir_por_bloques(booster, X_test)
+        mse = mean_squared_error(y_test, y_pred)
+        resultado = {'parametros': {**parametros, 'n_estimators': rondas}, 'segundos_ajuste': segundos,
+                     'mae': mean_absolute_error(y_test, y_pred), 'mse': mse,
+                     'rmse': float(np.sqrt(mse)), 'r2': r2_score(y_test, y_pred)}
+        if devolver_modelo:
+            resultado['modelo'] = booster
+        print(f"{resultado['parametros']}: RMSE {resultado['rmse']:.2f} en {segundos:.1f} s")
+        resultados.append(resultado)
+    return sorted(resultados, key=lambda r: r['rmse'])
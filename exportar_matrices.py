@@ -0,0 +1,29 @@
+"""
+Script para exportar una sola vez las matrices de entrenamiento y prueba de
+los experimentos de modelos/ a archivos .npy mapeados en memoria.
+
+Uso:
+    python exportar_matrices.py [--dtype float32] [--sin-escalar] [--disperso]
+"""
+import argparse
+
+from entrenamiento.matrices import DATA_MODELOS_PATH, exportar_matrices
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta las matrices de modelos/ a .npy")
+    parser.add_argument("--csv", default=str(DATA_MODELOS_PATH), help="CSV limpio con dummies")
+    parser.add_argument("--dtype", default=None, choices=["float64", "float32"],
+                        help="Precisión (por defecto IMPORTACIONES_PRECISION o float64)")
+    parser.add_argument("--sin-escalar", action="store_true", help="Guardar X sin estandarizar")
+    parser.add_argument("--disperso", action="store_true",
+                        help="Guardar X en CSR, estandarizando solo las columnas numéricas")
+    args = parser.parse_args()
+
+    destino = exportar_matrices(args.csv, dtype=args.dtype, escalar=not args.sin_escalar,
+                                disperso=args.disperso)
+    print(f"Matrices guardadas en {destino}")
+
+
+if __name__ == "__main__":
+    main()
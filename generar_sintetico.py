@@ -0,0 +1,36 @@
+"""
+Script para generar datos sintéticos con el esquema del DANE, para probar la
+ingesta, el entrenamiento y la API sin los archivos versionados con DVC.
+
+Uso:
+    python generar_sintetico.py --filas 10000000 --salida data/sintetico/Importaciones2024.csv
+    python generar_sintetico.py --filas 1000000 --formato modelos \\
+        --salida data/sintetico/Importaciones2024limpia_modelos.csv --procesos 8
+"""
+import argparse
+import time
+
+from preprocesamiento.sintetico import SEMILLA, TAM_BLOQUE, escribir_sintetico
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera un CSV sintético con el esquema del DANE")
+    parser.add_argument("--filas", type=int, required=True, help="Filas del archivo (1k a 100M)")
+    parser.add_argument("--formato", default="crudo", choices=["crudo", "modelos"],
+                        help="CSV crudo del DANE o CSV limpio con dummies de modelos/")
+    parser.add_argument("--salida", required=True, help="Ruta del CSV")
+    parser.add_argument("--semilla", type=int, default=SEMILLA)
+    parser.add_argument("--anios", type=int, nargs="+", default=[2024], help="Años de los códigos fech")
+    parser.add_argument("--tam-bloque", type=int, default=TAM_BLOQUE, help="Filas por bloque")
+    parser.add_argument("--procesos", type=int, default=1, help="Procesos que generan bloques")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    filas = escribir_sintetico(args.salida, args.filas, args.formato, args.semilla, args.anios,
+                               args.tam_bloque, args.procesos)
+    print(f"{filas:,} filas ({args.formato}) escritas en {args.salida} "
+          f"en {time.perf_counter() - inicio:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
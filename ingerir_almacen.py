@@ -0,0 +1,39 @@
+"""
+Script para ingerir los archivos anuales del DANE en el almacén particionado
+por año y mes (data/almacen/<año>/<mes>.parquet).
+
+Uso:
+    python ingerir_almacen.py data/Importaciones2019.csv ... data/Importaciones2025.csv
+    python ingerir_almacen.py --incremental data/Importaciones2025.csv
+"""
+import argparse
+
+from preprocesamiento import ingerir_archivos, ingerir_incremental
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingiere archivos anuales del DANE en el almacén particionado")
+    parser.add_argument("rutas_csv", nargs="+", help="CSV crudos, uno por año")
+    parser.add_argument("--raiz", default=None, help="Directorio del almacén (por defecto data/almacen)")
+    parser.add_argument("--procesos", type=int, default=None, help="Número de procesos")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Procesar solo los meses nuevos o modificados (ver manifiesto.json)")
+    args = parser.parse_args()
+
+    if args.incremental:
+        resumen = ingerir_incremental(args.rutas_csv, args.raiz)
+        for archivo in resumen["sin_cambios"]:
+            print(f"Sin cambios: {archivo}")
+        print(f"Particiones escritas: {', '.join(resumen['escritas']) or 'ninguna'}")
+        if resumen["eliminadas"]:
+            print(f"Particiones eliminadas: {', '.join(resumen['eliminadas'])}")
+        return
+
+    escritas = ingerir_archivos(args.rutas_csv, args.raiz, procesos=args.procesos)
+    print(f"Particiones escritas: {len(escritas)}")
+    for anio, mes in escritas:
+        print(f"  {anio}/{mes:02d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,6 +25,8 @@ class ModeloImportaciones:
         # Cargar modelo e información
         self.modelo = joblib.load(model_path)
         self.info = joblib.load(info_path) if info_path.exists() else {}
+        # dtype con el que se entrenó el modelo (float64 en modelos anteriores a la opción)
+        self.precision = np.dtype(self.info.get('precision', 'float64'))
     
     def predecir(self, mes: int, pais_pro: str, aduana: str, tipo_importacion: str) -> float:
         """
@@ -47,11 +49,11 @@ class ModeloImportaciones:
         sin_fech = np.sin(2 * np.pi * mes / 12)
         cos_fech = np.cos(2 * np.pi * mes / 12)
         
-        # Crear DataFrame con los datos de entrada
+        # Crear DataFrame con los datos de entrada (en la precisión del entrenamiento)
         datos = pd.DataFrame({
-            'fech': [mes],
-            'sin_fech': [sin_fech],
-            'cos_fech': [cos_fech],
+            'fech': np.array([mes], dtype=self.precision),
+            'sin_fech': np.array([sin_fech], dtype=self.precision),
+            'cos_fech': np.array([cos_fech], dtype=self.precision),
             'adua': [aduana],
             'paispro': [pais_pro],
             'tipoim': [tipo_importacion]
@@ -1,29 +1,29 @@
-import pandas as pd
-from sklearn.discriminant_analysis import StandardScaler
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from sklearn.tree import DecisionTreeRegressor
 import mlflow
 import mlflow.sklearn
+import sys
+from pathlib import Path
 
-dataframe = pd.read_csv("../data/Importaciones2024limpia_modelos.csv")
-
+# Utilidades compartidas en la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from entrenamiento import ajustar_en_cache, cargar_matrices
+from entrenamiento.submuestra import submuestra_matrices
 
 mlflow.set_tracking_uri("http://localhost:8050")
 experiment = mlflow.set_experiment("proyecto_soluciones_analiticas")
 
-X = dataframe.drop(columns=['vacid'])
-y = dataframe['vacid']
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+# Matrices divididas y estandarizadas una sola vez (python exportar_matrices.py)
+X_train, X_test, y_train, y_test = cargar_matrices()
 
-#Estandarización
-scaler = StandardScaler()
-X_train = scaler.fit_transform(X_train)
-X_test = scaler.transform(X_test)
+# Submuestra estratificada por mes × adua × paispro × tipoim para comparar
+# configuraciones rápido (IMPORTACIONES_SUBMUESTRA=0.1 o 50000; vacío = todo)
+X_train, y_train, _ = submuestra_matrices(X_train, y_train)
 
 with mlflow.start_run(experiment_id=experiment.experiment_id, run_name="DecisionTreeRegressor_maxDepth20"):
     modelo_dt = DecisionTreeRegressor(max_depth=20, random_state=42)  # Ajusta max_depth según sea necesario
-    modelo_dt.fit(X_train, y_train)
+    modelo_dt = ajustar_en_cache(modelo_dt, X_train, y_train)
+    mlflow.log_param("filas_train", len(X_train))
 
 	# Predicción
     y_pred_dt = modelo_dt.predict(X_test)
@@ -0,0 +1,33 @@
+import mlflow
+import mlflow.sklearn
+import sys
+from pathlib import Path
+
+# Utilidades compartidas en la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from entrenamiento import cargar_matrices, leer_manifiesto
+from entrenamiento.ruta_enet import guardar_ruta, ruta_enet
+from entrenamiento.experimentos import metricas_mlflow
+
+mlflow.set_tracking_uri("http://localhost:8050")
+experiment = mlflow.set_experiment("proyecto_soluciones_analiticas")
+
+# Matrices divididas y estandarizadas una sola vez (python exportar_matrices.py)
+X_train, X_test, y_train, y_test = cargar_matrices()
+
+# Ruta de 50 alphas para Lasso (l1_ratio=1) y ElasticNet, con una sola matriz de Gram
+l1_ratios = [1.0, 0.9, 0.7, 0.5, 0.3, 0.1]
+tabla = ruta_enet(X_train, y_train, X_test, y_test, l1_ratios=l1_ratios,
+                  columnas=leer_manifiesto()['columnas'])
+directorio = guardar_ruta(tabla)
+print(tabla.drop(columns=['variables']).to_string(index=False))
+print(f"Ruta y variables seleccionadas guardadas en {directorio}")
+
+# Un run por l1_ratio con las métricas por paso de la ruta
+for l1_ratio, ruta in tabla.groupby('l1_ratio', sort=False):
+    with mlflow.start_run(experiment_id=experiment.experiment_id, run_name=f"ElasticNetPath_l1_{l1_ratio:g}"):
+        mlflow.log_param("l1_ratio", l1_ratio)
+        mlflow.log_param("n_alphas", len(ruta))
+        for paso, fila in enumerate(ruta.drop(columns=['variables', 'l1_ratio']).to_dict("records")):
+            mlflow.log_metrics(metricas_mlflow(fila), step=paso)
+        mlflow.log_artifacts(str(directorio))
@@ -1,58 +1,42 @@
-import pandas as pd
-from sklearn.decomposition import PCA
-from sklearn.discriminant_analysis import StandardScaler
-from sklearn.feature_selection import SequentialFeatureSelector
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-from sklearn.linear_model import LinearRegression, Ridge, Lasso, ElasticNet
 import mlflow
 import mlflow.sklearn
+import sys
+from pathlib import Path
 
-dataframe = pd.read_csv("../data/Importaciones2024limpia_modelos.csv")
-
-
-
+# Utilidades compartidas en la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from entrenamiento import cargar_matrices
+from entrenamiento.experimentos import metricas_mlflow
+from entrenamiento.pca_regresion import regresion_pca
 
 mlflow.set_tracking_uri("http://localhost:8050")
 experiment = mlflow.set_experiment("proyecto_soluciones_analiticas")
 
-X = dataframe.drop(columns=['vacid'])
-y = dataframe['vacid']
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-#Estandarización
-scaler = StandardScaler()
-X_train = scaler.fit_transform(X_train)
-X_test = scaler.transform(X_test)
+# Matrices divididas y estandarizadas una sola vez (python exportar_matrices.py)
+X_train, X_test, y_train, y_test = cargar_matrices()
 
 with mlflow.start_run(experiment_id=experiment.experiment_id):
-    # Escalar solo con los datos de entrenamiento
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)  # Solo transformamos X_test
-
-    # Aplicar PCA con los datos de entrenamiento
-    pca = PCA(n_components=0.95)  # Mantener 95% de la varianza
-    X_train_pca = pca.fit_transform(X_train_scaled)
-    X_test_pca = pca.transform(X_test_scaled)  # Aplicamos PCA también a los datos de prueba
-    
-    # Entrenar el modelo de Regresión Lineal con los datos transformados
-    modelo_lr = LinearRegression()
-    modelo_lr.fit(X_train_pca, y_train)
-
-    # Predicción
-    y_pred_lr = modelo_lr.predict(X_test_pca)
+    # Las matrices ya vienen estandarizadas con el escalador de X_train.
+    # "incremental": IncrementalPCA por bloques de las matrices mapeadas en memoria;
+    # "aleatorio": SVD aleatorizada. Ambos eligen las componentes hasta explicar el 95% de la varianza.
+    modo = "incremental"
+    varianza = 0.95
+    modelo_pca_lr, metricas = regresion_pca(X_train, y_train, X_test, y_test,
+                                            varianza=varianza, modo=modo)
 
     # Evaluación del modelo
-    mae_pca = mean_absolute_error(y_test, y_pred_lr)
-    rmse_pca = mean_squared_error(y_test, y_pred_lr)
-    r2_pca = r2_score(y_test, y_pred_lr)
+    mae_pca = metricas['MAE']
+    rmse_pca = metricas['RMSE']
+    r2_pca = metricas['R2']
 
+    print(f"Componentes: {modelo_pca_lr.named_steps['pca'].n_components_}")
     print(f"MAE: {mae_pca}, RMSE: {rmse_pca}, R2: {r2_pca}")
 
+    mlflow.log_param("modo_pca", modo)
+    mlflow.log_param("varianza", varianza)
+    mlflow.log_param("n_componentes", modelo_pca_lr.named_steps['pca'].n_components_)
 
     # Registre el modelo
-    mlflow.sklearn.log_model(modelo_lr, "pca_linear_regression_model")
-    mlflow.log_metric("mae", mae_pca)
-    mlflow.log_metric("rmse", rmse_pca)
-    mlflow.log_metric("r2", r2_pca)
\ No newline at end of file
+    mlflow.sklearn.log_model(modelo_pca_lr, "pca_linear_regression_model")
+    mlflow.log_metrics(metricas_mlflow({'mae': mae_pca, 'mse': rmse_pca ** 2, 'rmse': rmse_pca,
+                                        'r2': r2_pca}))
@@ -0,0 +1,33 @@
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+import mlflow
+import mlflow.sklearn
+import numpy as np
+import sys
+from pathlib import Path
+
+# Utilidades compartidas en la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from entrenamiento import cargar_matrices
+from entrenamiento.disperso import resolver_disperso
+from entrenamiento.experimentos import metricas_mlflow
+from entrenamiento.por_bloques import estimador_lineal
+
+mlflow.set_tracking_uri("http://localhost:8050")
+experiment = mlflow.set_experiment("proyecto_soluciones_analiticas")
+
+# X en CSR con solo las columnas numéricas estandarizadas (python exportar_matrices.py --disperso)
+X_train, X_test, y_train, y_test = cargar_matrices(disperso=True)
+
+for alpha in [0.0, 1, 10, 100]:
+    nombre = "LinearRegressionDisperso" if alpha == 0 else f"RidgeDisperso_alpha{alpha}"
+    with mlflow.start_run(experiment_id=experiment.experiment_id, run_name=nombre):
+        # Ecuaciones normales sobre los no ceros, o LSMR si hay demasiadas columnas
+        modelo = estimador_lineal(*resolver_disperso(X_train, y_train, alpha=alpha), alpha=alpha)
+        y_pred = modelo.predict(X_test)
+
+        mlflow.log_param("alpha", alpha)
+        mlflow.log_param("no_ceros_train", X_train.nnz)
+        mse = mean_squared_error(y_test, y_pred)
+        mlflow.log_metrics(metricas_mlflow({'mae': mean_absolute_error(y_test, y_pred), 'mse': mse,
+                                            'rmse': np.sqrt(mse), 'r2': r2_score(y_test, y_pred)}))
+        mlflow.sklearn.log_model(modelo, "modelo")
@@ -0,0 +1,24 @@
+import mlflow
+import mlflow.sklearn
+import sys
+from pathlib import Path
+
+# Utilidades compartidas en la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from entrenamiento import cargar_matrices, leer_manifiesto
+from entrenamiento.ruta_ridge import registrar_ruta_mlflow, ruta_ridge
+
+mlflow.set_tracking_uri("http://localhost:8050")
+experiment = mlflow.set_experiment("proyecto_soluciones_analiticas")
+
+# Matrices divididas y estandarizadas una sola vez (python exportar_matrices.py)
+X_train, X_test, y_train, y_test = cargar_matrices()
+
+# Todos los alphas de los scripts Ridge*.py (y más) con una sola SVD de X_train
+alphas = [0.001, 0.01, 0.1, 1, 10, 100, 1000, 10000]
+tabla = ruta_ridge(X_train, y_train, X_test, y_test, alphas=alphas)
+print(tabla.to_string(index=False))
+print("Alpha con menor GCV:", tabla.loc[tabla['gcv'].idxmin(), 'alpha'])
+
+# Un solo run con las métricas por paso de la ruta
+registrar_ruta_mlflow(tabla, experiment.experiment_id, columnas=leer_manifiesto()['columnas'])
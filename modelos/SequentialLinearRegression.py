@@ -1,45 +1,41 @@
-import pandas as pd
-from sklearn.discriminant_analysis import StandardScaler
-from sklearn.feature_selection import SequentialFeatureSelector
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from sklearn.linear_model import LinearRegression, Ridge, Lasso, ElasticNet
 import mlflow
 import mlflow.sklearn
+import sys
+from pathlib import Path
 
-dataframe = pd.read_csv("../data/Importaciones2024limpia_modelos.csv")
-
+# Utilidades compartidas en la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from entrenamiento import ajustar_en_cache, cargar_matrices, leer_manifiesto
+from entrenamiento.seleccion import SeleccionAdelante
 
 mlflow.set_tracking_uri("http://localhost:8050")
 experiment = mlflow.set_experiment("proyecto_soluciones_analiticas")
 
-X = dataframe.drop(columns=['vacid'])
-y = dataframe['vacid']
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-#Estandarización
-scaler = StandardScaler()
-X_train = scaler.fit_transform(X_train)
-X_test = scaler.transform(X_test)
+# Matrices divididas y estandarizadas una sola vez (python exportar_matrices.py)
+X_train, X_test, y_train, y_test = cargar_matrices()
 
 with mlflow.start_run(experiment_id=experiment.experiment_id):
     alpha = 0.01
     
 
-    modelo_base = LinearRegression()
-    sfs = SequentialFeatureSelector(modelo_base, direction="forward", n_features_to_select="auto", cv=5)
-    sfs.fit(X_train, y_train)
+    # Mismas variables que SequentialFeatureSelector(LinearRegression(), direction="forward",
+    # n_features_to_select="auto", cv=5), con matrices de Gram por pliegue en lugar de reajustes
+    sfs = SeleccionAdelante(n_variables="auto", pliegues=5)
+    sfs = ajustar_en_cache(sfs, X_train, y_train)
 
-    # Variables seleccionadas
-    selected_features = X_train.columns[sfs.get_support()]
-    print("Variables seleccionadas:", list(selected_features))
+    # Variables seleccionadas (nombres desde el manifiesto de las matrices)
+    columnas = leer_manifiesto()['columnas']
+    selected_features = [c for c, elegida in zip(columnas, sfs.get_support()) if elegida]
+    print("Variables seleccionadas:", selected_features)
 
     # Entrenar el modelo con las variables seleccionadas
-    X_train_selected = X_train[selected_features]
-    X_test_selected = X_test[selected_features]
+    X_train_selected = X_train[:, sfs.get_support()]
+    X_test_selected = X_test[:, sfs.get_support()]
 
     modelo_final = LinearRegression()
-    modelo_final.fit(X_train_selected, y_train)
+    modelo_final = ajustar_en_cache(modelo_final, X_train_selected, y_train)
 
     # Hacer predicciones
     y_pred = modelo_final.predict(X_test_selected)
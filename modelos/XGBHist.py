@@ -0,0 +1,36 @@
+import mlflow
+import mlflow.xgboost
+import os
+import sys
+from pathlib import Path
+
+# Utilidades compartidas en la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from entrenamiento import cargar_matrices
+from entrenamiento.experimentos import metricas_mlflow
+from entrenamiento.xgb_externo import HILOS_XGB, barrido_xgb
+
+mlflow.set_tracking_uri("http://localhost:8050")
+experiment = mlflow.set_experiment("proyecto_soluciones_analiticas")
+
+# Matrices mapeadas en memoria; XGBoost las lee por bloques y solo guarda los bins
+X_train, X_test, y_train, y_test = cargar_matrices()
+
+# IMPORTACIONES_XGB_EXTERNO=1 deja las páginas cuantizadas en disco (data/cache/xgb/)
+externo = os.getenv("IMPORTACIONES_XGB_EXTERNO", "0") not in ("", "0")
+
+# Todas las combinaciones reutilizan la misma matriz cuantizada (un solo sketch)
+grilla = [{'max_depth': d, 'eta': eta, 'n_estimators': n, 'seed': 42}
+          for d in (6, 8) for eta in (0.1, 0.05) for n in (100, 200)]
+resultados = barrido_xgb(grilla, X_train, y_train, X_test, y_test, externo=externo)
+
+for resultado in resultados:
+    parametros = resultado['parametros']
+    nombre = f"XGBHist_depth{parametros['max_depth']}_eta{parametros['eta']}_n{parametros['n_estimators']}"
+    with mlflow.start_run(experiment_id=experiment.experiment_id, run_name=nombre):
+        mlflow.log_params({**parametros, 'tree_method': 'hist', 'nthread': HILOS_XGB,
+                           'memoria_externa': externo})
+        mlflow.log_param("filas_train", len(X_train))
+        mlflow.log_metrics(metricas_mlflow({k: resultado[k] for k in
+                                            ('mae', 'mse', 'rmse', 'r2', 'segundos_ajuste')}))
+        mlflow.xgboost.log_model(resultado['modelo'], "modelo_xgb")
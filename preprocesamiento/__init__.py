@@ -0,0 +1,13 @@
+"""
+Paquete de carga y limpieza de los datos de importaciones del DANE.
+"""
+from .limpieza import leer_csv_crudo, limpiar_importaciones
+from .plan import PlanLimpieza
+from .cache import cargar_importaciones_limpias
+from .almacen import ingerir_archivos, leer_almacen
+from .incremental import ingerir_incremental
+
+__all__ = [
+    "leer_csv_crudo", "limpiar_importaciones", "PlanLimpieza", "cargar_importaciones_limpias",
+    "ingerir_archivos", "leer_almacen", "ingerir_incremental",
+]
@@ -0,0 +1,146 @@
+"""
+Almacén del dataset limpio particionado por año y mes.
+
+Cada archivo anual del DANE (Importaciones2019.csv ... Importaciones2025.csv)
+se limpia con el plan de limpieza y se escribe como un Parquet por mes:
+
+    data/almacen/2024/01.parquet
+    data/almacen/2024/02.parquet
+    ...
+
+Los archivos anuales se ingieren en paralelo (un proceso por archivo). Los
+lectores (entrenamiento, tablero, análisis) piden solo los años y meses que
+necesitan y únicamente se abren esas particiones; la selección se hace por
+la ruta, sin leer el resto del histórico.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from .cache import BASE_DIR, _a_columnar, _limpiar_completo
+from .columnas import COLUMNAS_MODELO
+from .paralelo import concatenar_partes
+
+ALMACEN_DIR = Path(os.getenv("IMPORTACIONES_ALMACEN_DIR", BASE_DIR / "data" / "almacen"))
+
+
+def columnas_almacen(salida=None) -> list:
+    """Columnas guardadas: las pedidas más fech y anio, que definen la partición."""
+    return list(dict.fromkeys([*(salida or COLUMNAS_MODELO), 'fech', 'anio']))
+
+
+def ruta_particion(raiz, anio: int, mes: int) -> Path:
+    """Ruta del Parquet de un año y mes."""
+    return Path(raiz) / f"{int(anio)}" / f"{int(mes):02d}.parquet"
+
+
+def escribir_particiones(df: pd.DataFrame, raiz=None) -> list:
+    """
+    Escribe un DataFrame limpio como una partición por año y mes.
+
+    Las particiones existentes de esos meses se reemplazan de forma atómica.
+
+    Returns:
+        Lista de tuplas (anio, mes) escritas
+    """
+    raiz = Path(raiz or ALMACEN_DIR)
+    escritas = []
+    for (anio, mes), particion in df.groupby(['anio', 'fech'], sort=True):
+        ruta = ruta_particion(raiz, anio, mes)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        tmp = ruta.with_suffix(".tmp")
+        _a_columnar(particion).to_parquet(tmp, index=True)
+        os.replace(tmp, ruta)
+        escritas.append((int(anio), int(mes)))
+    return escritas
+
+
+def _ingerir_archivo(ruta_csv, raiz, salida=None) -> list:
+    """Trabajo de cada proceso: limpia un archivo anual y escribe sus meses."""
+    df = _limpiar_completo(ruta_csv, columnas_almacen(salida), anios=None)
+    escritas = escribir_particiones(df, raiz)
+
+    # Un año re-ingerido no conserva meses que ya no trae el archivo
+    for anio in {a for a, _ in escritas}:
+        for ruta in (Path(raiz) / str(anio)).glob("*.parquet"):
+            if (anio, int(ruta.stem)) not in escritas:
+                ruta.unlink()
+    return escritas
+
+
+def ingerir_archivos(rutas_csv, raiz=None, salida=None, procesos: int = None) -> list:
+    """
+    Limpia varios archivos anuales en paralelo y los escribe en el almacén.
+
+    Args:
+        rutas_csv: Rutas de los CSV crudos (uno por año)
+        raiz: Directorio del almacén (por defecto data/almacen)
+        salida: Columnas del dataset limpio (por defecto las del modelo)
+        procesos: Número de procesos (por defecto uno por archivo, hasta os.cpu_count())
+
+    Returns:
+        Lista ordenada de tuplas (anio, mes) escritas
+    """
+    raiz = Path(raiz or ALMACEN_DIR)
+    rutas_csv = list(rutas_csv)
+    procesos = procesos or min(len(rutas_csv), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        futuros = [ejecutor.submit(_ingerir_archivo, r, raiz, salida) for r in rutas_csv]
+        escritas = [p for f in futuros for p in f.result()]
+    return sorted(escritas)
+
+
+def particiones(raiz=None, anios=None, meses=None) -> list:
+    """
+    Rutas de las particiones que cumplen el filtro, ordenadas por año y mes.
+
+    Args:
+        raiz: Directorio del almacén
+        anios: Años a incluir (None = todos)
+        meses: Meses 1-12 a incluir (None = todos)
+    """
+    raiz = Path(raiz or ALMACEN_DIR)
+    if not raiz.exists():
+        return []
+    rutas = []
+    for dir_anio in sorted(raiz.iterdir()):
+        if not dir_anio.is_dir() or not dir_anio.name.isdigit():
+            continue
+        if anios is not None and int(dir_anio.name) not in anios:
+            continue
+        for ruta in sorted(dir_anio.glob("*.parquet")):
+            if meses is None or int(ruta.stem) in meses:
+                rutas.append(ruta)
+    return rutas
+
+
+def leer_almacen(raiz=None, anios=None, meses=None, columnas=None) -> pd.DataFrame:
+    """
+    Lee del almacén solo las particiones de los años y meses pedidos.
+
+    Dentro de cada año las filas quedan en el orden del archivo original
+    (el índice es la fila en el CSV de ese año), de modo que un año completo
+    es idéntico a cargarlo directamente desde su CSV.
+
+    Args:
+        raiz: Directorio del almacén (por defecto data/almacen)
+        anios: Años a incluir (None = todos)
+        meses: Meses 1-12 a incluir (None = todos)
+        columnas: Columnas a leer (None = todas)
+
+    Returns:
+        DataFrame limpio
+    """
+    rutas = particiones(raiz, anios, meses)
+    if not rutas:
+        raise FileNotFoundError(
+            f"No hay particiones en {raiz or ALMACEN_DIR} para anios={anios} meses={meses}")
+    por_anio = {}
+    for ruta in rutas:
+        por_anio.setdefault(ruta.parent.name, []).append(pd.read_parquet(ruta, columns=columnas))
+    partes = [concatenar_partes(meses_anio).sort_index(kind="stable")
+              for meses_anio in por_anio.values()]
+    return concatenar_partes(partes)
+
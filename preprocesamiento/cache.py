@@ -0,0 +1,193 @@
+"""
+Caché columnar (Parquet) del dataset de importaciones ya limpio.
+
+La llave del caché combina el md5 del CSV registrado por DVC con un hash del
+código de limpieza, de modo que el archivo se invalida solo cuando cambian
+los datos o la lógica que los transforma.
+"""
+import hashlib
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from . import columnas, ingesta, limpieza, mapeos, numericos, paralelo, plan, tablas
+from .instrumentacion import PERFIL, etapa
+from .mapeos import ANIO_ARCHIVO
+from .plan import PlanLimpieza
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DVC_PATH = BASE_DIR / "data" / "Importaciones2024.csv.dvc"
+CACHE_DIR = Path(os.getenv("IMPORTACIONES_CACHE_DIR", BASE_DIR / "data" / "cache"))
+
+# Módulos cuyo código fuente determina el resultado de la limpieza
+MODULOS_LIMPIEZA = [limpieza, columnas, mapeos, numericos, tablas, plan, ingesta, paralelo]
+
+# Se incrementa si cambia el formato del archivo de caché
+VERSION_CACHE = 1
+
+
+def leer_dvc(ruta_dvc) -> dict:
+    """Lee el md5 y el tamaño registrados en un archivo .dvc."""
+    info = {}
+    ruta_dvc = Path(ruta_dvc)
+    if not ruta_dvc.exists():
+        return info
+    for linea in ruta_dvc.read_text(encoding="utf-8").splitlines():
+        clave, _, valor = linea.strip().lstrip("- ").partition(":")
+        if clave in ("md5", "size") and valor.strip():
+            info.setdefault(clave, valor.strip())
+    if "size" in info:
+        info["size"] = int(info["size"])
+    return info
+
+
+def md5_archivo(ruta, tam_bloque: int = 1 << 20) -> str:
+    """Calcula el md5 de un archivo leyéndolo por bloques."""
+    h = hashlib.md5()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(tam_bloque), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def huella_datos(ruta_csv, ruta_dvc=DVC_PATH) -> str:
+    """
+    Retorna el md5 del CSV crudo.
+
+    Usa el md5 de DVC cuando el archivo local coincide en tamaño con el
+    registrado; si no (archivo distinto o puntero LFS), lo calcula.
+    """
+    info = leer_dvc(ruta_dvc) if ruta_dvc else {}
+    ruta_csv = Path(ruta_csv)
+    if "md5" in info:
+        if not ruta_csv.exists() or ruta_csv.stat().st_size == info.get("size"):
+            return info["md5"]
+    return md5_archivo(ruta_csv)
+
+
+def huella_codigo(modulos=None) -> str:
+    """Retorna un hash del código fuente de los módulos de limpieza."""
+    h = hashlib.sha256(f"v{VERSION_CACHE}".encode())
+    for modulo in modulos or MODULOS_LIMPIEZA:
+        h.update(Path(modulo.__file__).read_bytes())
+    return h.hexdigest()
+
+
+def ruta_cache(ruta_csv, ruta_dvc=DVC_PATH, dir_cache=None, salida=None) -> Path:
+    """Retorna la ruta del archivo de caché para los datos, código y columnas actuales."""
+    dir_cache = Path(dir_cache) if dir_cache else CACHE_DIR
+    nombre = Path(ruta_csv).stem
+    if salida:
+        nombre += "_" + hashlib.sha256(",".join(salida).encode()).hexdigest()[:8]
+    llave = f"{huella_datos(ruta_csv, ruta_dvc)[:16]}-{huella_codigo()[:16]}"
+    return dir_cache / f"{nombre}-{llave}.parquet"
+
+
+def _a_columnar(df: pd.DataFrame) -> pd.DataFrame:
+    """Convierte columnas de texto a categóricas (diccionario en Parquet)."""
+    df = df.copy()
+    for c in df.columns:
+        if pd.api.types.infer_dtype(df[c], skipna=True) == "string":
+            df[c] = df[c].astype("category")
+    return df
+
+
+def guardar_cache(df: pd.DataFrame, ruta: Path) -> None:
+    """Escribe el DataFrame limpio y elimina versiones anteriores del caché."""
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    tmp = ruta.with_suffix(".tmp")
+    _a_columnar(df).to_parquet(tmp, index=True)
+    os.replace(tmp, ruta)
+    _limpiar_versiones_viejas(ruta)
+
+
+def _limpiar_versiones_viejas(ruta: Path) -> None:
+    """Elimina los archivos de caché del mismo CSV con otra llave."""
+    prefijo = ruta.name.rsplit("-", 2)[0]
+    for viejo in ruta.parent.glob(f"{prefijo}-*.parquet"):
+        if viejo != ruta:
+            viejo.unlink(missing_ok=True)
+
+
+def _limpiar_completo(ruta_csv, salida=None, procesos=None, anios=(ANIO_ARCHIVO,)) -> pd.DataFrame:
+    """
+    Lee las columnas del plan y aplica la limpieza en memoria.
+
+    Por defecto solo se conservan los códigos fech de ANIO_ARCHIVO, como en
+    el archivo único de 2024; el almacén pasa anios=None.
+    """
+    if procesos:
+        with etapa(f"limpieza_paralela ({procesos} procesos)") as e:
+            df = paralelo.cargar_en_paralelo(ruta_csv, procesos, salida=salida, anios=anios)
+            e.filas_salida = len(df)
+        return df
+    plan_limpieza = PlanLimpieza(salida=salida, anios=anios)
+    return plan_limpieza.ejecutar(limpieza.leer_csv_crudo(ruta_csv, salida))
+
+
+def cargar_importaciones_limpias(ruta_csv, ruta_dvc=DVC_PATH, dir_cache=None,
+                                 usar_cache: bool = True, tam_bloque=None,
+                                 salida=None, procesos=None) -> pd.DataFrame:
+    """
+    Carga el dataset limpio desde el caché o lo construye desde el CSV.
+
+    Args:
+        ruta_csv: Ruta del CSV crudo del DANE
+        ruta_dvc: Archivo .dvc con el md5 del CSV (None para calcularlo)
+        dir_cache: Directorio del caché (por defecto data/cache)
+        usar_cache: Si es False siempre se procesa el CSV
+        tam_bloque: Si se indica, el CSV se procesa por bloques de ese
+            número de filas con memoria acotada (ver ingesta.py)
+        salida: Columnas del dataset limpio (por defecto las del modelo);
+            solo se leen del CSV las columnas crudas que estas necesitan
+        procesos: Si se indica, el CSV se parsea y limpia en paralelo con ese
+            número de procesos (ver paralelo.py); tam_bloque tiene prioridad
+
+    Returns:
+        DataFrame con las columnas pedidas
+    """
+    PERFIL.reiniciar()
+    df = _cargar(ruta_csv, ruta_dvc, dir_cache, usar_cache, tam_bloque, salida, procesos)
+    if PERFIL.activo:
+        print(PERFIL.tabla_resumen())
+        print(f"Reporte de etapas guardado en {PERFIL.guardar_reporte()}")
+    return df
+
+
+def _cargar(ruta_csv, ruta_dvc, dir_cache, usar_cache, tam_bloque, salida, procesos) -> pd.DataFrame:
+    """Cuerpo de cargar_importaciones_limpias, sin el reporte de etapas."""
+    if not usar_cache:
+        if tam_bloque:
+            # Las categorías de cada bloque se unifican como en la carga en paralelo
+            return paralelo.concatenar_partes(
+                list(ingesta.iterar_bloques_limpios(ruta_csv, tam_bloque, salida=salida)))
+        return _limpiar_completo(ruta_csv, salida, procesos)
+
+    with etapa("huella_cache"):
+        ruta = ruta_cache(ruta_csv, ruta_dvc, dir_cache, salida)
+    if ruta.exists():
+        try:
+            print(f"Cargando datos limpios desde caché {ruta.name}...")
+            with etapa("leer_cache") as e:
+                df = pd.read_parquet(ruta)
+                e.filas_salida = len(df)
+            return df
+        except (ImportError, OSError, ValueError) as e:
+            # Archivo truncado o ilegible (ArrowInvalid es un ValueError): se reconstruye
+            print(f"No es posible leer el caché ({e}); se procesa el CSV.")
+            ruta.unlink(missing_ok=True)
+
+    if tam_bloque:
+        print(f"Procesando {Path(ruta_csv).name} por bloques de {tam_bloque} filas...")
+        ingesta.ingerir_por_bloques(ruta_csv, ruta, tam_bloque, salida=salida)
+        _limpiar_versiones_viejas(ruta)
+        return pd.read_parquet(ruta)
+
+    df = _limpiar_completo(ruta_csv, salida, procesos)
+    try:
+        with etapa("guardar_cache", len(df)):
+            guardar_cache(df, ruta)
+    except (ImportError, ValueError, TypeError) as e:
+        print(f"No fue posible guardar el caché ({e}).")
+    return df
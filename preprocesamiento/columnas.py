@@ -0,0 +1,71 @@
+"""
+Plan de columnas: qué columnas crudas leer y con qué tipo.
+
+A partir de las columnas pedidas en el dataset limpio se derivan las columnas
+crudas de las que dependen (incluidas las de los filtros de filas), de modo
+que read_csv solo pague el costo de parseo de esas columnas.
+"""
+from .numericos import TIPO_TEXTO
+
+# Columnas con números en formato colombiano (punto de miles y coma decimal)
+COLUMNAS_NUMERICAS = ['pbk','pnk','naban','canu','vafodo','flete','vacid','vacip','vadua','vrajus','baseiva','totalivayo','seguros','otrosg','porara']
+
+# Columnas necesarias para el modelo y el target
+COLUMNAS_MODELO = ['vacid','fech','sin_fech','cos_fech','adua','paispro','tipoim']
+
+# Columnas crudas usadas por los filtros de filas de la limpieza
+COLUMNAS_FILTROS = ['seguros','pbk','copaex','paisgen','paispro','adua']
+
+# Columnas derivadas y las columnas crudas de las que se calculan
+DERIVADAS = {
+    'anio': ['fech'],
+    'trimestre': ['fech'],
+    'sin_fech': ['fech'],
+    'cos_fech': ['fech'],
+}
+
+# Tipos de lectura por columna cruda: códigos enteros como enteros con
+# faltantes, textos de baja cardinalidad como categóricos y números en
+# formato colombiano como texto (se decodifican en numericos.py)
+TIPOS_CRUDOS = {
+    'fech': 'float64',
+    **{c: 'Int64' for c in ['adua','paisgen','paispro','paiscom','deptodes','viatrans','bandera',
+                            'otder','cuidaimp','actecon','codadad','otrosp','otrosbase','depim',
+                            'copaex','tipoim','derel']},
+    **{c: 'category' for c in ['regimen','coda','imp1','clase','cuidaexp','luin','codluin']},
+    **{c: TIPO_TEXTO for c in COLUMNAS_NUMERICAS},
+}
+
+
+def columnas_crudas(salida=None, filtros: bool = True) -> list:
+    """
+    Retorna las columnas crudas necesarias para producir las columnas de salida.
+
+    Args:
+        salida: Columnas pedidas en el dataset limpio (por defecto las del modelo)
+        filtros: Si es True se incluyen las columnas de los filtros de filas
+
+    Returns:
+        Lista ordenada y sin repetidos de columnas crudas
+    """
+    columnas = []
+    for c in salida or COLUMNAS_MODELO:
+        columnas.extend(DERIVADAS.get(c, [c]))
+    if filtros:
+        columnas.extend(COLUMNAS_FILTROS)
+    return list(dict.fromkeys(columnas))
+
+
+def tipos_columnas(columnas) -> dict:
+    """Retorna el dtype de lectura de las columnas crudas indicadas."""
+    return {c: TIPOS_CRUDOS[c] for c in columnas if c in TIPOS_CRUDOS}
+
+
+def argumentos_lectura(salida=None, filtros: bool = True) -> dict:
+    """Argumentos usecols y dtype de read_csv para el plan de columnas."""
+    columnas = columnas_crudas(salida, filtros)
+    pedidas = set(columnas)
+    return {
+        'usecols': lambda c: c in pedidas,
+        'dtype': tipos_columnas(columnas),
+    }
@@ -0,0 +1,228 @@
+"""
+Ingesta incremental por mes hacia el almacén particionado (almacen.py).
+
+El DANE publica un mes a la vez. En lugar de volver a limpiar el año
+completo, se calcula una huella (md5) de las filas crudas de cada mes y se
+compara con el manifiesto del almacén (data/almacen/manifiesto.json):
+
+- Si el md5 del archivo ya está registrado, el archivo se omite sin leerlo
+  con pandas, de modo que volver a ejecutar la ingesta no hace nada.
+- Si cambió, solo se parsean y limpian las filas de los meses nuevos o
+  modificados, y se reemplazan sus particiones.
+
+Los pasos globales de la limpieza (columnas con suma 0 y media de flete) se
+resuelven por año combinando los agregados parciales de cada mes, que
+también se guardan en el manifiesto. Si el mes nuevo cambia esos agregados
+de forma que afecta las columnas guardadas, se vuelve a limpiar el año.
+"""
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from .almacen import ALMACEN_DIR, columnas_almacen, escribir_particiones, ruta_particion
+from .cache import huella_codigo, md5_archivo
+from .columnas import argumentos_lectura
+from .mapeos import MAP_ANIOS, MAP_FECHAS
+from .plan import PlanLimpieza, agregados_parciales, combinar_agregados
+
+MANIFIESTO = "manifiesto.json"
+VERSION_MANIFIESTO = 1
+
+
+def cargar_manifiesto(raiz=None) -> dict:
+    """Lee el manifiesto del almacén (vacío si no existe)."""
+    ruta = Path(raiz or ALMACEN_DIR) / MANIFIESTO
+    if not ruta.exists():
+        return {}
+    return json.loads(ruta.read_text(encoding="utf-8"))
+
+
+def guardar_manifiesto(manifiesto: dict, raiz=None) -> None:
+    """Escribe el manifiesto de forma atómica."""
+    ruta = Path(raiz or ALMACEN_DIR) / MANIFIESTO
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    tmp = ruta.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifiesto, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, ruta)
+
+
+def _recorrer_filas(ruta_csv):
+    """
+    Itera (fila, código fech, línea en bytes) sobre las filas de datos del CSV.
+
+    El código fech de cada fila se obtiene con el parser de pandas (solo esa
+    columna); las líneas en blanco se omiten igual que en read_csv.
+    """
+    codigos = pd.read_csv(ruta_csv, encoding="latin-1", usecols=['fech'],
+                          dtype={'fech': 'float64'})['fech'].to_numpy()
+    fila = 0
+    with open(ruta_csv, "rb") as f:
+        f.readline()
+        for linea in f:
+            if not linea.strip():
+                continue
+            if fila >= len(codigos):
+                raise ValueError(f"{ruta_csv}: hay más líneas que filas parseadas")
+            yield fila, float(codigos[fila]), linea
+            fila += 1
+    if fila != len(codigos):
+        raise ValueError(f"{ruta_csv}: hay menos líneas que filas parseadas")
+
+
+def _encabezado(ruta_csv) -> bytes:
+    with open(ruta_csv, "rb") as f:
+        return f.readline()
+
+
+def _llave(codigo: float) -> str:
+    """Llave del manifiesto para un código fech (2401.0 -> "2024/01")."""
+    return f"{MAP_ANIOS[codigo]}/{MAP_FECHAS[codigo]:02d}"
+
+
+def huellas_por_mes(ruta_csv) -> dict:
+    """
+    Calcula el md5 de las filas crudas de cada mes del archivo.
+
+    Agregar meses al final del archivo no cambia la huella de los anteriores.
+
+    Returns:
+        Diccionario código fech -> md5 (solo códigos de MAP_FECHAS)
+    """
+    encabezado = _encabezado(ruta_csv)
+    hashes = {}
+    for fila, codigo, linea in _recorrer_filas(ruta_csv):
+        if codigo not in MAP_FECHAS:
+            continue
+        if codigo not in hashes:
+            hashes[codigo] = hashlib.md5(encabezado)
+        # El número de fila entra en la huella porque es el índice del dataset limpio
+        hashes[codigo].update(b"%d:" % fila + linea.rstrip(b"\r\n") + b"\n")
+    return {codigo: h.hexdigest() for codigo, h in hashes.items()}
+
+
+def _leer_meses(ruta_csv, codigos, salida=None) -> pd.DataFrame:
+    """
+    Parsea solo las filas de los meses indicados, con el plan de columnas.
+
+    El índice es el número de fila en el archivo, igual que al leerlo completo.
+    """
+    codigos = set(codigos)
+    filas, lineas = [], [_encabezado(ruta_csv)]
+    for fila, codigo, linea in _recorrer_filas(ruta_csv):
+        if codigo in codigos:
+            filas.append(fila)
+            lineas.append(linea if linea.endswith(b"\n") else linea + b"\n")
+    df = pd.read_csv(io.BytesIO(b"".join(lineas)), encoding="latin-1", low_memory=False,
+                     **argumentos_lectura(salida))
+    df.index = pd.Index(filas, dtype="int64")
+    return df
+
+
+def _a_json(parciales: dict) -> dict:
+    return {'sumas': parciales['sumas'],
+            'flete': {",".join(k): list(v) for k, v in parciales['flete'].items()}}
+
+
+def _de_json(datos: dict) -> dict:
+    return {'sumas': datos['sumas'],
+            'flete': {tuple(k.split(",")) if k else (): tuple(v) for k, v in datos['flete'].items()}}
+
+
+def _agregados_afectan(previos: dict, nuevos: dict, columnas) -> bool:
+    """True si el cambio de agregados globales cambia particiones ya escritas."""
+    if set(previos['cols_sum0']) != set(nuevos['cols_sum0']):
+        return True
+    return 'flete' in columnas and previos['media_flete'] != nuevos['media_flete']
+
+
+def ingerir_incremental(rutas_csv, raiz=None, salida=None) -> dict:
+    """
+    Ingiere solo los meses nuevos o modificados de los CSV del DANE.
+
+    Args:
+        rutas_csv: Rutas de los CSV crudos (anuales o mensuales)
+        raiz: Directorio del almacén (por defecto data/almacen)
+        salida: Columnas del dataset limpio (por defecto las del modelo)
+
+    Returns:
+        Diccionario con las listas 'escritas', 'eliminadas' (llaves "año/mes")
+        y 'sin_cambios' (archivos omitidos)
+    """
+    raiz = Path(raiz or ALMACEN_DIR)
+    columnas = columnas_almacen(salida)
+    plan = PlanLimpieza(salida=columnas, anios=None)
+    manifiesto = cargar_manifiesto(raiz)
+    codigo = huella_codigo()
+    if (manifiesto.get('version') != VERSION_MANIFIESTO or manifiesto.get('codigo') != codigo
+            or manifiesto.get('columnas') != columnas):
+        if manifiesto:
+            print("Cambió el código de limpieza o las columnas; se vuelven a ingerir todos los meses.")
+        manifiesto = {'version': VERSION_MANIFIESTO, 'codigo': codigo, 'columnas': columnas,
+                      'archivos': {}, 'particiones': {}, 'agregados': {}}
+    particiones = manifiesto['particiones']
+    resumen = {'escritas': [], 'eliminadas': [], 'sin_cambios': []}
+
+    for ruta_csv in map(Path, rutas_csv):
+        origen = str(ruta_csv.resolve())
+        md5 = md5_archivo(ruta_csv)
+        if manifiesto['archivos'].get(origen) == md5:
+            resumen['sin_cambios'].append(origen)
+            continue
+
+        huellas = {_llave(c): (c, h) for c, h in huellas_por_mes(ruta_csv).items()}
+        previas = {k for k, p in particiones.items() if p['origen'] == origen}
+        eliminadas = sorted(previas - set(huellas))
+        for llave in eliminadas:
+            # Meses que el archivo ya no trae
+            anio, mes = map(int, llave.split("/"))
+            ruta_particion(raiz, anio, mes).unlink(missing_ok=True)
+            del particiones[llave]
+        resumen['eliminadas'].extend(eliminadas)
+        cambiadas = {llave: c for llave, (c, h) in huellas.items()
+                     if particiones.get(llave, {}).get('huella') != h}
+
+        datos = None
+        if cambiadas:
+            datos = plan.preparar(_leer_meses(ruta_csv, cambiadas.values(), columnas))
+            for llave, c in cambiadas.items():
+                particiones[llave] = {
+                    'origen': origen, 'codigo_fech': c, 'huella': huellas[llave][1],
+                    'agregados': _a_json(agregados_parciales(datos[datos['fech'] == c])),
+                }
+
+        for anio in sorted({llave.split("/")[0] for llave in [*cambiadas, *eliminadas]}):
+            meses_anio = {k: p for k, p in particiones.items() if k.startswith(f"{anio}/")}
+            if not meses_anio:
+                manifiesto['agregados'].pop(anio, None)
+                continue
+            agregados = combinar_agregados(_de_json(p['agregados']) for p in meses_anio.values())
+            previos = manifiesto['agregados'].get(anio)
+            limpiar = [k for k in cambiadas if k.startswith(f"{anio}/")]
+            if previos is not None and _agregados_afectan(previos, agregados, columnas):
+                limpiar = sorted(meses_anio)
+
+            # Las filas de este archivo ya están preparadas; otros orígenes se leen
+            por_origen = {}
+            for k in limpiar:
+                por_origen.setdefault(meses_anio[k]['origen'], []).append(meses_anio[k]['codigo_fech'])
+            for fuente, codigos in por_origen.items():
+                if fuente == origen and set(codigos) <= set(cambiadas.values()):
+                    filas = datos[datos['fech'].isin(codigos)]
+                else:
+                    filas = plan.preparar(_leer_meses(fuente, codigos, columnas))
+                limpio = plan.ejecutar(filas, preparado=True, **agregados)
+                escritas = {f"{a}/{m:02d}" for a, m in escribir_particiones(limpio, raiz)}
+                for c in codigos:
+                    if _llave(c) not in escritas:
+                        # El mes quedó sin filas después de limpiar
+                        ruta_particion(raiz, MAP_ANIOS[c], MAP_FECHAS[c]).unlink(missing_ok=True)
+                resumen['escritas'].extend(sorted(escritas))
+            manifiesto['agregados'][anio] = agregados
+
+        manifiesto['archivos'][origen] = md5
+        guardar_manifiesto(manifiesto, raiz)
+    return resumen
@@ -0,0 +1,130 @@
+"""
+Ingesta por bloques del CSV crudo con memoria acotada.
+
+El archivo se lee en bloques con el plan de columnas (usecols y dtype
+explícitos, ver columnas.py), cada bloque pasa por el mismo plan de
+limpieza (plan.py) y el resultado se agrega a un Parquet.
+Los únicos pasos globales (columnas con suma 0 e imputación de flete con la
+media) se resuelven con una primera pasada que solo acumula sumas y conteos.
+"""
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from .columnas import argumentos_lectura
+from .instrumentacion import etapa
+from .plan import PlanLimpieza, agregados_parciales, combinar_agregados
+
+TAM_BLOQUE = 200_000
+
+
+def leer_bloques(ruta_csv, tam_bloque: int = TAM_BLOQUE, salida=None):
+    """Itera sobre el CSV crudo en bloques leyendo solo las columnas del plan."""
+    return _medir_lectura(pd.read_csv(ruta_csv, encoding="latin-1", chunksize=tam_bloque,
+                                      **argumentos_lectura(salida)))
+
+
+def _medir_lectura(bloques):
+    """Registra la lectura de cada bloque como una etapa (ver instrumentacion.py)."""
+    iterador = iter(bloques)
+    while True:
+        with etapa("leer_bloque") as e:
+            bloque = next(iterador, None)
+            e.filas_salida = 0 if bloque is None else len(bloque)
+        if bloque is None:
+            return
+        yield bloque
+
+
+def calcular_agregados(ruta_csv, tam_bloque: int = TAM_BLOQUE, salida=None) -> dict:
+    """
+    Primera pasada: sumas por columna y media de flete sobre todo el archivo.
+
+    La media de flete se calcula sobre las filas que sobreviven al descarte
+    de faltantes en seguros y pbk, igual que en la limpieza completa.
+    """
+    plan = PlanLimpieza(salida=salida)
+    return combinar_agregados(
+        agregados_parciales(plan.preparar(bloque))
+        for bloque in leer_bloques(ruta_csv, tam_bloque, salida)
+    )
+
+
+def _normalizar_bloque(df: pd.DataFrame) -> pd.DataFrame:
+    """Fija los tipos de salida para que todos los bloques compartan esquema."""
+    df = df.copy()
+    if 'fech' in df.columns:
+        df['fech'] = df['fech'].astype('int64')
+    for c in df.columns:
+        if isinstance(df[c].dtype, pd.CategoricalDtype):
+            continue
+        if df[c].dtype == object or pd.api.types.is_string_dtype(df[c]):
+            df[c] = df[c].astype(str).astype('category')
+    return df
+
+
+def iterar_bloques_limpios(ruta_csv, tam_bloque: int = TAM_BLOQUE, agregados=None,
+                           salida=None):
+    """Genera los bloques ya limpios usando los agregados globales."""
+    if agregados is None:
+        agregados = calcular_agregados(ruta_csv, tam_bloque, salida)
+    plan = PlanLimpieza(salida=salida)
+    for bloque in leer_bloques(ruta_csv, tam_bloque, salida):
+        limpio = plan.ejecutar(bloque, **agregados)
+        if len(limpio):
+            yield _normalizar_bloque(limpio)
+
+
+def ingerir_por_bloques(ruta_csv, ruta_salida, tam_bloque: int = TAM_BLOQUE,
+                        salida=None) -> Path:
+    """
+    Limpia el CSV por bloques y los agrega a un archivo Parquet.
+
+    La memoria pico depende de tam_bloque y no del tamaño del archivo.
+
+    Args:
+        ruta_csv: Ruta del CSV crudo del DANE
+        ruta_salida: Archivo Parquet de salida
+        tam_bloque: Filas por bloque
+        salida: Columnas del dataset limpio (por defecto las del modelo)
+
+    Returns:
+        Ruta del archivo Parquet escrito
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    ruta_salida = Path(ruta_salida)
+    ruta_salida.parent.mkdir(parents=True, exist_ok=True)
+    tmp = ruta_salida.with_suffix(".tmp")
+    escritor = None
+    try:
+        for limpio in iterar_bloques_limpios(ruta_csv, tam_bloque, salida=salida):
+            if escritor is None:
+                esquema = _esquema_salida(pa.Table.from_pandas(limpio, preserve_index=True).schema)
+                escritor = pq.ParquetWriter(tmp, esquema)
+            with etapa("escribir_bloque", len(limpio)):
+                escritor.write_table(pa.Table.from_pandas(limpio, schema=esquema, preserve_index=True))
+    except BaseException:
+        if escritor is not None:
+            escritor.close()
+        tmp.unlink(missing_ok=True)
+        raise
+    if escritor is None:
+        raise ValueError(f"No quedaron filas después de limpiar {ruta_csv}")
+    escritor.close()
+    os.replace(tmp, ruta_salida)
+    return ruta_salida
+
+
+def _esquema_salida(esquema):
+    """Usa índices int32 en las columnas diccionario para admitir cualquier bloque."""
+    import pyarrow as pa
+
+    campos = [
+        pa.field(f.name, pa.dictionary(pa.int32(), f.type.value_type))
+        if pa.types.is_dictionary(f.type) else f
+        for f in esquema
+    ]
+    return pa.schema(campos, metadata=esquema.metadata)
@@ -0,0 +1,187 @@
+"""
+Medición por etapa del pipeline de limpieza.
+
+Con la variable de entorno IMPORTACIONES_PERFIL (o llamando a activar()) cada
+etapa registra duración, filas de entrada y salida, bytes asignados (pico de
+tracemalloc dentro de la etapa) y la variación de RSS del proceso. El
+resultado se guarda como JSON y se muestra como tabla resumen.
+
+Desactivada, etapa() no hace nada y no agrega costo medible. Activada,
+tracemalloc hace más lentas las etapas que asignan mucho (sobre todo
+read_csv): los tiempos sirven para comparar etapas y versiones entre sí, no
+como tiempos absolutos. Las etapas no se anidan: el pico de tracemalloc se
+reinicia al comenzar cada una.
+"""
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+RUTA_REPORTE = Path(__file__).resolve().parent.parent / "data" / "cache" / "perfil_limpieza.json"
+
+
+def _rss_actual():
+    """RSS del proceso en bytes (None si /proc no está disponible)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class Etapa:
+    """Registro de una etapa medida."""
+
+    def __init__(self, nombre: str, filas_entrada=None):
+        self.nombre = nombre
+        self.filas_entrada = filas_entrada
+        self.filas_salida = None
+        self.segundos = None
+        self.bytes_asignados = None
+        self.rss_delta = None
+
+    def __bool__(self):
+        return True
+
+    def a_dict(self) -> dict:
+        return {
+            'nombre': self.nombre, 'segundos': self.segundos,
+            'filas_entrada': self.filas_entrada, 'filas_salida': self.filas_salida,
+            'bytes_asignados': self.bytes_asignados, 'rss_delta': self.rss_delta,
+        }
+
+
+class _EtapaNula:
+    """Etapa sin efecto cuando la medición está desactivada."""
+
+    filas_salida = None
+
+    def __bool__(self):
+        return False
+
+    def __setattr__(self, nombre, valor):
+        pass
+
+
+_NULA = _EtapaNula()
+
+
+class Perfilador:
+    """Acumula las etapas medidas durante una carga."""
+
+    def __init__(self, activo: bool = False, ruta=None):
+        self.activo = False
+        self.ruta = None
+        self.etapas = []
+        if activo:
+            self.activar(ruta)
+
+    def activar(self, ruta=None) -> None:
+        """Activa la medición; el reporte se escribirá en ruta (por defecto RUTA_REPORTE)."""
+        self.activo = True
+        self.ruta = Path(ruta) if ruta else RUTA_REPORTE
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def desactivar(self) -> None:
+        self.activo = False
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def reiniciar(self) -> None:
+        self.etapas = []
+
+    @contextmanager
+    def etapa(self, nombre: str, filas_entrada=None):
+        """
+        Mide el bloque como una etapa.
+
+        El objeto entregado permite fijar filas_salida; si la medición está
+        desactivada es falso y los atributos se ignoran.
+        """
+        if not self.activo:
+            yield _NULA
+            return
+        registro = Etapa(nombre, filas_entrada)
+        rss_inicial = _rss_actual()
+        tracemalloc.reset_peak()
+        memoria_inicial, _ = tracemalloc.get_traced_memory()
+        inicio = time.perf_counter()
+        try:
+            yield registro
+        finally:
+            registro.segundos = time.perf_counter() - inicio
+            _, pico = tracemalloc.get_traced_memory()
+            registro.bytes_asignados = max(pico - memoria_inicial, 0)
+            rss_final = _rss_actual()
+            if rss_inicial is not None and rss_final is not None:
+                registro.rss_delta = rss_final - rss_inicial
+            self.etapas.append(registro)
+
+    def resumen(self) -> list:
+        """Etapas agrupadas por nombre (las de cada bloque se suman), en orden de aparición."""
+        grupos = {}
+        for e in self.etapas:
+            g = grupos.setdefault(e.nombre, {
+                'nombre': e.nombre, 'veces': 0, 'segundos': 0.0, 'filas_entrada': None,
+                'filas_salida': None, 'bytes_asignados': None, 'rss_delta': None,
+            })
+            g['veces'] += 1
+            g['segundos'] += e.segundos
+            for campo in ('filas_entrada', 'filas_salida', 'rss_delta'):
+                valor = getattr(e, campo)
+                if valor is not None:
+                    g[campo] = (g[campo] or 0) + valor
+            if e.bytes_asignados is not None:
+                g['bytes_asignados'] = max(g['bytes_asignados'] or 0, e.bytes_asignados)
+        return list(grupos.values())
+
+    def reporte(self) -> dict:
+        """Reporte legible por máquina de las etapas registradas."""
+        return {
+            'etapas': [e.a_dict() for e in self.etapas],
+            'resumen': self.resumen(),
+            'total_segundos': sum(e.segundos for e in self.etapas),
+            'pico_bytes_asignados': max((e.bytes_asignados for e in self.etapas), default=0),
+            'rss_final': _rss_actual(),
+        }
+
+    def guardar_reporte(self, ruta=None) -> Path:
+        """Escribe el reporte en JSON y retorna la ruta."""
+        ruta = Path(ruta or self.ruta or RUTA_REPORTE)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        ruta.write_text(json.dumps(self.reporte(), indent=2, ensure_ascii=False), encoding="utf-8")
+        return ruta
+
+    def tabla_resumen(self) -> str:
+        """Tabla de texto con una fila por etapa (pico de bytes por ejecución)."""
+        def cifra(valor, escala=1, formato="{:,.0f}"):
+            return "-" if valor is None else formato.format(valor / escala)
+
+        resumen = self.resumen()
+        total = sum(g['segundos'] for g in resumen) or 1.0
+        lineas = [f"{'Etapa':<32}{'N':>5}{'Seg':>9}{'%':>6}{'Filas ent.':>13}{'Filas sal.':>13}"
+                  f"{'MB asig.':>10}{'RSS Δ MB':>10}"]
+        for g in resumen:
+            lineas.append(
+                f"{g['nombre'][:31]:<32}{g['veces']:>5}{g['segundos']:>9.3f}"
+                f"{100 * g['segundos'] / total:>6.1f}"
+                f"{cifra(g['filas_entrada']):>13}{cifra(g['filas_salida']):>13}"
+                f"{cifra(g['bytes_asignados'], 1e6, '{:,.1f}'):>10}"
+                f"{cifra(g['rss_delta'], 1e6, '{:,.1f}'):>10}"
+            )
+        lineas.append(f"{'Total':<32}{'':>5}{total:>9.3f}")
+        return "\n".join(lineas)
+
+
+# IMPORTACIONES_PERFIL: "1" usa RUTA_REPORTE; cualquier otro valor es la ruta del JSON
+_valor = os.getenv("IMPORTACIONES_PERFIL", "")
+PERFIL = Perfilador(activo=bool(_valor) and _valor != "0",
+                    ruta=None if _valor in ("", "0", "1") else _valor)
+
+
+def etapa(nombre: str, filas_entrada=None):
+    """Atajo a PERFIL.etapa()."""
+    return PERFIL.etapa(nombre, filas_entrada)
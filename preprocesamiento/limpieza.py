@@ -0,0 +1,142 @@
+"""
+Limpieza y transformación del CSV de importaciones del DANE.
+Cadena compartida por train_model.py y el tablero (notebooks/app.py).
+"""
+import numpy as np
+import pandas as pd
+from sklearn.impute import SimpleImputer
+
+from .columnas import COLUMNAS_NUMERICAS, COLUMNAS_MODELO, argumentos_lectura
+from .instrumentacion import etapa
+from .mapeos import ANIO_ARCHIVO, mapa_fechas
+from .numericos import decodificar_columnas_numericas
+from .tablas import (
+    TABLA_CONTINENTE, TABLA_CONTINENTE_CONSERVAR, TABLA_ADUANA_AGRUPADA,
+    TABLA_TIPO_IMP, TABLA_TRANSPORTE, TABLA_REGIMEN, TABLA_CLASE,
+)
+
+# Columnas eliminadas según análisis previo
+COLUMNAS_DESCARTADAS = ['acuerdo','pnk','vafodo','vacip','cuidaimp','depim','deptodes','cuidaexp','bandera','codadad','luin','codluin','paiscom','vadua']
+COLUMNAS_DESCARTADAS_FINALES = ['naban','coda','actecon','imp1']
+
+# Códigos de país que no corresponden a importaciones del exterior
+PAISES_EXCLUIDOS = [226, 216, 217, 654]
+
+
+def leer_csv_crudo(ruta_csv, salida=None) -> pd.DataFrame:
+    """
+    Lee del CSV crudo solo las columnas que necesita la salida pedida.
+
+    Las columnas numéricas quedan como texto y los textos como categóricos
+    (ver columnas.py).
+    """
+    with etapa("leer_csv") as e:
+        df = pd.read_csv(ruta_csv, encoding="latin-1", low_memory=False,
+                         **argumentos_lectura(salida))
+        e.filas_salida = len(df)
+    return df
+
+
+def limpiar_importaciones(dfimp24: pd.DataFrame, cols_sum0=None, media_flete=None,
+                          salida=None, anios=(ANIO_ARCHIVO,)) -> pd.DataFrame:
+    """
+    Aplica la limpieza completa y devuelve solo las columnas pedidas.
+
+    Args:
+        dfimp24: DataFrame crudo (archivo completo o un bloque)
+        cols_sum0: Columnas con suma 0 calculadas sobre todo el archivo;
+            si es None se calculan sobre dfimp24
+        media_flete: Media global de flete para imputar; si es None se
+            calcula sobre dfimp24
+        salida: Columnas del dataset limpio (por defecto las del modelo)
+        anios: Años cuyos códigos fech se conservan (None = todos los de ANIOS)
+
+    Returns:
+        DataFrame con las columnas pedidas
+    """
+    # Limpieza y transformación de datos numéricos (una pasada por columna)
+    dfimp24 = decodificar_columnas_numericas(dfimp24, COLUMNAS_NUMERICAS)
+
+    # Eliminar columnas con suma 0
+    if cols_sum0 is None:
+        df_numeric = dfimp24.select_dtypes(include=[np.number])
+        cols_sum0 = [col for col in df_numeric if df_numeric[col].sum() == 0]
+    if cols_sum0:
+        dfimp24.drop(columns=cols_sum0, inplace=True, errors="ignore")
+
+    # Eliminación de columnas según análisis previo
+    for c in COLUMNAS_DESCARTADAS:
+        if c in dfimp24.columns:
+            dfimp24.drop(columns=c, inplace=True, errors="ignore")
+
+    # Tratamiento de faltantes
+    if 'seguros' in dfimp24.columns:
+        dfimp24 = dfimp24.dropna(subset=['seguros'])
+    if 'otrosg' in dfimp24.columns:
+        dfimp24['otrosg'] = dfimp24['otrosg'].fillna(0.00)
+    if 'pbk' in dfimp24.columns:
+        dfimp24 = dfimp24.dropna(subset=['pbk'])
+    if 'flete' in dfimp24.columns:
+        if media_flete is None:
+            imputer = SimpleImputer(strategy='mean')
+            dfimp24[['flete']] = imputer.fit_transform(dfimp24[['flete']])
+        else:
+            dfimp24['flete'] = dfimp24['flete'].fillna(media_flete)
+
+    # Aplicar mapeos
+    if 'fech' in dfimp24.columns:
+        dfimp24['fech'] = dfimp24['fech'].map(mapa_fechas(anios))
+
+    if 'copaex' in dfimp24.columns:
+        dfimp24 = dfimp24.drop(dfimp24[dfimp24['copaex'] == 216].index)
+        dfimp24['copaex'] = TABLA_CONTINENTE.aplicar(dfimp24['copaex'])
+    if 'paisgen' in dfimp24.columns:
+        # Los códigos excluidos no tienen continente, así que se filtran antes de mapear
+        dfimp24 = dfimp24.drop(dfimp24[dfimp24['paisgen'].isin(PAISES_EXCLUIDOS)].index)
+        dfimp24['paisgen'] = TABLA_CONTINENTE_CONSERVAR.aplicar(dfimp24['paisgen'])
+    if 'paispro' in dfimp24.columns:
+        dfimp24 = dfimp24.drop(dfimp24[dfimp24['paispro'].isin(PAISES_EXCLUIDOS)].index)
+        dfimp24['paispro'] = TABLA_CONTINENTE_CONSERVAR.aplicar(dfimp24['paispro'])
+
+    if 'regimen' in dfimp24.columns:
+        dfimp24['regimen'] = TABLA_REGIMEN.aplicar(dfimp24['regimen'])
+
+    if 'clase' in dfimp24.columns:
+        dfimp24['clase'] = TABLA_CLASE.aplicar(dfimp24['clase'])
+    if 'viatrans' in dfimp24.columns:
+        dfimp24['viatrans'] = TABLA_TRANSPORTE.aplicar(dfimp24['viatrans'])
+
+    if 'adua' in dfimp24.columns:
+        dfimp24 = dfimp24.drop(dfimp24[dfimp24['adua'] == 24].index)
+        dfimp24['adua'] = TABLA_ADUANA_AGRUPADA.aplicar(dfimp24['adua'])
+
+    if 'tipoim' in dfimp24.columns:
+        dfimp24['tipoim'] = TABLA_TIPO_IMP.aplicar(dfimp24['tipoim'])
+
+    # Crear variable trimestre
+    if 'fech' in dfimp24.columns:
+        dfimp24['trimestre'] = np.select(
+            [
+                dfimp24['fech'].between(1, 3),
+                dfimp24['fech'].between(4, 6),
+                dfimp24['fech'].between(7, 9),
+                dfimp24['fech'].between(10, 12)
+            ],
+            [1, 2, 3, 4]
+        )
+
+    # Eliminar columnas adicionales
+    for c in COLUMNAS_DESCARTADAS_FINALES:
+        if c in dfimp24.columns:
+            dfimp24.drop(columns=c, inplace=True, errors="ignore")
+
+    # Variables auxiliares del mes
+    if 'fech' in dfimp24.columns:
+        dfimp24['sin_fech'] = np.sin(2 * np.pi * dfimp24['fech'] / 12)
+        dfimp24['cos_fech'] = np.cos(2 * np.pi * dfimp24['fech'] / 12)
+
+    # Seleccionar solo las columnas necesarias
+    keep = [c for c in salida or COLUMNAS_MODELO if c in dfimp24.columns]
+    df = dfimp24[keep].dropna()
+
+    return df
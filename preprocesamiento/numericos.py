@@ -0,0 +1,48 @@
+"""
+Decodificación vectorizada de números en formato colombiano.
+
+Los valores del DANE vienen como texto con punto de miles y coma decimal
+("21.000,50"), y con "" o "-" para los faltantes. Cada columna se convierte
+a float64 en una sola pasada de operaciones de texto (en C cuando pandas
+dispone de pyarrow), sin materializar la columna como str varias veces.
+"""
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    TIPO_TEXTO = "string[pyarrow]"
+except ImportError:
+    TIPO_TEXTO = "string"
+
+# Textos que se interpretan como faltantes después de quitar los puntos
+VALORES_FALTANTES = ["", "-"]
+
+
+def decodificar_numero_colombiano(serie: pd.Series) -> pd.Series:
+    """
+    Convierte una columna con números en formato colombiano a float64.
+
+    Reproduce la limpieza original: se eliminan todos los puntos, se quitan
+    espacios, "" y "-" pasan a NaN y la coma se toma como separador decimal.
+    """
+    if pd.api.types.is_integer_dtype(serie) or pd.api.types.is_bool_dtype(serie):
+        return serie.astype("float64")
+    if not (pd.api.types.is_string_dtype(serie) or serie.dtype == object):
+        # Columnas ya numéricas: se pasan por texto igual que la limpieza original
+        serie = serie.astype(str)
+
+    texto = serie.astype(TIPO_TEXTO)
+    texto = texto.str.replace(".", "", regex=False).str.strip()
+    faltante = texto.isna() | texto.isin(VALORES_FALTANTES)
+    texto = texto.str.replace(",", ".", regex=False).mask(faltante)
+    valores = texto.astype("float64")
+    return pd.Series(np.asarray(valores, dtype="float64"), index=serie.index, name=serie.name)
+
+
+def decodificar_columnas_numericas(df: pd.DataFrame, columnas) -> pd.DataFrame:
+    """Decodifica en el mismo DataFrame las columnas numéricas presentes."""
+    for c in columnas:
+        if c in df.columns:
+            df[c] = decodificar_numero_colombiano(df[c])
+    return df
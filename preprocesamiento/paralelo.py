@@ -0,0 +1,157 @@
+"""
+Carga en paralelo del CSV crudo por rangos de bytes.
+
+El archivo se divide en rangos de bytes alineados a saltos de línea y cada
+rango se parsea y se limpia con el plan de limpieza (plan.py) en un proceso
+de un ProcessPoolExecutor. Los pasos globales se resuelven con agregados
+parciales que se combinan en el proceso principal:
+
+- La imputación de flete se deja pendiente en los rangos (media NaN) y se
+  completa con la media global al unir los resultados.
+- Si alguna columna de entrada suma 0 sobre todo el archivo, lo que cambia
+  el plan, se hace una segunda pasada con los agregados globales.
+
+El resultado es idéntico al de la limpieza en serie (mismo índice, filas,
+tipos y categorías). La media de flete puede diferir en el último bit porque
+se suma por rangos.
+
+Supone, como el resto de la ingesta, que no hay saltos de línea dentro de
+campos entre comillas.
+"""
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .columnas import argumentos_lectura
+from .mapeos import ANIO_ARCHIVO
+from .plan import PlanLimpieza, agregados_parciales, combinar_agregados
+
+# Rangos por proceso: más de uno reparte mejor la carga entre procesos
+RANGOS_POR_PROCESO = 4
+
+
+def rangos_de_bytes(ruta_csv, n_rangos: int) -> list:
+    """
+    Divide el cuerpo del CSV en rangos [inicio, fin) que terminan en salto de línea.
+
+    Args:
+        ruta_csv: Ruta del CSV crudo
+        n_rangos: Número de rangos deseado (puede resultar menor en archivos pequeños)
+
+    Returns:
+        Lista de tuplas (inicio, fin) en bytes, sin el encabezado
+    """
+    tamano = os.path.getsize(ruta_csv)
+    with open(ruta_csv, "rb") as f:
+        f.readline()
+        inicio_datos = f.tell()
+        cortes = [inicio_datos]
+        for i in range(1, n_rangos):
+            objetivo = inicio_datos + (tamano - inicio_datos) * i // n_rangos
+            if objetivo <= cortes[-1]:
+                continue
+            # Se avanza hasta el final de la línea que contiene objetivo - 1
+            f.seek(objetivo - 1)
+            f.readline()
+            if f.tell() < tamano and f.tell() > cortes[-1]:
+                cortes.append(f.tell())
+    cortes.append(tamano)
+    return [(a, b) for a, b in zip(cortes[:-1], cortes[1:]) if b > a]
+
+
+def _leer_rango(ruta_csv, inicio: int, fin: int, nombres: list, salida=None) -> pd.DataFrame:
+    """Parsea un rango de bytes con el plan de columnas (usecols y dtype)."""
+    with open(ruta_csv, "rb") as f:
+        f.seek(inicio)
+        contenido = f.read(fin - inicio)
+    return pd.read_csv(io.BytesIO(contenido), header=None, names=nombres,
+                       encoding="latin-1", low_memory=False, **argumentos_lectura(salida))
+
+
+def _limpiar_rango(ruta_csv, inicio: int, fin: int, nombres: list, salida=None,
+                   agregados=None, anios=(ANIO_ARCHIVO,)) -> tuple:
+    """
+    Trabajo de cada proceso: parsea y limpia un rango.
+
+    Sin agregados globales no se descarta ninguna columna por suma 0 y flete
+    queda sin imputar, para completarlo después con la media global.
+
+    Returns:
+        Tupla (filas crudas del rango, agregados parciales, DataFrame limpio)
+    """
+    crudo = _leer_rango(ruta_csv, inicio, fin, nombres, salida)
+    plan = PlanLimpieza(salida=salida, anios=anios)
+    datos = plan.preparar(crudo)
+    parciales = agregados_parciales(datos)
+    if agregados is None:
+        agregados = {'cols_sum0': [], 'media_flete': np.nan}
+    limpio = plan.ejecutar(datos, preparado=True, **agregados)
+    return len(crudo), parciales, limpio
+
+
+def concatenar_partes(partes: list) -> pd.DataFrame:
+    """Une partes limpias (rangos, bloques o particiones) unificando sus categorías."""
+    for c in partes[0].columns:
+        if isinstance(partes[0][c].dtype, pd.CategoricalDtype):
+            # Las categorías fijas van primero; los códigos conservados se
+            # agregan ordenados, igual que en la limpieza en serie
+            fijas = list(partes[0][c].cat.categories)
+            extra = set()
+            for p in partes:
+                extra.update(set(p[c].cat.categories) - set(fijas))
+            categorias = fijas + sorted(extra)
+            for p in partes:
+                p[c] = p[c].cat.set_categories(categorias)
+    return pd.concat(partes)
+
+
+def cargar_en_paralelo(ruta_csv, procesos: int = None, salida=None,
+                       n_rangos: int = None, anios=(ANIO_ARCHIVO,)) -> pd.DataFrame:
+    """
+    Parsea y limpia el CSV crudo en paralelo por rangos de bytes.
+
+    Args:
+        ruta_csv: Ruta del CSV crudo del DANE
+        procesos: Número de procesos (por defecto os.cpu_count())
+        salida: Columnas del dataset limpio (por defecto las del modelo)
+        n_rangos: Número de rangos (por defecto RANGOS_POR_PROCESO por proceso)
+        anios: Años cuyos códigos fech se conservan (None = todos)
+
+    Returns:
+        DataFrame limpio, idéntico al de la limpieza en serie
+    """
+    procesos = procesos or os.cpu_count() or 1
+    nombres = list(pd.read_csv(ruta_csv, encoding="latin-1", nrows=0).columns)
+    rangos = rangos_de_bytes(ruta_csv, n_rangos or procesos * RANGOS_POR_PROCESO)
+
+    def ejecutar_rangos(agregados=None):
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            futuros = [
+                ejecutor.submit(_limpiar_rango, ruta_csv, inicio, fin, nombres, salida, agregados,
+                                anios)
+                for inicio, fin in rangos
+            ]
+            return [f.result() for f in futuros]
+
+    resultados = ejecutar_rangos()
+    agregados = combinar_agregados(p for _, p, _ in resultados)
+    if agregados['cols_sum0']:
+        resultados = ejecutar_rangos(agregados)
+
+    # El índice de cada rango se desplaza por las filas crudas anteriores
+    partes, desplazamiento = [], 0
+    for n_filas, _, limpio in resultados:
+        limpio.index = limpio.index + desplazamiento
+        partes.append(limpio)
+        desplazamiento += n_filas
+    df = concatenar_partes(partes)
+
+    if 'flete' in df.columns and not agregados['cols_sum0']:
+        if agregados['media_flete'] is None:
+            df = df[df['flete'].notna()]
+        else:
+            df['flete'] = df['flete'].fillna(agregados['media_flete'])
+    return df
@@ -0,0 +1,272 @@
+"""
+Plan de limpieza perezoso con un solo filtro combinado.
+
+La cadena de limpieza.py elimina filas con dfimp24.drop(...) y dropna varias
+veces, y cada paso copia el DataFrame completo. Aquí la limpieza se declara
+como filtros (predicados sobre columnas crudas) y expresiones (columnas de
+salida con su regla de validez). Al ejecutar, el plan se optimiza según las
+columnas disponibles y las pedidas, todos los predicados y la validez de las
+columnas de salida se combinan en una sola máscara booleana, y las filas se
+materializan una única vez sobre las columnas que realmente se usan.
+
+El resultado es el mismo que el de limpieza.limpiar_importaciones.
+"""
+import itertools
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from .columnas import COLUMNAS_NUMERICAS, COLUMNAS_MODELO
+from .instrumentacion import etapa
+from .limpieza import COLUMNAS_DESCARTADAS, COLUMNAS_DESCARTADAS_FINALES, PAISES_EXCLUIDOS
+from .mapeos import ANIO_ARCHIVO, MAP_ANIOS, mapa_fechas
+from .numericos import decodificar_columnas_numericas
+from .tablas import (
+    TABLA_CONTINENTE, TABLA_CONTINENTE_CONSERVAR, TABLA_ADUANA_AGRUPADA,
+    TABLA_TIPO_IMP, TABLA_TRANSPORTE, TABLA_REGIMEN, TABLA_CLASE,
+)
+
+
+class Filtro(NamedTuple):
+    """Predicado sobre columnas crudas; True conserva la fila."""
+    nombre: str
+    columnas: list
+    conservar: Callable
+
+
+class Expresion(NamedTuple):
+    """Columna de salida calculada sobre las filas ya filtradas."""
+    columnas: list
+    valor: Callable
+    # Máscara de filas con valor no nulo, evaluada antes de filtrar
+    # (equivale al dropna final); None si la columna nunca es nula
+    valida: Optional[Callable] = None
+
+
+def _igual(serie: pd.Series, valor) -> np.ndarray:
+    """Comparación vectorizada que trata los faltantes como False."""
+    return serie.eq(valor).to_numpy(dtype=bool, na_value=False)
+
+
+def _no_nulo(columna: str) -> Callable:
+    return lambda df, ctx: df[columna].notna().to_numpy()
+
+
+def _mes(df: pd.DataFrame, ctx) -> pd.Series:
+    return df['fech'].map(ctx['fechas'])
+
+
+def _mes_valido(df, ctx) -> np.ndarray:
+    return df['fech'].isin(list(ctx['fechas'])).to_numpy()
+
+
+def _trimestre(df, ctx) -> np.ndarray:
+    mes = _mes(df, ctx)
+    return np.select(
+        [mes.between(1, 3), mes.between(4, 6), mes.between(7, 9), mes.between(10, 12)],
+        [1, 2, 3, 4]
+    )
+
+
+def _tabla(columna: str, tabla) -> Expresion:
+    """Expresión para una columna mapeada con una TablaCodigos."""
+    if tabla.defecto is not None:
+        valida = None
+    elif tabla.conservar_desconocidos:
+        valida = _no_nulo(columna)
+    else:
+        valida = lambda df, ctx: tabla.aplicar(df[columna]).notna().to_numpy()
+    return Expresion([columna], lambda df, ctx: tabla.aplicar(df[columna]), valida)
+
+
+def _flete(df, ctx) -> pd.Series:
+    return df['flete'].fillna(ctx['media_flete']) if ctx['media_flete'] is not None else df['flete']
+
+
+FILTROS = [
+    Filtro('seguros_no_nulo', ['seguros'], lambda df: df['seguros'].notna().to_numpy()),
+    Filtro('pbk_no_nulo', ['pbk'], lambda df: df['pbk'].notna().to_numpy()),
+    Filtro('copaex_distinto_216', ['copaex'], lambda df: ~_igual(df['copaex'], 216)),
+    Filtro('paisgen_no_excluido', ['paisgen'], lambda df: ~df['paisgen'].isin(PAISES_EXCLUIDOS).to_numpy()),
+    Filtro('paispro_no_excluido', ['paispro'], lambda df: ~df['paispro'].isin(PAISES_EXCLUIDOS).to_numpy()),
+    Filtro('adua_distinto_24', ['adua'], lambda df: ~_igual(df['adua'], 24)),
+]
+
+# Columnas cuyos faltantes se descartan antes de imputar flete en la cadena original
+COLUMNAS_IMPUTACION = ['seguros', 'pbk']
+
+EXPRESIONES = {
+    'fech': Expresion(['fech'], _mes, _mes_valido),
+    'anio': Expresion(['fech'], lambda df, ctx: df['fech'].map(MAP_ANIOS), _mes_valido),
+    'trimestre': Expresion(['fech'], _trimestre),
+    'sin_fech': Expresion(['fech'], lambda df, ctx: np.sin(2 * np.pi * _mes(df, ctx) / 12), _mes_valido),
+    'cos_fech': Expresion(['fech'], lambda df, ctx: np.cos(2 * np.pi * _mes(df, ctx) / 12), _mes_valido),
+    'copaex': _tabla('copaex', TABLA_CONTINENTE),
+    'paisgen': _tabla('paisgen', TABLA_CONTINENTE_CONSERVAR),
+    'paispro': _tabla('paispro', TABLA_CONTINENTE_CONSERVAR),
+    'regimen': _tabla('regimen', TABLA_REGIMEN),
+    'clase': _tabla('clase', TABLA_CLASE),
+    'viatrans': _tabla('viatrans', TABLA_TRANSPORTE),
+    'adua': _tabla('adua', TABLA_ADUANA_AGRUPADA),
+    'tipoim': _tabla('tipoim', TABLA_TIPO_IMP),
+    'otrosg': Expresion(['otrosg'], lambda df, ctx: df['otrosg'].fillna(0.00)),
+    'flete': Expresion(['flete'], _flete,
+                       lambda df, ctx: None if ctx['media_flete'] is not None else df['flete'].notna().to_numpy()),
+}
+
+
+def _expresion(columna: str) -> Expresion:
+    """Expresión de una columna; las no declaradas pasan sin cambios."""
+    return EXPRESIONES.get(columna) or Expresion([columna], lambda df, ctx: df[columna], _no_nulo(columna))
+
+
+class PlanLimpieza:
+    """
+    Plan de limpieza que se optimiza y ejecuta con una sola materialización.
+
+    anios son los años cuyos códigos fech se conservan: por defecto solo el
+    del archivo único (ANIO_ARCHIVO); el almacén pasa None (todos).
+    """
+
+    def __init__(self, filtros=None, salida=None, anios=(ANIO_ARCHIVO,)):
+        self.filtros = list(FILTROS if filtros is None else filtros)
+        self.salida = list(salida or COLUMNAS_MODELO)
+        self.anios = anios
+
+    def optimizar(self, disponibles) -> tuple:
+        """
+        Poda el plan según las columnas crudas disponibles.
+
+        Returns:
+            Tupla (filtros activos, expresiones de salida, columnas de entrada)
+        """
+        disponibles = set(disponibles)
+        filtros = [f for f in self.filtros if set(f.columnas) <= disponibles]
+        expresiones = {}
+        for c in self.salida:
+            expresion = _expresion(c)
+            if set(expresion.columnas) <= disponibles:
+                expresiones[c] = expresion
+        entrada = [f.columnas for f in filtros] + [e.columnas for e in expresiones.values()]
+        entrada = list(dict.fromkeys(c for columnas in entrada for c in columnas))
+        return filtros, expresiones, entrada
+
+    def preparar(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Proyecta df a las columnas de entrada del plan y decodifica los números."""
+        descartadas = set(COLUMNAS_DESCARTADAS) | set(COLUMNAS_DESCARTADAS_FINALES)
+        _, _, entrada = self.optimizar(set(df.columns) - descartadas)
+        return decodificar_columnas_numericas(df[entrada], COLUMNAS_NUMERICAS)
+
+    def ejecutar(self, df: pd.DataFrame, cols_sum0=None, media_flete=None,
+                 preparado: bool = False) -> pd.DataFrame:
+        """
+        Aplica el plan a un DataFrame crudo (archivo completo o un bloque).
+
+        Args:
+            df: DataFrame crudo; no se modifica
+            cols_sum0: Columnas con suma 0 sobre todo el archivo; si es None
+                se calculan sobre df
+            media_flete: Media global de flete; si es None se calcula sobre df
+            preparado: Si es True, df ya pasó por preparar()
+
+        Returns:
+            DataFrame limpio con las columnas de salida disponibles
+        """
+        if preparado:
+            datos = df
+        else:
+            with etapa("decodificar_numericos", len(df)):
+                datos = self.preparar(df)
+
+        # Columnas con suma 0: se tratan como no disponibles
+        with etapa("columnas_suma_cero"):
+            if cols_sum0 is None:
+                numericas = datos.select_dtypes(include=[np.number])
+                cols_sum0 = [c for c in numericas if numericas[c].sum() == 0]
+            disponibles = set(datos.columns) - set(cols_sum0)
+            filtros, expresiones, entrada = self.optimizar(disponibles)
+
+        if media_flete is None and 'flete' in expresiones:
+            with etapa("media_flete"):
+                media_flete = datos['flete'][_mascara_imputacion(datos, disponibles)].mean()
+                media_flete = None if pd.isna(media_flete) else float(media_flete)
+        ctx = {'media_flete': media_flete, 'fechas': mapa_fechas(self.anios)}
+
+        # Máscara combinada de todos los predicados
+        mascara = np.ones(len(datos), dtype=bool)
+        for f in filtros:
+            with etapa(f"filtro:{f.nombre}") as e:
+                if e:
+                    e.filas_entrada = int(mascara.sum())
+                mascara &= f.conservar(datos)
+                if e:
+                    e.filas_salida = int(mascara.sum())
+
+        # Equivalente al dropna final sobre las columnas de salida
+        for c, expresion in expresiones.items():
+            if expresion.valida is not None:
+                with etapa(f"no_nulos:{c}") as e:
+                    if e:
+                        e.filas_entrada = int(mascara.sum())
+                    valida = expresion.valida(datos, ctx)
+                    if valida is not None:
+                        mascara &= valida
+                    if e:
+                        e.filas_salida = int(mascara.sum())
+
+        with etapa("materializar_filas", len(datos)) as e:
+            filas = datos[entrada].iloc[np.flatnonzero(mascara)]
+            e.filas_salida = len(filas)
+        salida = {}
+        for c, expresion in expresiones.items():
+            with etapa(f"columna:{c}", len(filas)):
+                salida[c] = expresion.valor(filas, ctx)
+        return pd.DataFrame(salida, index=filas.index)
+
+
+def _mascara_imputacion(datos: pd.DataFrame, disponibles) -> np.ndarray:
+    """Filas que la cadena original conserva al momento de imputar flete."""
+    mascara = np.ones(len(datos), dtype=bool)
+    for c in COLUMNAS_IMPUTACION:
+        if c in disponibles:
+            mascara &= datos[c].notna().to_numpy()
+    return mascara
+
+
+def agregados_parciales(datos: pd.DataFrame) -> dict:
+    """
+    Sumas y conteos de un DataFrame preparado que se pueden combinar entre bloques.
+
+    La suma de flete se guarda para cada subconjunto de COLUMNAS_IMPUTACION,
+    porque cuáles de esas columnas filtran depende de las sumas globales.
+    """
+    numericas = datos.select_dtypes(include=[np.number])
+    parciales = {'sumas': {c: float(numericas[c].sum()) for c in numericas}, 'flete': {}}
+    if 'flete' in datos.columns:
+        presentes = [c for c in COLUMNAS_IMPUTACION if c in datos.columns]
+        for usadas in itertools.product([False, True], repeat=len(presentes)):
+            llave = tuple(c for c, usar in zip(presentes, usadas) if usar)
+            flete = datos['flete'][_mascara_imputacion(datos, llave)]
+            parciales['flete'][llave] = (float(flete.sum()), int(flete.count()))
+    return parciales
+
+
+def combinar_agregados(parciales) -> dict:
+    """
+    Combina agregados parciales en los argumentos globales de ejecutar().
+
+    Returns:
+        Diccionario con cols_sum0 y media_flete
+    """
+    sumas, flete = {}, {}
+    for p in parciales:
+        for c, v in p['sumas'].items():
+            sumas[c] = sumas.get(c, 0.0) + v
+        for llave, (suma, n) in p['flete'].items():
+            total = flete.get(llave, (0.0, 0))
+            flete[llave] = (total[0] + suma, total[1] + n)
+    cols_sum0 = [c for c, v in sumas.items() if v == 0]
+    llave = tuple(c for c in COLUMNAS_IMPUTACION if c in sumas and c not in cols_sum0)
+    suma, n = flete.get(llave, (0.0, 0))
+    return {'cols_sum0': cols_sum0, 'media_flete': suma / n if n else None}
@@ -0,0 +1,350 @@
+"""
+Generador de datos sintéticos con el esquema de los archivos del DANE.
+
+Los CSV reales están versionados con DVC y el remoto no siempre es accesible.
+Este módulo produce archivos con la misma forma para probar la ingesta, el
+entrenamiento y la API a cualquier escala (de mil a cien millones de filas):
+
+- Formato "crudo": las 41 columnas de Importaciones<año>.csv en el mismo
+  orden, en latin-1, con números en formato colombiano ("21.000,50") y "-"
+  o "" en los faltantes. Los códigos de adua, paispro, tipoim, regimen y
+  fech siguen distribuciones sesgadas como las reales, e incluyen una
+  pequeña fracción de filas que la limpieza descarta (aduana 24, países
+  excluidos, copaex 216, seguros o pbk faltantes).
+- Formato "modelos": el CSV limpio con variables dummies de
+  Importaciones2024limpia_modelos.csv (vacid, mes, variables numéricas y
+  una columna booleana por categoría salvo la primera). Se obtiene pasando
+  el crudo por limpiar_importaciones, así que respeta los mismos filtros.
+
+Las filas se generan por bloques de tam_bloque filas con un generador
+aleatorio por (semilla, bloque, columna): la memoria no depende del total y
+el crudo de n filas es prefijo del de cualquier tamaño mayor con la misma
+semilla. Los bloques son independientes y pueden generarse en varios
+procesos.
+
+Uso:
+    python generar_sintetico.py --filas 10000000 --salida data/Importaciones2024.csv
+    python generar_sintetico.py --filas 1000000 --formato modelos \\
+        --salida data/Importaciones2024limpia_modelos.csv
+"""
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .limpieza import PAISES_EXCLUIDOS, limpiar_importaciones
+from .mapeos import MAPEO_ADUA, MAPEO_CONTINENTE, MAPEO_TIPO_IMP
+from .tablas import (
+    TABLA_ADUANA_AGRUPADA, TABLA_CLASE, TABLA_CONTINENTE, TABLA_REGIMEN,
+    TABLA_TIPO_IMP, TABLA_TRANSPORTE,
+)
+
+SEMILLA = 42
+TAM_BLOQUE = 1_000_000
+
+# Columnas del archivo crudo del DANE, en su orden
+COLUMNAS_CRUDAS = [
+    'fech', 'adua', 'paisgen', 'paispro', 'paiscom', 'deptodes', 'viatrans', 'bandera',
+    'regimen', 'acuerdo', 'pbk', 'pnk', 'canu', 'coda', 'naban', 'vafodo', 'flete', 'vacid',
+    'vacip', 'imp1', 'otder', 'clase', 'cuidaimp', 'cuidaexp', 'actecon', 'codadad', 'vadua',
+    'vrajus', 'baseiva', 'otrosp', 'otrosbase', 'totalivayo', 'seguros', 'otrosg', 'luin',
+    'codluin', 'depim', 'copaex', 'tipoim', 'porara', 'derel',
+]
+
+# Columnas del dataset de modelos antes de las dummies, y las categóricas en su orden
+COLUMNAS_MODELOS = ['vacid', 'fech', 'trimestre', 'sin_fech', 'cos_fech', 'pbk', 'canu',
+                    'flete', 'seguros', 'otrosg']
+CATEGORICAS_MODELOS = {
+    'adua': TABLA_ADUANA_AGRUPADA, 'paisgen': TABLA_CONTINENTE, 'paispro': TABLA_CONTINENTE,
+    'viatrans': TABLA_TRANSPORTE, 'regimen': TABLA_REGIMEN, 'clase': TABLA_CLASE,
+    'copaex': TABLA_CONTINENTE, 'tipoim': TABLA_TIPO_IMP,
+}
+
+# Proporción de "-" y de "" en cada columna numérica
+FALTANTES_GUION = 0.01
+FALTANTES_VACIO = 0.005
+
+# Distribuciones de códigos (código: peso relativo); lo que no se lista
+# reparte el resto según una cola de Zipf
+PESOS_ADUA = {3: 30, 48: 20, 35: 12, 87: 10, 90: 7, 88: 5, 19: 4, 89: 3, 37: 2, 24: 0.3}
+PESOS_PAIS = {249: 26, 215: 22, 493: 7, 105: 5, 23: 4, 399: 3, 190: 3, 386: 2.5, 245: 2.5,
+              589: 2, 211: 2, 275: 1.5, 361: 1.5, 999: 0.5,
+              **{c: 0.15 for c in PAISES_EXCLUIDOS}}
+PESOS_TIPO_IMP = {1: 88, 3: 4, 99: 3, 9: 2, 4: 1, 2: 1}
+PESOS_REGIMEN = {'C100': 70, 'C101': 8, 'C200': 4, 'C300': 1, 'C400': 3, 'C500': 2,
+                 'C600': 4, 'S100': 1, 'S200': 1}
+PESOS_TRANSPORTE = {1: 62, 4: 28, 3: 7, 5: 1.5, 2: 0.2, 7: 0.5, 8: 0.3, 9: 0.5}
+PESOS_CLASE = {'2': 85, 'P': 5, '3': 4, '1': 3, 'M': 2, 'X': 1}
+# Estacionalidad de los meses (más importaciones antes de fin de año)
+PESOS_MES = np.array([7.5, 7.5, 8.2, 7.9, 8.3, 8.0, 8.5, 8.6, 8.7, 9.0, 9.2, 8.6])
+DEPARTAMENTOS = [5, 8, 11, 13, 15, 17, 19, 23, 25, 41, 47, 50, 52, 54, 63, 66, 68, 73, 76, 88]
+UNIDADES = ['U', 'KG', 'L', 'M2', 'PAR', 'M']
+
+
+def _pesos(principales: dict, todos, cola: float = 0.0):
+    """Códigos y probabilidades: los principales con su peso y el resto con una cola Zipf."""
+    resto = [c for c in todos if c not in principales]
+    zipf = 1.0 / np.arange(1, len(resto) + 1)
+    codigos = list(principales) + resto
+    pesos = np.concatenate([list(principales.values()), cola * zipf / max(zipf.sum(), 1)])
+    return np.array(codigos), pesos / pesos.sum()
+
+
+_ADUA = _pesos(PESOS_ADUA, MAPEO_ADUA, cola=6)
+_PAIS = _pesos(PESOS_PAIS, MAPEO_CONTINENTE, cola=14)
+_TIPO_IMP = _pesos(PESOS_TIPO_IMP, MAPEO_TIPO_IMP, cola=1)
+_REGIMEN = _pesos(PESOS_REGIMEN, [])
+_TRANSPORTE = _pesos(PESOS_TRANSPORTE, [])
+_CLASE = _pesos(PESOS_CLASE, [])
+
+
+# Textos "000".."999" y "00".."99" para armar los números formateados
+_TRES_DIGITOS = np.array([f"{i:03d}" for i in range(1000)])
+_DOS_DIGITOS = np.array([f"{i:02d}" for i in range(100)])
+
+
+class _Generadores:
+    """
+    Un generador aleatorio por columna y sorteo del bloque: cada sorteo de n
+    valores es prefijo del mismo sorteo con más valores, así que el crudo es
+    de prefijos.
+    """
+
+    def __init__(self, semilla: int, bloque: int):
+        self.semilla, self.bloque = semilla, bloque
+
+    def __call__(self, columna: str, sorteo: int = 0) -> np.random.Generator:
+        return np.random.default_rng(
+            [self.semilla, self.bloque, COLUMNAS_CRUDAS.index(columna), sorteo])
+
+
+def formatear_numero_colombiano(valores: np.ndarray) -> np.ndarray:
+    """
+    Texto con punto de miles y coma decimal (inverso de decodificar_numero_colombiano).
+
+    Igual a format(v, ",.2f") con los separadores intercambiados, pero armado
+    con operaciones de numpy: los grupos de miles y los centavos salen de
+    tablas de textos de 3 y 2 dígitos y se concatenan como caracteres.
+    """
+    valores = np.asarray(valores, dtype="float64")
+    n = len(valores)
+    if n == 0:
+        return np.array([], dtype=object)
+    escalados = np.abs(valores) * 100
+    centavos = np.rint(escalados).astype("int64")
+    # Cerca de x,xx5 el producto por 100 puede redondear distinto que format(); esos van uno a uno
+    for i in np.flatnonzero(np.abs(escalados - np.floor(escalados) - 0.5) < 1e-6):
+        centavos[i] = int(format(abs(valores[i]), ".2f").replace(".", ""))
+
+    enteros = centavos // 100
+    grupos = -(-len(str(int(enteros.max(initial=0)))) // 3)
+    partes = []
+    for k in range(grupos - 1, -1, -1):
+        partes += [_TRES_DIGITOS[enteros // 1000 ** k % 1000], np.full(n, ".")]
+    partes[-1] = np.full(n, ",")
+    partes.append(_DOS_DIGITOS[centavos % 100])
+    caracteres = np.concatenate([p.view("U1").reshape(n, -1) for p in partes], axis=1)
+    texto = np.ascontiguousarray(caracteres).view(f"U{caracteres.shape[1]}").ravel()
+
+    # "000.001.234,50" -> "1.234,50"; la parte entera cero conserva su dígito
+    texto = np.char.lstrip(texto, "0.")
+    resultado = texto.astype(object)
+    ceros = np.flatnonzero(enteros == 0)
+    resultado[ceros] = np.char.add("0", texto[ceros])
+    negativos = np.flatnonzero(np.signbit(valores))
+    resultado[negativos] = np.char.add("-", resultado[negativos].astype(str))
+    return resultado
+
+
+def _con_faltantes(texto: np.ndarray, rng) -> np.ndarray:
+    """Reemplaza una fracción de los textos por "-" y por "" (faltantes del DANE)."""
+    u = rng.random(len(texto))
+    texto[u < FALTANTES_GUION] = "-"
+    texto[(u >= FALTANTES_GUION) & (u < FALTANTES_GUION + FALTANTES_VACIO)] = ""
+    return texto
+
+
+def _codigos_fecha(anios, n: int, rng) -> np.ndarray:
+    """Códigos AAMM de fech (2401.0 = enero de 2024) con estacionalidad mensual."""
+    codigos = np.array([anio % 100 * 100 + mes for anio in anios for mes in range(1, 13)],
+                       dtype="float64")
+    pesos = np.tile(PESOS_MES, len(anios))
+    return rng.choice(codigos, size=n, p=pesos / pesos.sum())
+
+
+def generar_bloque_crudo(n: int, bloque: int = 0, semilla: int = SEMILLA,
+                         anios=(2024,)) -> pd.DataFrame:
+    """
+    Genera un bloque de filas con el formato del CSV crudo del DANE.
+
+    Args:
+        n: Filas del bloque
+        bloque: Número de bloque, que junto con la semilla fija los valores
+        semilla: Semilla global
+        anios: Años de los códigos fech
+
+    Returns:
+        DataFrame con COLUMNAS_CRUDAS; las numéricas como texto colombiano
+    """
+    rng = _Generadores(semilla, bloque)
+    d = {}
+    d['fech'] = _codigos_fecha(anios, n, rng('fech'))
+    d['adua'] = rng('adua').choice(_ADUA[0], n, p=_ADUA[1])
+    d['paispro'] = rng('paispro').choice(_PAIS[0], n, p=_PAIS[1])
+    # El país de origen coincide casi siempre con el de procedencia
+    d['paisgen'] = np.where(rng('paisgen').random(n) < 0.85, d['paispro'],
+                            rng('paisgen', 1).choice(_PAIS[0], n, p=_PAIS[1]))
+    d['paiscom'] = np.where(rng('paiscom').random(n) < 0.7, d['paispro'],
+                            rng('paiscom', 1).choice(_PAIS[0], n, p=_PAIS[1]))
+    d['copaex'] = np.where(rng('copaex').random(n) < 0.9, d['paispro'],
+                           rng('copaex', 1).choice(_PAIS[0], n, p=_PAIS[1]))
+    d['deptodes'] = rng('deptodes').choice(DEPARTAMENTOS, n)
+    d['viatrans'] = rng('viatrans').choice(_TRANSPORTE[0], n, p=_TRANSPORTE[1])
+    d['bandera'] = np.where(d['viatrans'] == 1, rng('bandera').choice(_PAIS[0], n, p=_PAIS[1]), 0)
+    d['regimen'] = rng('regimen').choice(_REGIMEN[0], n, p=_REGIMEN[1])
+    d['acuerdo'] = np.where(rng('acuerdo').random(n) < 0.3, rng('acuerdo', 1).integers(1, 250, n),
+                            np.nan)
+    d['tipoim'] = rng('tipoim').choice(_TIPO_IMP[0], n, p=_TIPO_IMP[1])
+    d['clase'] = rng('clase').choice(_CLASE[0], n, p=_CLASE[1])
+
+    # Valores: peso, precio por kilo (más alto por vía aérea) y componentes del CIF
+    aereo = d['viatrans'] == 4
+    pbk = rng('pbk').lognormal(5.5 - 2.5 * aereo, 2.2)
+    pnk = pbk * rng('pnk').uniform(0.85, 1.0, n)
+    precio = rng('vafodo').lognormal(1.2 + 1.5 * aereo, 1.0)
+    vafodo = pbk * precio
+    flete = vafodo * rng('flete').lognormal(np.log(0.06) + 0.5 * aereo, 0.6)
+    seguros = vafodo * rng('seguros').lognormal(np.log(0.004), 0.5)
+    otrosg = np.where(rng('otrosg').random(n) < 0.6, 0.0,
+                      vafodo * rng('otrosg', 1).lognormal(np.log(0.01), 0.8, n))
+    vacid = vafodo + flete + seguros + otrosg
+    trm = rng('vacip').normal(3950, 150, n)
+    vacip = vacid * trm
+    porara = rng('porara').choice([0.0, 5.0, 10.0, 15.0, 20.0], n, p=[0.35, 0.3, 0.2, 0.1, 0.05])
+    arancel = vacip * porara / 100
+    baseiva = vacip + arancel
+    numericos = {
+        'pbk': pbk, 'pnk': pnk, 'canu': pbk / rng('canu').lognormal(0, 1.5, n), 'vafodo': vafodo,
+        'flete': flete, 'vacid': vacid, 'vacip': vacip, 'vadua': vacip,
+        'vrajus': np.where(rng('vrajus').random(n) < 0.95, 0.0, vacip * 0.02),
+        'baseiva': baseiva, 'totalivayo': baseiva * 0.19 + arancel, 'seguros': seguros,
+        'otrosg': otrosg, 'porara': porara,
+    }
+    for columna, valores in numericos.items():
+        d[columna] = _con_faltantes(formatear_numero_colombiano(valores), rng(columna, 2))
+
+    # Subpartida arancelaria de 10 dígitos, sin separadores
+    d['naban'] = rng('naban').integers(100_000_000, 9_999_999_999, n)
+    d['coda'] = rng('coda').choice(UNIDADES, n)
+    d['imp1'] = rng('imp1').choice(['', 'A', 'B'], n, p=[0.9, 0.05, 0.05])
+    d['otder'] = d['otrosp'] = d['otrosbase'] = np.zeros(n, dtype=np.int64)
+    d['cuidaimp'] = rng('cuidaimp').integers(1, 99_999, n)
+    d['cuidaexp'] = rng('cuidaexp').choice(['', 'A', 'B'], n, p=[0.5, 0.3, 0.2])
+    d['actecon'] = rng('actecon').choice([0, 4620, 4659, 4690, 5121], n)
+    d['codadad'] = d['adua']
+    d['luin'] = rng('luin').choice(['', 'BOGOTA', 'CARTAGENA', 'BUENAVENTURA'], n)
+    d['codluin'] = rng('codluin').choice(['', 'BOG', 'CTG', 'BUN'], n)
+    d['depim'] = d['deptodes']
+    d['derel'] = rng('derel').integers(0, 1_000_000, n)
+    return pd.DataFrame(d, columns=COLUMNAS_CRUDAS)
+
+
+def a_formato_modelos(limpio: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convierte el dataset limpio al formato de modelos: dummies booleanas por
+    categoría, sin la primera categoría de cada variable.
+    """
+    partes = [limpio[COLUMNAS_MODELOS].reset_index(drop=True)]
+    for columna, tabla in CATEGORICAS_MODELOS.items():
+        valores = limpio[columna].to_numpy(dtype=object)
+        partes.append(pd.DataFrame({f"{columna}_{c}": valores == c for c in tabla.categorias[1:]}))
+    return pd.concat(partes, axis=1)
+
+
+def generar_bloque_modelos(n: int, bloque: int = 0, semilla: int = SEMILLA,
+                           anios=(2024,)) -> pd.DataFrame:
+    """
+    Genera un bloque crudo de n filas, lo limpia y lo lleva al formato de modelos.
+
+    El bloque resultante tiene algo menos de n filas por los filtros de la limpieza.
+    """
+    crudo = generar_bloque_crudo(n, bloque, semilla, anios)
+    limpio = limpiar_importaciones(crudo, cols_sum0=[],
+                                   salida=COLUMNAS_MODELOS + list(CATEGORICAS_MODELOS), anios=anios)
+    return a_formato_modelos(limpio)
+
+
+def _generar(argumentos):
+    formato, n, bloque, semilla, anios = argumentos
+    funcion = generar_bloque_modelos if formato == "modelos" else generar_bloque_crudo
+    return funcion(n, bloque, semilla, anios)
+
+
+def generar_bloques(filas: int, formato: str = "crudo", semilla: int = SEMILLA, anios=(2024,),
+                    tam_bloque: int = TAM_BLOQUE, procesos: int = 1):
+    """
+    Itera los bloques de un dataset sintético en orden.
+
+    En formato "crudo" se producen exactamente filas filas. En "modelos" se
+    generan bloques crudos del mismo tamaño hasta completar filas filas
+    limpias y el último se recorta. El resultado no depende de procesos.
+
+    Args:
+        filas: Número de filas del dataset
+        formato: "crudo" o "modelos"
+        semilla: Semilla global
+        anios: Años de los códigos fech
+        tam_bloque: Filas crudas por bloque (memoria por proceso)
+        procesos: Procesos que generan bloques en paralelo
+
+    Yields:
+        DataFrame de cada bloque
+    """
+    if formato not in ("crudo", "modelos"):
+        raise ValueError(f"Formato desconocido: {formato}")
+    if formato == "modelos":
+        # Algo más de filas crudas que las pedidas para cubrir las que filtra la limpieza
+        tam_bloque = min(tam_bloque, int(filas * 1.1) + 100)
+    procesos = max(procesos or 1, 1)
+    ejecutor = ProcessPoolExecutor(max_workers=procesos) if procesos > 1 else None
+    try:
+        pendientes, bloque = filas, 0
+        while pendientes > 0:
+            # Una tanda de bloques por vuelta, uno por proceso
+            tanda = []
+            for _ in range(procesos):
+                inicio = bloque * tam_bloque
+                n = tam_bloque if formato == "modelos" else min(tam_bloque, filas - inicio)
+                if n <= 0:
+                    break
+                tanda.append((formato, n, bloque, semilla, tuple(anios)))
+                bloque += 1
+            for df in (ejecutor.map(_generar, tanda) if ejecutor else map(_generar, tanda)):
+                if pendientes <= 0:
+                    break
+                df = df.iloc[:pendientes]
+                pendientes -= len(df)
+                yield df
+    finally:
+        if ejecutor:
+            ejecutor.shutdown(cancel_futures=True)
+
+
+def escribir_sintetico(ruta, filas: int, formato: str = "crudo", semilla: int = SEMILLA,
+                       anios=(2024,), tam_bloque: int = TAM_BLOQUE, procesos: int = 1) -> int:
+    """
+    Escribe un CSV sintético por bloques, sin tener todo el archivo en memoria.
+
+    El crudo se escribe en latin-1 como los archivos del DANE y el de
+    modelos en UTF-8 como el CSV limpio. Retorna el número de filas escritas.
+    """
+    ruta = Path(ruta)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    codificacion = "latin-1" if formato == "crudo" else "utf-8"
+    escritas = 0
+    with open(ruta, "w", encoding=codificacion, newline="") as f:
+        for df in generar_bloques(filas, formato, semilla, anios, tam_bloque, procesos):
+            df.to_csv(f, index=False, header=escritas == 0)
+            escritas += len(df)
+    return escritas
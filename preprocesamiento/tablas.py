@@ -0,0 +1,115 @@
+"""
+Tablas de búsqueda compiladas a partir de los diccionarios de mapeos.py.
+
+Cada tabla convierte una columna de códigos en un pandas Categorical con un
+orden de categorías fijo. Para códigos enteros se usa un arreglo denso
+indexado por el código (un solo np.take por columna); para códigos de texto
+se factoriza la columna y solo se buscan en el diccionario los valores únicos.
+"""
+import numpy as np
+import pandas as pd
+
+from .mapeos import (
+    MAPEO_CLASE, MAPEO_TRANSPORTE, MAPEO_ADUA, MAPEO_TIPO_IMP, MAPEO_REGIMEN,
+    MAPEO_CONTINENTE, MAP_ADUANAS_AGRUPADAS,
+)
+
+
+class TablaCodigos:
+    """Tabla código -> categoría que se aplica sin llamadas Python por fila."""
+
+    def __init__(self, mapeo: dict, defecto=None, conservar_desconocidos: bool = False,
+                 clave=None):
+        """
+        Compila la tabla de búsqueda.
+
+        Args:
+            mapeo: Diccionario código -> etiqueta
+            defecto: Etiqueta para códigos no encontrados (None deja NaN)
+            conservar_desconocidos: Si es True, los códigos no encontrados se
+                conservan como categoría (su texto) en lugar de NaN
+            clave: Función aplicada a cada valor único antes de buscarlo
+                (por ejemplo, tomar los dos primeros caracteres)
+        """
+        self.mapeo = mapeo
+        self.defecto = defecto
+        self.conservar_desconocidos = conservar_desconocidos
+        self.clave = clave
+        categorias = sorted(set(mapeo.values()))
+        if defecto is not None and defecto not in categorias:
+            categorias.append(defecto)
+        self.categorias = categorias
+        self._posicion = {c: i for i, c in enumerate(categorias)}
+        self._codigo_defecto = self._posicion[defecto] if defecto is not None else -1
+
+        self.densa = clave is None and all(
+            isinstance(k, (int, np.integer)) and k >= 0 for k in mapeo
+        )
+        if self.densa:
+            # La última posición recibe los códigos fuera de rango o faltantes
+            self.tabla = np.full(max(mapeo) + 2, self._codigo_defecto, dtype=np.int16)
+            for codigo, etiqueta in mapeo.items():
+                self.tabla[codigo] = self._posicion[etiqueta]
+
+    def _codigos_densos(self, serie: pd.Series) -> np.ndarray:
+        valores = serie.to_numpy(dtype="float64", na_value=np.nan)
+        fuera = len(self.tabla) - 1
+        validos = (valores >= 0) & (valores < fuera) & (valores == np.floor(valores))
+        indices = np.where(validos, valores, fuera).astype(np.intp)
+        return self.tabla.take(indices)
+
+    def _codigos_factorizados(self, serie: pd.Series) -> np.ndarray:
+        indices, unicos = pd.factorize(serie, use_na_sentinel=True)
+        claves = unicos if self.clave is None else [self.clave(u) for u in unicos]
+        por_unico = np.array(
+            [self._posicion.get(self.mapeo.get(k), self._codigo_defecto) for k in claves]
+            + [self._codigo_defecto],
+            dtype=np.int16,
+        )
+        if self.clave is not None:
+            # La clave también se aplica a los faltantes (p. ej. str(nan)[:2])
+            por_unico[-1] = self._posicion.get(
+                self.mapeo.get(self.clave(np.nan)), self._codigo_defecto)
+        return por_unico.take(indices)
+
+    def aplicar(self, serie: pd.Series) -> pd.Series:
+        """Retorna la columna mapeada como Categorical con el índice original."""
+        if self.densa and pd.api.types.is_numeric_dtype(serie):
+            codigos = self._codigos_densos(serie)
+        else:
+            codigos = self._codigos_factorizados(serie)
+        categorias = self.categorias
+
+        if self.conservar_desconocidos:
+            desconocidos = (codigos < 0) & serie.notna().to_numpy()
+            if desconocidos.any():
+                crudos = pd.Series(serie.to_numpy()[desconocidos]).map(_texto_codigo)
+                extra = sorted(set(crudos) - set(categorias))
+                categorias = categorias + extra
+                posicion = {c: i for i, c in enumerate(categorias)}
+                codigos = codigos.astype(np.int32)
+                codigos[desconocidos] = crudos.map(posicion).to_numpy()
+
+        valores = pd.Categorical.from_codes(codigos, categories=categorias)
+        return pd.Series(valores, index=serie.index, name=serie.name)
+
+
+def _texto_codigo(valor) -> str:
+    """Texto de un código desconocido (215.0 -> "215")."""
+    if isinstance(valor, (float, np.floating)) and float(valor).is_integer():
+        return str(int(valor))
+    return str(valor)
+
+
+def _componer(primero: dict, segundo: dict) -> dict:
+    """Compone dos mapeos encadenados en uno solo."""
+    return {k: segundo[v] for k, v in primero.items() if v in segundo}
+
+
+TABLA_CONTINENTE = TablaCodigos(MAPEO_CONTINENTE)
+TABLA_CONTINENTE_CONSERVAR = TablaCodigos(MAPEO_CONTINENTE, conservar_desconocidos=True)
+TABLA_ADUANA_AGRUPADA = TablaCodigos(_componer(MAPEO_ADUA, MAP_ADUANAS_AGRUPADAS))
+TABLA_TIPO_IMP = TablaCodigos(MAPEO_TIPO_IMP)
+TABLA_TRANSPORTE = TablaCodigos(MAPEO_TRANSPORTE)
+TABLA_REGIMEN = TablaCodigos(MAPEO_REGIMEN, defecto="Otros", clave=lambda u: str(u)[:2])
+TABLA_CLASE = TablaCodigos(MAPEO_CLASE, defecto="OtrasClases")
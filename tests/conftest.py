@@ -0,0 +1,35 @@
+"""
+Datos sintéticos compartidos por las pruebas (preprocesamiento/sintetico.py).
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from preprocesamiento import limpiar_importaciones  # noqa: E402
+from preprocesamiento.sintetico import generar_bloque_crudo  # noqa: E402
+
+FILAS = 20_000
+
+# Filas del CSV con códigos que las tablas no conocen y flete faltante ("-")
+CODIGOS_BORDE = {'paispro': (slice(10, 14), 777), 'adua': (slice(20, 24), 55),
+                 'tipoim': (slice(30, 34), 77), 'flete': (slice(40, 49), '-')}
+
+
+@pytest.fixture(scope="session")
+def importaciones_limpias():
+    """Dataset limpio con las columnas del modelo servido."""
+    return limpiar_importaciones(generar_bloque_crudo(FILAS))
+
+
+@pytest.fixture(scope="session")
+def csv_crudo(tmp_path_factory):
+    """CSV crudo sintético (latin-1) con los códigos de CODIGOS_BORDE."""
+    crudo = generar_bloque_crudo(4_000)
+    for columna, (filas, valor) in CODIGOS_BORDE.items():
+        crudo.loc[filas, columna] = valor
+    ruta = tmp_path_factory.mktemp("crudo") / "Importaciones2024.csv"
+    crudo.to_csv(ruta, index=False, encoding="latin-1")
+    return ruta
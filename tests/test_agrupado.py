@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.pipeline import Pipeline
+
+import train_model
+from entrenamiento.agrupado import ajustar_por_grupos, metricas_por_grupos
+
+
+def _pipeline():
+    return Pipeline(steps=[('prep', train_model.crear_preprocesamiento(disperso=False)),
+                           ('reg', LinearRegression())])
+
+
+def _lstsq(pipe, X, y):
+    """Mínimos cuadrados exactos sobre la matriz de diseño densa de las filas."""
+    Z = pipe[:-1].transform(X)
+    Z = Z.toarray() if hasattr(Z, "toarray") else Z
+    A = np.column_stack([np.ones(len(Z)), Z])
+    solucion = np.linalg.lstsq(A, np.asarray(y, dtype="float64"), rcond=None)[0]
+    return solucion[0], solucion[1:]
+
+
+def test_agrupado_igual_a_lstsq(importaciones_limpias):
+    X = importaciones_limpias[train_model.FEATURES]
+    y = importaciones_limpias[train_model.TARGET]
+    pipe, grupos = ajustar_por_grupos(_pipeline(), X, y)
+    assert len(grupos) < len(X)
+
+    intercepto, coef = _lstsq(pipe, X, y)
+    escala = np.abs(coef).max()
+    np.testing.assert_allclose(pipe[-1].coef_, coef, rtol=0, atol=1e-8 * escala)
+    assert pipe[-1].intercept_ == pytest.approx(intercepto, rel=1e-10)
+
+
+def test_metricas_por_grupos_iguales_a_filas(importaciones_limpias):
+    X = importaciones_limpias[train_model.FEATURES]
+    y = importaciones_limpias[train_model.TARGET]
+    pipe, _ = ajustar_por_grupos(_pipeline(), X, y)
+    pred = pipe.predict(X)
+    error = y.to_numpy(dtype="float64") - pred
+
+    metricas = metricas_por_grupos(pipe, X, y)
+    assert metricas['MAE'] == pytest.approx(np.mean(np.abs(error)), rel=1e-10)
+    assert metricas['RMSE'] == pytest.approx(np.sqrt(np.mean(error ** 2)), rel=1e-10)
@@ -0,0 +1,18 @@
+import pandas as pd
+
+from preprocesamiento.cache import cargar_importaciones_limpias, ruta_cache
+from preprocesamiento.sintetico import escribir_sintetico
+
+
+def test_cache_corrupto_se_reconstruye(tmp_path):
+    ruta_csv = tmp_path / "Importaciones2024.csv"
+    escribir_sintetico(ruta_csv, 3_000)
+    dir_cache = tmp_path / "cache"
+    original = cargar_importaciones_limpias(ruta_csv, ruta_dvc=None, dir_cache=dir_cache)
+
+    ruta = ruta_cache(ruta_csv, None, dir_cache)
+    ruta.write_bytes(ruta.read_bytes()[:500])
+    reconstruido = cargar_importaciones_limpias(ruta_csv, ruta_dvc=None, dir_cache=dir_cache)
+    pd.testing.assert_frame_equal(reconstruido, original)
+    # El caché roto se reemplaza por uno legible
+    pd.testing.assert_frame_equal(pd.read_parquet(ruta), original)
@@ -0,0 +1,65 @@
+"""
+Cada modo de carga produce lo mismo que la limpieza en serie de limpieza.py.
+"""
+import pandas as pd
+import pytest
+
+from preprocesamiento import (
+    PlanLimpieza, cargar_importaciones_limpias, ingerir_archivos, ingerir_incremental,
+    leer_almacen, leer_csv_crudo, limpiar_importaciones,
+)
+from preprocesamiento.paralelo import cargar_en_paralelo
+from preprocesamiento.sintetico import CATEGORICAS_MODELOS, COLUMNAS_MODELOS
+
+# Columnas del modelo servido (por defecto) y las del dataset de modelos/, que incluyen flete
+SALIDAS = {'modelo': None, 'modelos': COLUMNAS_MODELOS + list(CATEGORICAS_MODELOS)}
+
+
+def _cache(ruta, tmp, salida, **kwargs):
+    # La primera llamada escribe el caché y la segunda lo lee
+    cargar_importaciones_limpias(ruta, ruta_dvc=None, dir_cache=tmp, salida=salida, **kwargs)
+    return cargar_importaciones_limpias(ruta, ruta_dvc=None, dir_cache=tmp, salida=salida, **kwargs)
+
+
+MODOS = {
+    'plan': lambda ruta, tmp, salida: PlanLimpieza(salida=salida).ejecutar(leer_csv_crudo(ruta, salida)),
+    'paralelo': lambda ruta, tmp, salida: cargar_en_paralelo(ruta, procesos=2, salida=salida, n_rangos=5),
+    'bloques': lambda ruta, tmp, salida: cargar_importaciones_limpias(
+        ruta, ruta_dvc=None, usar_cache=False, tam_bloque=700, salida=salida),
+    'cache': lambda ruta, tmp, salida: _cache(ruta, tmp, salida),
+    'cache_bloques': lambda ruta, tmp, salida: _cache(ruta, tmp, salida, tam_bloque=700),
+    'cache_paralelo': lambda ruta, tmp, salida: _cache(ruta, tmp, salida, procesos=2),
+    'almacen': lambda ruta, tmp, salida: (ingerir_archivos([ruta], raiz=tmp, salida=salida, procesos=1),
+                                          leer_almacen(tmp))[1],
+    'incremental': lambda ruta, tmp, salida: (ingerir_incremental([ruta], raiz=tmp, salida=salida),
+                                              leer_almacen(tmp))[1],
+}
+
+
+@pytest.fixture(scope="module", params=list(SALIDAS))
+def salida(request):
+    return SALIDAS[request.param]
+
+
+@pytest.fixture(scope="module")
+def referencia(csv_crudo, salida):
+    return limpiar_importaciones(leer_csv_crudo(csv_crudo, salida), salida=salida)
+
+
+def test_referencia_incluye_codigos_borde(referencia):
+    # Un país desconocido se conserva con su código
+    assert '777' in set(referencia['paispro'])
+    # Un tipo de importación desconocido queda nulo: la fila solo sigue si tipoim no es salida
+    assert referencia.index.isin(range(30, 35)).any() != ('tipoim' in referencia.columns)
+    # Una aduana desconocida no tiene grupo y la fila se descarta
+    assert not referencia.index.isin(range(20, 25)).any()
+    if 'flete' in referencia.columns:
+        # El flete "-" se imputa con la media
+        borde = referencia.loc[referencia.index.isin(range(40, 50)), 'flete']
+        assert len(borde) and borde.notna().all()
+
+
+@pytest.mark.parametrize("modo", list(MODOS))
+def test_modo_igual_a_serie(modo, csv_crudo, salida, referencia, tmp_path):
+    df = MODOS[modo](csv_crudo, tmp_path, salida)
+    pd.testing.assert_frame_equal(df[list(referencia.columns)], referencia)
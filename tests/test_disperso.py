@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.pipeline import Pipeline
+
+import train_model
+from entrenamiento.disperso import ajustar_pipeline_disperso, resolver_disperso
+
+
+def _lstsq(Z, y, alpha=0.0):
+    """OLS/Ridge exacto con intercepto sin penalizar sobre Z densa."""
+    Z = Z.toarray() if sparse.issparse(Z) else Z
+    media_z, media_y = Z.mean(axis=0), y.mean()
+    A = np.vstack([Z - media_z, np.sqrt(alpha) * np.eye(Z.shape[1])])
+    b = np.concatenate([y - media_y, np.zeros(Z.shape[1])])
+    coef = np.linalg.lstsq(A, b, rcond=None)[0]
+    return coef, media_y - media_z @ coef
+
+
+def test_pipeline_disperso_igual_a_lstsq(importaciones_limpias):
+    X = importaciones_limpias[train_model.FEATURES]
+    y = importaciones_limpias[train_model.TARGET].to_numpy(dtype="float64")
+    pipe = Pipeline(steps=[('prep', train_model.crear_preprocesamiento(disperso=True)),
+                           ('reg', LinearRegression())])
+    pipe = ajustar_pipeline_disperso(pipe, X, y)
+
+    coef, intercepto = _lstsq(pipe[:-1].transform(X), y)
+    np.testing.assert_allclose(pipe[-1].coef_, coef, rtol=0, atol=1e-8 * np.abs(coef).max())
+    assert pipe[-1].intercept_ == pytest.approx(intercepto, rel=1e-10)
+
+
+@pytest.mark.parametrize("solver", ["normales", "lsmr"])
+@pytest.mark.parametrize("alpha", [0.0, 10.0])
+def test_resolver_disperso(solver, alpha):
+    rng = np.random.default_rng(0)
+    Z = sparse.random(2000, 30, density=0.1, random_state=0, format="csr")
+    y = Z @ rng.normal(size=30) + 3 + rng.normal(scale=0.1, size=2000)
+
+    coef, intercepto = resolver_disperso(Z, y, alpha=alpha, solver=solver)
+    esperado, intercepto_esperado = _lstsq(Z, y, alpha)
+    np.testing.assert_allclose(coef, esperado, rtol=1e-6, atol=1e-8)
+    assert intercepto == pytest.approx(intercepto_esperado, rel=1e-6)
+    if alpha:
+        referencia = Ridge(alpha=alpha).fit(Z.toarray(), y)
+        np.testing.assert_allclose(coef, referencia.coef_, rtol=1e-6, atol=1e-8)
@@ -0,0 +1,31 @@
+import numpy as np
+
+from preprocesamiento import PlanLimpieza, cargar_importaciones_limpias, limpiar_importaciones
+from preprocesamiento.almacen import columnas_almacen
+from preprocesamiento.mapeos import MAP_ANIOS
+from preprocesamiento.sintetico import escribir_sintetico, generar_bloque_crudo
+
+
+def _anios_crudos(crudo, limpio):
+    return set(crudo.loc[limpio.index, 'fech'].astype(float).map(MAP_ANIOS))
+
+
+def test_archivo_unico_solo_conserva_2024(tmp_path):
+    ruta = tmp_path / "Importaciones2024.csv"
+    escribir_sintetico(ruta, 5_000, anios=(2023, 2024))
+    crudo = generar_bloque_crudo(5_000, anios=(2023, 2024))
+    assert {2023, 2024} <= set(crudo['fech'].astype(float).map(MAP_ANIOS))
+
+    for limpio in (limpiar_importaciones(crudo.copy()), PlanLimpieza().ejecutar(crudo),
+                   cargar_importaciones_limpias(ruta, ruta_dvc=None, usar_cache=False)):
+        assert len(limpio)
+        assert _anios_crudos(crudo, limpio) == {2024}
+        assert limpio['fech'].between(1, 12).all()
+
+
+def test_almacen_conserva_todos_los_anios():
+    crudo = generar_bloque_crudo(5_000, anios=(2023, 2024))
+    limpio = PlanLimpieza(salida=columnas_almacen(), anios=None).ejecutar(crudo)
+    assert set(limpio['anio']) == {2023, 2024}
+    np.testing.assert_array_equal(limpio['anio'], list(crudo.loc[limpio.index, 'fech']
+                                                        .astype(float).map(MAP_ANIOS)))
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import Ridge, RidgeCV
+
+from entrenamiento.ruta_ridge import ALPHAS, ruta_ridge
+
+
+@pytest.fixture(scope="module")
+def problema():
+    """Problema lineal pequeño con una variable casi colineal."""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 8))
+    X[:, 7] = X[:, 0] + 1e-3 * rng.normal(size=200)
+    y = X @ rng.normal(size=8) + 5.0 + rng.normal(size=200)
+    return X, y
+
+
+def test_coeficientes_igual_a_ridge(problema):
+    X, y = problema
+    tabla = ruta_ridge(X, y, alphas=ALPHAS, loo=False)
+    for alpha, coef, intercepto in zip(ALPHAS, tabla.attrs['coeficientes'], tabla['intercepto']):
+        ridge = Ridge(alpha=alpha, solver="svd").fit(X, y)
+        np.testing.assert_allclose(coef, ridge.coef_, rtol=1e-7, atol=1e-9)
+        assert intercepto == pytest.approx(ridge.intercept_, rel=1e-9)
+
+
+def test_loo_igual_a_ridgecv(problema):
+    X, y = problema
+    tabla = ruta_ridge(X, y, alphas=ALPHAS)
+    ridge_cv = RidgeCV(alphas=ALPHAS, store_cv_results=True).fit(X, y)
+    # cv_results_ guarda el error cuadrático LOO de cada fila y alpha
+    np.testing.assert_allclose(tabla['loo'], ridge_cv.cv_results_.mean(axis=0), rtol=1e-7)
+    assert tabla.loc[tabla['loo'].idxmin(), 'alpha'] == ridge_cv.alpha_
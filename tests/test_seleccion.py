@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from sklearn.feature_selection import SequentialFeatureSelector
+from sklearn.linear_model import LinearRegression
+
+from entrenamiento.seleccion import SeleccionAdelante
+
+
+@pytest.fixture(scope="module")
+def problema():
+    """Problema lineal pequeño con variables de peso decreciente y ruido."""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 10))
+    X[:, 3] += 0.5 * X[:, 1]
+    y = X @ np.array([3.0, 2.0, 1.5, 1.0, 0.6, 0.3, 0.1, 0.0, 0.0, 0.0]) + rng.normal(size=300)
+    return X, y
+
+
+# (n_variables, tol) de SeleccionAdelante y su equivalente en sklearn
+MODOS = {
+    'auto': ("auto", None),
+    'entero': (4, None),
+    'fraccion': (0.3, None),
+    'tol': ("auto", 0.01),
+}
+
+
+@pytest.mark.parametrize("modo", list(MODOS))
+def test_soporte_igual_a_sklearn(modo, problema):
+    X, y = problema
+    n_variables, tol = MODOS[modo]
+    propia = SeleccionAdelante(n_variables=n_variables, pliegues=5, tol=tol).fit(X, y)
+    sklearn = SequentialFeatureSelector(LinearRegression(), n_features_to_select=n_variables,
+                                        tol=tol, direction="forward", cv=5).fit(X, y)
+    np.testing.assert_array_equal(propia.get_support(), sklearn.get_support())
+
+
+def test_tol_detiene_antes_del_maximo(problema):
+    X, y = problema
+    seleccion = SeleccionAdelante(tol=0.01).fit(X, y)
+    assert 0 < seleccion.get_support().sum() < X.shape[1] - 1
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+from preprocesamiento.numericos import decodificar_numero_colombiano
+from preprocesamiento.sintetico import formatear_numero_colombiano
+
+
+def _con_format(valores):
+    tabla = str.maketrans(",.", ".,")
+    return [format(v, ",.2f").translate(tabla) for v in valores.tolist()]
+
+
+def test_formato_igual_a_format():
+    rng = np.random.default_rng(0)
+    bordes = [0.0, -0.0, 0.004, 0.005, 0.015, 0.125, 2.675, -0.001, 999.995, 999_999.999,
+              1000.0, 1e15, 123_456_789.125, -1234.5]
+    valores = np.concatenate([bordes, rng.lognormal(5, 4, 20_000), -rng.lognormal(2, 3, 2_000),
+                              np.round(rng.uniform(0, 1000, 2_000), 3)])
+    assert formatear_numero_colombiano(valores).tolist() == _con_format(valores)
+    assert formatear_numero_colombiano(np.array([])).tolist() == []
+
+
+def test_formato_ida_y_vuelta():
+    valores = np.round(np.random.default_rng(1).lognormal(5, 3, 1_000), 2)
+    texto = pd.Series(formatear_numero_colombiano(valores))
+    np.testing.assert_allclose(decodificar_numero_colombiano(texto), valores, rtol=1e-12)
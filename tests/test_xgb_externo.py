@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+xgb = pytest.importorskip("xgboost")
+
+from entrenamiento import xgb_externo  # noqa: E402
+from entrenamiento.xgb_externo import barrido_xgb, liberar_matrices  # noqa: E402
+
+GRILLA = [{'max_depth': 4, 'eta': 0.3, 'n_estimators': 20, 'seed': 0},
+          {'max_depth': 2, 'eta': 0.1, 'n_estimators': 30, 'seed': 0}]
+MAX_BIN = 64
+
+
+@pytest.fixture(scope="module")
+def problema():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(2_000, 6))
+    y = X[:, 0] ** 2 + np.sin(3 * X[:, 1]) + X[:, 2] * X[:, 3] + 0.1 * rng.normal(size=2_000)
+    return X[:1_500], y[:1_500], X[1_500:], y[1_500:]
+
+
+@pytest.mark.parametrize("externo", [False, True])
+def test_barrido_igual_a_xgbregressor(externo, problema, tmp_path, monkeypatch):
+    X_train, y_train, X_test, y_test = problema
+    monkeypatch.setattr(xgb_externo, "XGB_CACHE_DIR", tmp_path)
+    resultados = barrido_xgb(GRILLA, X_train, y_train, X_test, y_test, max_bin=MAX_BIN,
+                             externo=externo, hilos=1)
+
+    for resultado in resultados:
+        p = resultado['parametros']
+        referencia = xgb.XGBRegressor(tree_method="hist", max_bin=MAX_BIN, n_jobs=1,
+                                      max_depth=p['max_depth'], learning_rate=p['eta'],
+                                      n_estimators=p['n_estimators'], random_state=p['seed'])
+        y_pred = referencia.fit(X_train, y_train).predict(X_test)
+        mse = float(np.mean((y_test - y_pred) ** 2))
+        assert resultado['mse'] == pytest.approx(mse, rel=1e-4)
+
+    # Las páginas externas viven en un temporal que se borra con la matriz
+    assert any(tmp_path.iterdir()) == externo
+    liberar_matrices()
+    assert not any(tmp_path.iterdir())